@@ -1,95 +1,170 @@
-from typing import Dict, Union
+from pathlib import Path
+from typing import List
 
 import requests
 
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.bulk as bulk
+import jsonplaceholder.lib.expand as expand
+import jsonplaceholder.lib.listing as listing
+import jsonplaceholder.lib.models as models
+import jsonplaceholder.lib.output as output
 import jsonplaceholder.lib.rest as rest
 import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.view as view
+import jsonplaceholder.lib.where as where
 import typer
 
 app = typer.Typer()
 ENDPOINT = '/albums'
 
 
-def view_album(album: Dict[str, Union[int, str]]) -> str:
-    userId: int = typer.style(
-        f'userId={album["userId"]}, ', fg=typer.colors.GREEN)
-    id: int = typer.style(f'id={album["id"]}, ', fg=typer.colors.RED)
-    title: str = typer.style(f'title={album["title"]}', fg=typer.colors.BLUE)
-    return f'{id}{userId}{title}'
+FIELDS = (
+    view.Field('id', typer.colors.RED),
+    view.Field('userId', typer.colors.GREEN),
+    view.Field('title', typer.colors.BLUE, end=''),
+)
+view_album = view.compile(FIELDS)
 
 
 @app.command()
-def list(userId: int = typer.Option(None,
-                                    help='Get albums only from the given user.',
-                                    min=1,)):
+def list(userId: List[int] = typer.Option(None,
+                                          help='Get albums only from the given user, '
+                                          'repeat for several.',
+                                          min=1,),
+         page: int = typer.Option(None,
+                                  help='Show only this page of albums.',
+                                  min=1,),
+         limit: int = typer.Option(None,
+                                   help='Number of albums per page.',
+                                   min=1,),
+         paginate: bool = typer.Option(False,
+                                       '--paginate',
+                                       help='Continue through the following pages, '
+                                       'fetching each one ahead of time.',
+                                       ),
+         fields: str = typer.Option(None,
+                                    help='Show only these fields, separated by commas.',
+                                    callback=util.parse_fields,
+                                    ),
+         condition: str = typer.Option(None,
+                                       '--where',
+                                       help="Show only what matches an expression, "
+                                       "such as \"id <= 10 and title contains 'qui'\".",
+                                       callback=where.parse,
+                                       ),
+         count_by: str = typer.Option(None,
+                                      '--count-by',
+                                      help='Show the number of albums with each value '
+                                      'of this field instead.',
+                                      ),
+         ):
     """
     List Albums.
     """
-    uri = ENDPOINT if not userId else f'{ENDPOINT}?userId={userId}'
-    response: requests.Response = rest.get(uri)
-    if response.status_code != 200:
-        util.panic(f"Request resulted in error code {response.status_code}")
-    albums = response.json()
-    typer.echo_via_pager([f'{view_album(album)}\n' for album in albums])
+    layout, albums = listing.records(ENDPOINT, FIELDS, {'userId': userId},
+                                     page, limit, paginate, fields, condition,
+                                     count_by)
+    output.emit(albums, layout)
 
 
 @app.command()
-def get(id: int = typer.Argument(..., min=1)):
+def get(ids: List[str] = typer.Argument(...,
+                                        metavar='ID',
+                                        callback=util.parse_ids),
+        fields: str = typer.Option(None,
+                                   help='Show only these fields, separated by commas.',
+                                   callback=util.parse_fields,
+                                   ),
+        related: str = typer.Option(None,
+                                    '--with',
+                                    help='Include related resources: user, photos, nested such as user.todos.',
+                                    callback=expand.parse,
+                                    ),
+        ):
     """
-    Get info about album by ID.
+    Get info about albums by ID, ranges such as 1-10 are accepted.
     """
-    response: requests.Response = rest.get(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to retrieve resource.')
-    typer.echo(view_album(response.json()))
+    layout, paths = view.select(FIELDS, fields)
+    output.emit(expand.get_many(ENDPOINT, ids, related, paths), layout,
+                pager=False, relations=related)
 
 
 @app.command()
-def delete(id: int = typer.Argument(..., min=1)):
+def delete(ctx: typer.Context,
+           ids: List[str] = typer.Argument(None,
+                                           metavar='ID',
+                                           callback=util.parse_ids),
+           userId: int = typer.Option(None,
+                                      help='Delete only albums of the given user.',
+                                      min=1,),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight at once.',
+                                           min=1,
+                                           ),
+           ):
     """
-    Delete an album by ID.
+    Delete albums by ID, ranges such as 1-10 or filters.
     """
-    response: requests.Response = rest.delete(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to delete resource')
-    typer.echo('Resource deleted successfully.')
+    filters = {'userId': userId}
+    if all(value is None for value in filters.values()):
+        util.require(ctx, 'ids')
+    bulk.delete_many(ENDPOINT, bulk.select_ids(ENDPOINT, ids, filters),
+                     concurrency)
 
 
 @app.command()
 def update(id: int = typer.Argument(..., min=1),
            userId: int = typer.Option(None, help='ID of the user.'),
            title: str = typer.Option(None, help='Title of the album.'),
+           put: bool = typer.Option(False,
+                                    '--put',
+                                    help='Replace the whole resource with PUT.',
+                                    ),
            ):
     """
     Update an album by ID, omitted fields will be left unchanged.
     """
-    album_response = rest.get(f'{ENDPOINT}/{id}')
-    if album_response.status_code != 200:
+    album = models.Album(userId=userId, title=title)
+    response = rest.update(f'{ENDPOINT}/{id}', album.to_json(), replace=put)
+    if response.status_code == 404:
         util.panic('Failure to retrieve resource.')
-    album = album_response.json()
-    album = {
-        'userId': userId or album['userId'],
-        'title': title or album['title']
-    }
-    response = rest.put(f'{ENDPOINT}/{id}', album)
     if response.status_code != 200:
         util.panic('Failure to update resource.')
     typer.echo(view_album(response.json()))
 
 
 @app.command()
-def create(userId: int = typer.Option(..., help='ID of the user.', min=1),
-           title: str = typer.Option(..., help='Title of the album.'),
+def create(ctx: typer.Context,
+           userId: int = typer.Option(None, help='ID of the user.', min=1),
+           title: str = typer.Option(None, help='Title of the album.'),
+           from_file: Path = typer.Option(None,
+                                          '--from-file',
+                                          exists=True,
+                                          dir_okay=False,
+                                          help='JSONL or CSV file of albums to create.',
+                                          ),
+           output_file: Path = typer.Option(None,
+                                            '--output-file',
+                                            dir_okay=False,
+                                            help='JSONL file to write created albums to.',
+                                            ),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight with --from-file.',
+                                           min=1,
+                                           ),
            ):
     """
-    Create a new album.
+    Create a new album, or one per record of a JSONL or CSV file.
     """
-    album = {
-        'userId': userId,
-        'title': title
-    }
+    if from_file:
+        bulk.create_from_file(ENDPOINT, from_file, view_album, output_file,
+                              concurrency, types={'userId': int})
+        return
+    util.require(ctx, 'userId', 'title')
+    album = models.Album(userId=userId, title=title)
     response: requests.Response = rest.post(
-        ENDPOINT, album)
+        ENDPOINT, album.to_json())
     if response.status_code != 201:
         util.panic('Failure to create resource.')
     typer.echo(view_album(response.json()))
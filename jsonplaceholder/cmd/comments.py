@@ -1,63 +1,118 @@
-from typing import Dict, Union
+from pathlib import Path
+from typing import List
 
 import requests
 
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.bulk as bulk
+import jsonplaceholder.lib.expand as expand
+import jsonplaceholder.lib.listing as listing
+import jsonplaceholder.lib.models as models
+import jsonplaceholder.lib.output as output
 import jsonplaceholder.lib.rest as rest
 import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.view as view
+import jsonplaceholder.lib.where as where
 import typer
 
 app = typer.Typer()
 ENDPOINT = '/comments'
 
 
-def view_comment(comment: Dict[str, Union[int, str]]) -> str:
-    postId: int = typer.style(
-        f'postId={comment["postId"]}, ', fg=typer.colors.GREEN)
-    id: int = typer.style(f'id={comment["id"]}, ', fg=typer.colors.RED)
-    name: str = typer.style(f'name={comment["name"]}, ', fg=typer.colors.BLUE)
-    email: str = typer.style(
-        f'email={comment["email"]}, ', fg=typer.colors.GREEN)
-    body: str = typer.style(f'body={comment["body"]}', fg=typer.colors.WHITE)
-    return f'{id}{postId}{name}{email}{body}'
+FIELDS = (
+    view.Field('id', typer.colors.RED),
+    view.Field('postId', typer.colors.GREEN),
+    view.Field('name', typer.colors.BLUE),
+    view.Field('email', typer.colors.GREEN),
+    view.Field('body', typer.colors.WHITE, end=''),
+)
+view_comment = view.compile(FIELDS)
 
 
 @app.command()
-def list(postId: int = typer.Option(None,
-                                    help='Get comments only from the given post.',
-                                    min=1,)
+def list(postId: List[int] = typer.Option(None,
+                                          help='Get comments only from the given post, '
+                                          'repeat for several.',
+                                          min=1,),
+         page: int = typer.Option(None,
+                                  help='Show only this page of comments.',
+                                  min=1,),
+         limit: int = typer.Option(None,
+                                   help='Number of comments per page.',
+                                   min=1,),
+         paginate: bool = typer.Option(False,
+                                       '--paginate',
+                                       help='Continue through the following pages, '
+                                       'fetching each one ahead of time.',
+                                       ),
+         fields: str = typer.Option(None,
+                                    help='Show only these fields, separated by commas.',
+                                    callback=util.parse_fields,
+                                    ),
+         condition: str = typer.Option(None,
+                                       '--where',
+                                       help="Show only what matches an expression, "
+                                       "such as \"id <= 10 and title contains 'qui'\".",
+                                       callback=where.parse,
+                                       ),
+         count_by: str = typer.Option(None,
+                                      '--count-by',
+                                      help='Show the number of comments with each value '
+                                      'of this field instead.',
+                                      ),
          ):
     """
     List Comments.
     """
-    uri = ENDPOINT if not postId else f'{ENDPOINT}?postId={postId}'
-    response: requests.Response = rest.get(uri)
-    if response.status_code != 200:
-        util.panic(f"Request resulted in error code {response.status_code}")
-    comments = response.json()
-    typer.echo_via_pager(
-        [f'{view_comment(comment)}\n' for comment in comments])
+    layout, comments = listing.records(ENDPOINT, FIELDS, {'postId': postId},
+                                       page, limit, paginate, fields, condition,
+                                       count_by)
+    output.emit(comments, layout)
 
 
 @app.command()
-def get(id: int = typer.Argument(..., min=1)):
+def get(ids: List[str] = typer.Argument(...,
+                                        metavar='ID',
+                                        callback=util.parse_ids),
+        fields: str = typer.Option(None,
+                                   help='Show only these fields, separated by commas.',
+                                   callback=util.parse_fields,
+                                   ),
+        related: str = typer.Option(None,
+                                    '--with',
+                                    help='Include related resources: post, nested such as post.user.',
+                                    callback=expand.parse,
+                                    ),
+        ):
     """
-    Get info about comment by ID.
+    Get info about comments by ID, ranges such as 1-10 are accepted.
     """
-    response: requests.Response = rest.get(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to retrieve resource.')
-    typer.echo(view_comment(response.json()))
+    layout, paths = view.select(FIELDS, fields)
+    output.emit(expand.get_many(ENDPOINT, ids, related, paths), layout,
+                pager=False, relations=related)
 
 
 @app.command()
-def delete(id: int = typer.Argument(..., min=1)):
+def delete(ctx: typer.Context,
+           ids: List[str] = typer.Argument(None,
+                                           metavar='ID',
+                                           callback=util.parse_ids),
+           postId: int = typer.Option(None,
+                                      help='Delete only comments of the given post.',
+                                      min=1,),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight at once.',
+                                           min=1,
+                                           ),
+           ):
     """
-    Delete an album by ID.
+    Delete comments by ID, ranges such as 1-10 or filters.
     """
-    response: requests.Response = rest.delete(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to delete resource')
-    typer.echo('Resource deleted successfully.')
+    filters = {'postId': postId}
+    if all(value is None for value in filters.values()):
+        util.require(ctx, 'ids')
+    bulk.delete_many(ENDPOINT, bulk.select_ids(ENDPOINT, ids, filters),
+                     concurrency)
 
 
 @app.command()
@@ -66,43 +121,56 @@ def update(id: int = typer.Argument(..., min=1),
            name: str = typer.Option(None, help='Name of the comment.'),
            email: str = typer.Option(None, help='E-mail address'),
            body: str = typer.Option(None, help='Body of the comment.'),
+           put: bool = typer.Option(False,
+                                    '--put',
+                                    help='Replace the whole resource with PUT.',
+                                    ),
            ):
     """
     Update an comment by ID, omitted fields will be left unchanged.
     """
-    comment_response = rest.get(f'{ENDPOINT}/{id}')
-    if comment_response.status_code != 200:
+    comment = models.Comment(postId=postId, name=name, email=email, body=body)
+    response = rest.update(f'{ENDPOINT}/{id}', comment.to_json(), replace=put)
+    if response.status_code == 404:
         util.panic('Failure to retrieve resource.')
-    comment = comment_response.json()
-    comment = {
-        'postId': postId or comment['postId'],
-        'name': name or comment['name'],
-        'email': email or comment['email'],
-        'body': body or comment['body']
-    }
-    response = rest.put(f'{ENDPOINT}/{id}', comment)
     if response.status_code != 200:
         util.panic('Failure to update resource.')
     typer.echo(view_comment(response.json()))
 
 
 @app.command()
-def create(postId: int = typer.Option(..., help='ID of the post.', min=1),
-           name: str = typer.Option(..., help='Name of the comment.'),
-           email: str = typer.Option(..., help='E-mail address'),
-           body: str = typer.Option(..., help='Body of the comment.'),
+def create(ctx: typer.Context,
+           postId: int = typer.Option(None, help='ID of the post.', min=1),
+           name: str = typer.Option(None, help='Name of the comment.'),
+           email: str = typer.Option(None, help='E-mail address'),
+           body: str = typer.Option(None, help='Body of the comment.'),
+           from_file: Path = typer.Option(None,
+                                          '--from-file',
+                                          exists=True,
+                                          dir_okay=False,
+                                          help='JSONL or CSV file of comments to create.',
+                                          ),
+           output_file: Path = typer.Option(None,
+                                            '--output-file',
+                                            dir_okay=False,
+                                            help='JSONL file to write created comments to.',
+                                            ),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight with --from-file.',
+                                           min=1,
+                                           ),
            ):
     """
-    Create a comment.
+    Create a comment, or one per record of a JSONL or CSV file.
     """
-    comment = {
-        'postId': postId,
-        'name': name,
-        'email': email,
-        'body': body
-    }
+    if from_file:
+        bulk.create_from_file(ENDPOINT, from_file, view_comment, output_file,
+                              concurrency, types={'postId': int})
+        return
+    util.require(ctx, 'postId', 'name', 'email', 'body')
+    comment = models.Comment(postId=postId, name=name, email=email, body=body)
     response: requests.Response = rest.post(
-        ENDPOINT, comment)
+        ENDPOINT, comment.to_json())
     if response.status_code != 201:
         util.panic('Failure to create resource.')
     typer.echo(view_comment(response.json()))
@@ -1,64 +1,118 @@
-from typing import Dict, Union
+from pathlib import Path
+from typing import List
 
 import requests
 
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.bulk as bulk
+import jsonplaceholder.lib.expand as expand
+import jsonplaceholder.lib.listing as listing
+import jsonplaceholder.lib.models as models
+import jsonplaceholder.lib.output as output
 import jsonplaceholder.lib.rest as rest
 import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.view as view
+import jsonplaceholder.lib.where as where
 import typer
 
 app = typer.Typer()
 ENDPOINT = '/photos'
 
 
-def view_photo(photo: Dict[str, Union[int, str]]) -> str:
-    albumId: int = typer.style(
-        f'albumId={photo["albumId"]}, ', fg=typer.colors.GREEN)
-    id: int = typer.style(f'id={photo["id"]}, ', fg=typer.colors.RED)
-    title: str = typer.style(f'title={photo["title"]}, ', fg=typer.colors.BLUE)
-    url: str = typer.style(
-        f'url={photo["url"]}, ', fg=typer.colors.GREEN)
-    thumbnailUrl: str = typer.style(
-        f'thumbnailUrl={photo["thumbnailUrl"]}', fg=typer.colors.RED)
-    return f'{id}{albumId}{title}{url}{thumbnailUrl}'
+FIELDS = (
+    view.Field('id', typer.colors.RED),
+    view.Field('albumId', typer.colors.GREEN),
+    view.Field('title', typer.colors.BLUE),
+    view.Field('url', typer.colors.GREEN),
+    view.Field('thumbnailUrl', typer.colors.RED, end=''),
+)
+view_photo = view.compile(FIELDS)
 
 
 @app.command()
-def list(albumId: int = typer.Option(None,
-                                     help='Get photos only from the given album.',
-                                     min=1,)
+def list(albumId: List[int] = typer.Option(None,
+                                           help='Get photos only from the given album, '
+                                           'repeat for several.',
+                                           min=1,),
+         page: int = typer.Option(None,
+                                  help='Show only this page of photos.',
+                                  min=1,),
+         limit: int = typer.Option(None,
+                                   help='Number of photos per page.',
+                                   min=1,),
+         paginate: bool = typer.Option(False,
+                                       '--paginate',
+                                       help='Continue through the following pages, '
+                                       'fetching each one ahead of time.',
+                                       ),
+         fields: str = typer.Option(None,
+                                    help='Show only these fields, separated by commas.',
+                                    callback=util.parse_fields,
+                                    ),
+         condition: str = typer.Option(None,
+                                       '--where',
+                                       help="Show only what matches an expression, "
+                                       "such as \"id <= 10 and title contains 'qui'\".",
+                                       callback=where.parse,
+                                       ),
+         count_by: str = typer.Option(None,
+                                      '--count-by',
+                                      help='Show the number of photos with each value '
+                                      'of this field instead.',
+                                      ),
          ):
     """
     List Photos.
     """
-    uri = ENDPOINT if not albumId else f'{ENDPOINT}?albumId={albumId}'
-    response: requests.Response = rest.get(uri)
-    if response.status_code != 200:
-        util.panic(f"Request resulted in error code {response.status_code}")
-    photos = response.json()
-    typer.echo_via_pager(
-        [f'{view_photo(photo)}\n' for photo in photos])
+    layout, photos = listing.records(ENDPOINT, FIELDS, {'albumId': albumId},
+                                     page, limit, paginate, fields, condition,
+                                     count_by)
+    output.emit(photos, layout)
 
 
 @app.command()
-def get(id: int = typer.Argument(..., min=1)):
+def get(ids: List[str] = typer.Argument(...,
+                                        metavar='ID',
+                                        callback=util.parse_ids),
+        fields: str = typer.Option(None,
+                                   help='Show only these fields, separated by commas.',
+                                   callback=util.parse_fields,
+                                   ),
+        related: str = typer.Option(None,
+                                    '--with',
+                                    help='Include related resources: album, nested such as album.user.',
+                                    callback=expand.parse,
+                                    ),
+        ):
     """
-    Get info about photo by ID.
+    Get info about photos by ID, ranges such as 1-10 are accepted.
     """
-    response: requests.Response = rest.get(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to retrieve resource.')
-    typer.echo(view_photo(response.json()))
+    layout, paths = view.select(FIELDS, fields)
+    output.emit(expand.get_many(ENDPOINT, ids, related, paths), layout,
+                pager=False, relations=related)
 
 
 @app.command()
-def delete(id: int = typer.Argument(..., min=1)):
+def delete(ctx: typer.Context,
+           ids: List[str] = typer.Argument(None,
+                                           metavar='ID',
+                                           callback=util.parse_ids),
+           albumId: int = typer.Option(None,
+                                       help='Delete only photos of the given album.',
+                                       min=1,),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight at once.',
+                                           min=1,
+                                           ),
+           ):
     """
-    Delete an album by ID.
+    Delete photos by ID, ranges such as 1-10 or filters.
     """
-    response: requests.Response = rest.delete(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to delete resource')
-    typer.echo('Resource deleted successfully.')
+    filters = {'albumId': albumId}
+    if all(value is None for value in filters.values()):
+        util.require(ctx, 'ids')
+    bulk.delete_many(ENDPOINT, bulk.select_ids(ENDPOINT, ids, filters),
+                     concurrency)
 
 
 @app.command()
@@ -68,44 +122,59 @@ def update(id: int = typer.Argument(..., min=1),
            url: str = typer.Option(None, help='URL address'),
            thumbnailUrl: str = typer.Option(
                None, help='Thumbnail URL address.'),
+           put: bool = typer.Option(False,
+                                    '--put',
+                                    help='Replace the whole resource with PUT.',
+                                    ),
            ):
     """
     Update an photo by ID, omitted fields will be left unchanged.
     """
-    photo_response = rest.get(f'{ENDPOINT}/{id}')
-    if photo_response.status_code != 200:
+    photo = models.Photo(albumId=albumId, title=title, url=url,
+                         thumbnailUrl=thumbnailUrl)
+    response = rest.update(f'{ENDPOINT}/{id}', photo.to_json(), replace=put)
+    if response.status_code == 404:
         util.panic('Failure to retrieve resource.')
-    photo = photo_response.json()
-    photo = {
-        'albumId': albumId or photo['albumId'],
-        'title': title or photo['title'],
-        'url': url or photo['url'],
-        'thumbnailUrl': thumbnailUrl or photo['thumbnailUrl']
-    }
-    response = rest.put(f'{ENDPOINT}/{id}', photo)
     if response.status_code != 200:
         util.panic('Failure to update resource.')
     typer.echo(view_photo(response.json()))
 
 
 @app.command()
-def create(albumId: int = typer.Option(..., help='ID of the album.', min=1),
-           title: str = typer.Option(..., help='Name of the photo.'),
-           url: str = typer.Option(..., help='URL of the photo'),
-           thumbnailUrl: str = typer.Option(...,
+def create(ctx: typer.Context,
+           albumId: int = typer.Option(None, help='ID of the album.', min=1),
+           title: str = typer.Option(None, help='Name of the photo.'),
+           url: str = typer.Option(None, help='URL of the photo'),
+           thumbnailUrl: str = typer.Option(None,
                                             help='Thumbnail URL address of the photo.'),
+           from_file: Path = typer.Option(None,
+                                          '--from-file',
+                                          exists=True,
+                                          dir_okay=False,
+                                          help='JSONL or CSV file of photos to create.',
+                                          ),
+           output_file: Path = typer.Option(None,
+                                            '--output-file',
+                                            dir_okay=False,
+                                            help='JSONL file to write created photos to.',
+                                            ),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight with --from-file.',
+                                           min=1,
+                                           ),
            ):
     """
-    Create a photo.
+    Create a photo, or one per record of a JSONL or CSV file.
     """
-    photo = {
-        'albumId': albumId,
-        'title': title,
-        'url': url,
-        'thumbnailUrl': thumbnailUrl
-    }
+    if from_file:
+        bulk.create_from_file(ENDPOINT, from_file, view_photo, output_file,
+                              concurrency, types={'albumId': int})
+        return
+    util.require(ctx, 'albumId', 'title', 'url', 'thumbnailUrl')
+    photo = models.Photo(albumId=albumId, title=title, url=url,
+                         thumbnailUrl=thumbnailUrl)
     response: requests.Response = rest.post(
-        ENDPOINT, photo)
+        ENDPOINT, photo.to_json())
     if response.status_code != 201:
         util.panic('Failure to create resource.')
     typer.echo(view_photo(response.json()))
@@ -1,59 +1,117 @@
-from typing import Dict, Union
+from pathlib import Path
+from typing import List
 
 import requests
 
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.bulk as bulk
+import jsonplaceholder.lib.expand as expand
+import jsonplaceholder.lib.listing as listing
+import jsonplaceholder.lib.models as models
+import jsonplaceholder.lib.output as output
 import jsonplaceholder.lib.rest as rest
 import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.view as view
+import jsonplaceholder.lib.where as where
 import typer
 
 app = typer.Typer()
 ENDPOINT = '/posts'
 
 
-def view_post(post: Dict[str, Union[int, str]]) -> str:
-    userId: int = typer.style(
-        f'userId={post["userId"]}, ', fg=typer.colors.GREEN)
-    id: int = typer.style(f'id={post["id"]}, ', fg=typer.colors.RED)
-    title: str = typer.style(f'title={post["title"]}, ', fg=typer.colors.BLUE)
-    body: str = typer.style(f'body={post["body"]}', fg=typer.colors.WHITE)
-    return f'{id}{userId}{title}{body}'
+FIELDS = (
+    view.Field('id', typer.colors.RED),
+    view.Field('userId', typer.colors.GREEN),
+    view.Field('title', typer.colors.BLUE),
+    view.Field('body', typer.colors.WHITE, end=''),
+)
+view_post = view.compile(FIELDS)
 
 
 @app.command()
-def list(userId: int = typer.Option(None,
-                                    help='Get posts only from the given user.',
-                                    min=1,)):
+def list(userId: List[int] = typer.Option(None,
+                                          help='Get posts only from the given user, '
+                                          'repeat for several.',
+                                          min=1,),
+         page: int = typer.Option(None,
+                                  help='Show only this page of posts.',
+                                  min=1,),
+         limit: int = typer.Option(None,
+                                   help='Number of posts per page.',
+                                   min=1,),
+         paginate: bool = typer.Option(False,
+                                       '--paginate',
+                                       help='Continue through the following pages, '
+                                       'fetching each one ahead of time.',
+                                       ),
+         fields: str = typer.Option(None,
+                                    help='Show only these fields, separated by commas.',
+                                    callback=util.parse_fields,
+                                    ),
+         condition: str = typer.Option(None,
+                                       '--where',
+                                       help="Show only what matches an expression, "
+                                       "such as \"id <= 10 and title contains 'qui'\".",
+                                       callback=where.parse,
+                                       ),
+         count_by: str = typer.Option(None,
+                                      '--count-by',
+                                      help='Show the number of posts with each value '
+                                      'of this field instead.',
+                                      ),
+         ):
     """
     List Albums.
     """
-    uri = ENDPOINT if not userId else f'{ENDPOINT}?userId={userId}'
-    response: requests.Response = rest.get(uri)
-    if response.status_code != 200:
-        util.panic(f"Request resulted in error code {response.status_code}")
-    posts = response.json()
-    typer.echo_via_pager([f'{view_post(post)}\n' for post in posts])
+    layout, posts = listing.records(ENDPOINT, FIELDS, {'userId': userId},
+                                    page, limit, paginate, fields, condition,
+                                    count_by)
+    output.emit(posts, layout)
 
 
 @app.command()
-def get(id: int = typer.Argument(..., min=1)):
+def get(ids: List[str] = typer.Argument(...,
+                                        metavar='ID',
+                                        callback=util.parse_ids),
+        fields: str = typer.Option(None,
+                                   help='Show only these fields, separated by commas.',
+                                   callback=util.parse_fields,
+                                   ),
+        related: str = typer.Option(None,
+                                    '--with',
+                                    help='Include related resources: user, comments, nested such as user.albums.',
+                                    callback=expand.parse,
+                                    ),
+        ):
     """
-    Get info about post by ID.
+    Get info about posts by ID, ranges such as 1-10 are accepted.
     """
-    response: requests.Response = rest.get(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to retrieve resource.')
-    typer.echo(view_post(response.json()))
+    layout, paths = view.select(FIELDS, fields)
+    output.emit(expand.get_many(ENDPOINT, ids, related, paths), layout,
+                pager=False, relations=related)
 
 
 @app.command()
-def delete(id: int = typer.Argument(..., min=1)):
+def delete(ctx: typer.Context,
+           ids: List[str] = typer.Argument(None,
+                                           metavar='ID',
+                                           callback=util.parse_ids),
+           userId: int = typer.Option(None,
+                                      help='Delete only posts of the given user.',
+                                      min=1,),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight at once.',
+                                           min=1,
+                                           ),
+           ):
     """
-    Delete an post by ID.
+    Delete posts by ID, ranges such as 1-10 or filters.
     """
-    response: requests.Response = rest.delete(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to delete resource')
-    typer.echo('Resource deleted successfully.')
+    filters = {'userId': userId}
+    if all(value is None for value in filters.values()):
+        util.require(ctx, 'ids')
+    bulk.delete_many(ENDPOINT, bulk.select_ids(ENDPOINT, ids, filters),
+                     concurrency)
 
 
 @app.command()
@@ -61,40 +119,55 @@ def update(id: int = typer.Argument(..., min=1),
            userId: int = typer.Option(None, help='ID of the user.'),
            title: str = typer.Option(None, help='Title of the post.'),
            body: str = typer.Option(None, help='Body of the post.'),
+           put: bool = typer.Option(False,
+                                    '--put',
+                                    help='Replace the whole resource with PUT.',
+                                    ),
            ):
     """
     Update an post by ID, omitted fields will be left unchanged.
     """
-    post_response = rest.get(f'{ENDPOINT}/{id}')
-    if post_response.status_code != 200:
+    post = models.Post(userId=userId, title=title, body=body)
+    response = rest.update(f'{ENDPOINT}/{id}', post.to_json(), replace=put)
+    if response.status_code == 404:
         util.panic('Failure to retrieve resource.')
-    post = post_response.json()
-    post = {
-        'userId': userId or post['userId'],
-        'title': title or post['title'],
-        'body': body or post['body']
-    }
-    response = rest.put(f'{ENDPOINT}/{id}', post)
     if response.status_code != 200:
         util.panic('Failure to update resource.')
     typer.echo(view_post(response.json()))
 
 
 @app.command()
-def create(userId: int = typer.Option(..., help='ID of the user.', min=1),
-           title: str = typer.Option(..., help='Title of the post.'),
-           body: str = typer.Option(..., help='Body of the post.'),
+def create(ctx: typer.Context,
+           userId: int = typer.Option(None, help='ID of the user.', min=1),
+           title: str = typer.Option(None, help='Title of the post.'),
+           body: str = typer.Option(None, help='Body of the post.'),
+           from_file: Path = typer.Option(None,
+                                          '--from-file',
+                                          exists=True,
+                                          dir_okay=False,
+                                          help='JSONL or CSV file of posts to create.',
+                                          ),
+           output_file: Path = typer.Option(None,
+                                            '--output-file',
+                                            dir_okay=False,
+                                            help='JSONL file to write created posts to.',
+                                            ),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight with --from-file.',
+                                           min=1,
+                                           ),
            ):
     """
-    Create a new post.
+    Create a new post, or one per record of a JSONL or CSV file.
     """
-    post = {
-        'userId': userId,
-        'title': title,
-        'body': body
-    }
+    if from_file:
+        bulk.create_from_file(ENDPOINT, from_file, view_post, output_file,
+                              concurrency, types={'userId': int})
+        return
+    util.require(ctx, 'userId', 'title', 'body')
+    post = models.Post(userId=userId, title=title, body=body)
     response: requests.Response = rest.post(
-        ENDPOINT, post)
+        ENDPOINT, post.to_json())
     if response.status_code != 201:
         util.panic('Failure to create resource.')
     typer.echo(view_post(response.json()))
@@ -0,0 +1,30 @@
+import json
+from typing import List
+
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.output as output
+import jsonplaceholder.lib.search as inverted
+import jsonplaceholder.lib.view as view
+import typer
+
+FIELDS = (
+    view.Field('collection', typer.colors.GREEN),
+    view.Field('id', typer.colors.RED),
+    view.Field('score'),
+    view.Field('text', typer.colors.BLUE, end=''),
+)
+
+
+def search(terms: List[str] = typer.Argument(..., metavar='TERMS...'),
+           limit: int = typer.Option(10, '--limit', min=1, help='Number of results.')):
+    """
+    Search the text of the resources in the mirror made by sync.
+    """
+    with inverted.current() as index:
+        hits = index.search(' '.join(terms), limit)
+    results = []
+    for hit in hits:
+        (record,), = mirror.read(f'SELECT record FROM {hit.collection} WHERE id = ?', [hit.id])
+        text = json.loads(record)[inverted.FIELDS[hit.collection][0]]
+        results.append({**hit._asdict(), 'text': text})
+    output.emit(results, FIELDS, pager=False)
@@ -0,0 +1,23 @@
+import jsonplaceholder.lib.output as output
+import jsonplaceholder.lib.report as report
+import jsonplaceholder.lib.view as view
+import typer
+
+FIELDS = (
+    view.Field('id', typer.colors.RED),
+    view.Field('name', typer.colors.BLUE),
+    view.Field('posts', typer.colors.GREEN),
+    view.Field('albums', typer.colors.GREEN),
+    view.Field('photos', typer.colors.GREEN),
+    view.Field('comments', typer.colors.GREEN),
+    view.Field('todos', typer.colors.GREEN),
+    view.Field('completed', typer.colors.WHITE, end=''),
+)
+
+
+def stats():
+    """
+    Count the posts, albums, photos, comments received and todos of every
+    user, with the share of the todos completed.
+    """
+    output.emit(report.per_user(report.load()), FIELDS, pager=False)
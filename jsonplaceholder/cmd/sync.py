@@ -0,0 +1,82 @@
+import asyncio
+import sqlite3
+from typing import Dict, Tuple
+
+import requests
+
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.pages as pages
+import jsonplaceholder.lib.util as util
+import typer
+
+
+async def _fetch(table: str, page: int,
+                 validators: Dict[str, str]) -> requests.Response:
+    response = await aio.conditional(
+        pages.endpoint(f'/{table}', page, mirror.PAGE_SIZE), validators)
+    if response.status_code not in (200, 304):
+        util.panic(f"Request resulted in error code {response.status_code}")
+    return response
+
+
+async def _collection(table: str) -> Tuple[Dict[int, mirror.Page], int]:
+    """Downloads the pages of a collection that changed since the last sync.
+
+    The pages synced before are requested with their validators, plus the
+    page after them if the last one was full, since resources appended to
+    a collection leave every earlier page unchanged. Any page that changed
+    tells the size of the collection, and the pages it grew by are
+    downloaded too.
+
+    Returns:
+        The changed pages with their validators and resources, and the
+        number of the last page.
+    """
+    known = mirror.pages(table)
+    last = max(known, default=1)
+    if len(known.get(last, ((), ()))[1]) == mirror.PAGE_SIZE:
+        last += 1
+    numbers = range(1, last + 1)
+    responses = await asyncio.gather(*[
+        _fetch(table, page, known[page][0] if page in known else {})
+        for page in numbers])
+    changed = {page: response for page, response in zip(numbers, responses)
+               if response.status_code == 200}
+    total = next((response.headers.get('X-Total-Count', '')
+                  for response in changed.values()), '')
+    if total.isdigit():
+        end = mirror.last_page(int(total))
+        # The empty page after a full one is kept, so that it is probed
+        # conditionally on the next sync.
+        if int(total) and int(total) % mirror.PAGE_SIZE == 0:
+            end += 1
+        grown = range(last + 1, end + 1)
+        changed.update(zip(grown, await asyncio.gather(*[
+            _fetch(table, page, {}) for page in grown])))
+        last = end
+    return {page: (cache.validators({'headers': response.headers}), response.json())
+            for page, response in changed.items()}, last
+
+
+def sync():
+    """
+    Bring the local mirror used by --offline up to date.
+    """
+    if mirror.OFFLINE:
+        util.panic('Cannot sync offline.')
+    tables = list(mirror.TABLES)
+
+    async def download():
+        return await asyncio.gather(*[_collection(table) for table in tables])
+    try:
+        counts = mirror.apply(dict(zip(tables, aio.run(download()))))
+    except sqlite3.IntegrityError as error:
+        util.panic(f'Mirror left unchanged, the resources are inconsistent: {error}')
+    for table, count in counts.items():
+        typer.echo(f'{table}: {count.added} added, {count.changed} changed, '
+                   f'{count.removed} removed')
+    typer.echo(f'Added {sum(count.added for count in counts.values())}, '
+               f'changed {sum(count.changed for count in counts.values())}, '
+               f'removed {sum(count.removed for count in counts.values())} resources.')
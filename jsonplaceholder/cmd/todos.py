@@ -1,60 +1,123 @@
-from typing import Dict, Union
+from pathlib import Path
+from typing import List
 
 import requests
 
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.bulk as bulk
+import jsonplaceholder.lib.expand as expand
+import jsonplaceholder.lib.listing as listing
+import jsonplaceholder.lib.models as models
+import jsonplaceholder.lib.output as output
 import jsonplaceholder.lib.rest as rest
 import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.view as view
+import jsonplaceholder.lib.where as where
 import typer
 
 app = typer.Typer()
 ENDPOINT = '/todos'
 
 
-def view_todo(todo: Dict[str, Union[int, str]]) -> str:
-    userId: int = typer.style(
-        f'userId={todo["userId"]}, ', fg=typer.colors.GREEN)
-    id: int = typer.style(f'id={todo["id"]}, ', fg=typer.colors.RED)
-    title: str = typer.style(f'title={todo["title"]}, ', fg=typer.colors.BLUE)
-    completed: str = typer.style(
-        f'completed={todo["completed"]}', fg=typer.colors.WHITE)
-    return f'{id}{userId}{title}{completed}'
+FIELDS = (
+    view.Field('id', typer.colors.RED),
+    view.Field('userId', typer.colors.GREEN),
+    view.Field('title', typer.colors.BLUE),
+    view.Field('completed', typer.colors.WHITE, end=''),
+)
+view_todo = view.compile(FIELDS)
 
 
 @app.command()
-def list(userId: int = typer.Option(None,
-                                    help='Get todos only from the given user.',
-                                    min=1,)):
+def list(userId: List[int] = typer.Option(None,
+                                          help='Get todos only from the given user, '
+                                          'repeat for several.',
+                                          min=1,),
+         page: int = typer.Option(None,
+                                  help='Show only this page of todos.',
+                                  min=1,),
+         limit: int = typer.Option(None,
+                                   help='Number of todos per page.',
+                                   min=1,),
+         paginate: bool = typer.Option(False,
+                                       '--paginate',
+                                       help='Continue through the following pages, '
+                                       'fetching each one ahead of time.',
+                                       ),
+         fields: str = typer.Option(None,
+                                    help='Show only these fields, separated by commas.',
+                                    callback=util.parse_fields,
+                                    ),
+         condition: str = typer.Option(None,
+                                       '--where',
+                                       help="Show only what matches an expression, "
+                                       "such as \"id <= 10 and title contains 'qui'\".",
+                                       callback=where.parse,
+                                       ),
+         count_by: str = typer.Option(None,
+                                      '--count-by',
+                                      help='Show the number of todos with each value '
+                                      'of this field instead.',
+                                      ),
+         ):
     """
     List Albums.
     """
-    uri = ENDPOINT if not userId else f'{ENDPOINT}?userId={userId}'
-    response: requests.Response = rest.get(uri)
-    if response.status_code != 200:
-        util.panic(f"Request resulted in error code {response.status_code}")
-    todos = response.json()
-    typer.echo_via_pager([f'{view_todo(todo)}\n' for todo in todos])
+    layout, todos = listing.records(ENDPOINT, FIELDS, {'userId': userId},
+                                    page, limit, paginate, fields, condition,
+                                    count_by)
+    output.emit(todos, layout)
 
 
 @app.command()
-def get(id: int = typer.Argument(..., min=1)):
+def get(ids: List[str] = typer.Argument(...,
+                                        metavar='ID',
+                                        callback=util.parse_ids),
+        fields: str = typer.Option(None,
+                                   help='Show only these fields, separated by commas.',
+                                   callback=util.parse_fields,
+                                   ),
+        related: str = typer.Option(None,
+                                    '--with',
+                                    help='Include related resources: user, nested such as user.posts.',
+                                    callback=expand.parse,
+                                    ),
+        ):
     """
-    Get info about todo by ID.
+    Get info about todos by ID, ranges such as 1-10 are accepted.
     """
-    response: requests.Response = rest.get(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to retrieve resource.')
-    typer.echo(view_todo(response.json()))
+    layout, paths = view.select(FIELDS, fields)
+    output.emit(expand.get_many(ENDPOINT, ids, related, paths), layout,
+                pager=False, relations=related)
 
 
 @app.command()
-def delete(id: int = typer.Argument(..., min=1)):
+def delete(ctx: typer.Context,
+           ids: List[str] = typer.Argument(None,
+                                           metavar='ID',
+                                           callback=util.parse_ids),
+           userId: int = typer.Option(None,
+                                      help='Delete only todos of the given user.',
+                                      min=1,),
+           completed: bool = typer.Option(
+    None,
+    '--completed/--not-completed',
+    '-c/-n',
+    help='Delete only completed or only not completed todos.',
+),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight at once.',
+                                           min=1,
+                                           ),
+           ):
     """
-    Delete an todo by ID.
+    Delete todos by ID, ranges such as 1-10 or filters.
     """
-    response: requests.Response = rest.delete(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to delete resource')
-    typer.echo('Resource deleted successfully.')
+    filters = {'userId': userId, 'completed': completed}
+    if all(value is None for value in filters.values()):
+        util.require(ctx, 'ids')
+    bulk.delete_many(ENDPOINT, bulk.select_ids(ENDPOINT, ids, filters),
+                     concurrency)
 
 
 @app.command()
@@ -62,34 +125,32 @@ def update(id: int = typer.Argument(..., min=1),
            userId: int = typer.Option(None, help='ID of the user.'),
            title: str = typer.Option(None, help='Title of the todo.'),
            completed: bool = typer.Option(
-    False,
+    None,
     '--completed/--not-completed',
     '-c/-n',
     help='Whether the todo is completed',
-    show_default=True,
 ),
+           put: bool = typer.Option(False,
+                                    '--put',
+                                    help='Replace the whole resource with PUT.',
+                                    ),
 ):
     """
     Update an todo by ID, omitted fields will be left unchanged.
     """
-    todo_response = rest.get(f'{ENDPOINT}/{id}')
-    if todo_response.status_code != 200:
+    todo = models.Todo(userId=userId, title=title, completed=completed)
+    response = rest.update(f'{ENDPOINT}/{id}', todo.to_json(), replace=put)
+    if response.status_code == 404:
         util.panic('Failure to retrieve resource.')
-    todo = todo_response.json()
-    todo = {
-        'userId': userId or todo['userId'],
-        'title': title or todo['title'],
-        'completed': completed or todo['completed']
-    }
-    response = rest.put(f'{ENDPOINT}/{id}', todo)
     if response.status_code != 200:
         util.panic('Failure to update resource.')
     typer.echo(view_todo(response.json()))
 
 
 @app.command()
-def create(userId: int = typer.Option(..., help='ID of the user.', min=1),
-           title: str = typer.Option(..., help='Title of the todo.'),
+def create(ctx: typer.Context,
+           userId: int = typer.Option(None, help='ID of the user.', min=1),
+           title: str = typer.Option(None, help='Title of the todo.'),
            completed: bool = typer.Option(
     False,
     '--completed/--not-completed',
@@ -97,17 +158,34 @@ def create(userId: int = typer.Option(..., help='ID of the user.', min=1),
     help='Whether the todo is completed',
     show_default=True,
 ),
+           from_file: Path = typer.Option(None,
+                                          '--from-file',
+                                          exists=True,
+                                          dir_okay=False,
+                                          help='JSONL or CSV file of todos to create.',
+                                          ),
+           output_file: Path = typer.Option(None,
+                                            '--output-file',
+                                            dir_okay=False,
+                                            help='JSONL file to write created todos to.',
+                                            ),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight with --from-file.',
+                                           min=1,
+                                           ),
 ):
     """
-    Create a new todo.
+    Create a new todo, or one per record of a JSONL or CSV file.
     """
-    todo = {
-        'userId': userId,
-        'title': title,
-        'completed': completed
-    }
+    if from_file:
+        bulk.create_from_file(ENDPOINT, from_file, view_todo, output_file,
+                              concurrency, types={'userId': int,
+                                                  'completed': util.parse_bool})
+        return
+    util.require(ctx, 'userId', 'title')
+    todo = models.Todo(userId=userId, title=title, completed=completed)
     response: requests.Response = rest.post(
-        ENDPOINT, todo)
+        ENDPOINT, todo.to_json())
     if response.status_code != 201:
         util.panic('Failure to create resource.')
     typer.echo(view_todo(response.json()))
@@ -1,75 +1,166 @@
-from typing import Dict, Union
+from pathlib import Path
+from typing import List
 
 import requests
 
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.bulk as bulk
+import jsonplaceholder.lib.expand as expand
+import jsonplaceholder.lib.geo as geo
+import jsonplaceholder.lib.listing as listing
+import jsonplaceholder.lib.models as models
+import jsonplaceholder.lib.output as output
 import jsonplaceholder.lib.rest as rest
 import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.view as view
+import jsonplaceholder.lib.where as where
 import typer
 
 app = typer.Typer()
 ENDPOINT = '/users'
 
 
-def view_user(user: Dict[str, Union[int, str]]) -> str:
-    id = user['id']
-    name = user['name']
-    username = user['username']
-    email = user['email']
+FIELDS = (
+    view.Field('id'),
+    view.Field('name'),
+    view.Field('username'),
+    view.Field('email', end='\n    address='),
+    view.Field('address.street'),
+    view.Field('address.suite'),
+    view.Field('address.city'),
+    view.Field('address.zipcode', end='\n    geo='),
+    view.Field('address.geo.lat'),
+    view.Field('address.geo.lng', end=' \n'),
+    view.Field('phone'),
+    view.Field('website', end=' \n    Company='),
+    view.Field('company.name'),
+    view.Field('company.catchPhrase'),
+    view.Field('company.bs', end='\n'),
+)
+view_user = view.compile(FIELDS)
+NEAR_FIELDS = FIELDS[:-1] + (
+    FIELDS[-1]._replace(end=', '),
+    view.Field('distance', typer.colors.YELLOW, end=' km'),
+)
 
-    street = user['address']['street']
-    suite = user['address']['suite']
-    city = user['address']['city']
-    zipcode = user['address']['zipcode']
 
-    latitude = user['address']['geo']['lat']
-    longitude = user['address']['geo']['lng']
+@app.command()
+def list(page: int = typer.Option(None,
+                                  help='Show only this page of users.',
+                                  min=1,),
+         limit: int = typer.Option(None,
+                                   help='Number of users per page.',
+                                   min=1,),
+         paginate: bool = typer.Option(False,
+                                       '--paginate',
+                                       help='Continue through the following pages, '
+                                       'fetching each one ahead of time.',
+                                       ),
+         fields: str = typer.Option(None,
+                                    help='Show only these fields, separated by commas.',
+                                    callback=util.parse_fields,
+                                    ),
+         condition: str = typer.Option(None,
+                                       '--where',
+                                       help="Show only what matches an expression, "
+                                       "such as \"address.city contains 'City'\".",
+                                       callback=where.parse,
+                                       ),
+         count_by: str = typer.Option(None,
+                                      '--count-by',
+                                      help='Show the number of users with each value '
+                                      'of this field instead.',
+                                      ),
+         ):
+    """
+    List Users.
+    """
+    layout, users = listing.records(ENDPOINT, FIELDS, {},
+                                    page, limit, paginate, fields, condition,
+                                    count_by)
+    output.emit(users, layout)
 
-    phone = user['phone']
-    website = user['website']
 
-    company_name = user['company']['name']
-    catch_phrase = user['company']['catchPhrase']
-    bs = user['company']['bs']
-    return f'\
-id={id}, name={name}, username={username}, email={email}\n\
-    address=street={street}, suite={suite}, city={city}, zipcode={zipcode}\n\
-    geo=lat={latitude}, lng={longitude} \n\
-phone={phone}, website={website} \n\
-    Company=name={company_name}, catchPhrase={catch_phrase}, bs={bs}\n'
+@app.command()
+def get(ids: List[str] = typer.Argument(...,
+                                        metavar='ID',
+                                        callback=util.parse_ids),
+        fields: str = typer.Option(None,
+                                   help='Show only these fields, separated by commas.',
+                                   callback=util.parse_fields,
+                                   ),
+        related: str = typer.Option(None,
+                                    '--with',
+                                    help='Include related resources: posts, albums, todos, '
+                                    'nested such as posts.comments.',
+                                    callback=expand.parse,
+                                    ),
+        ):
+    """
+    Get info about users by ID, ranges such as 1-10 are accepted.
+    """
+    layout, paths = view.select(FIELDS, fields)
+    output.emit(expand.get_many(ENDPOINT, ids, related, paths), layout,
+                pager=False, relations=related)
 
 
 @app.command()
-def list():
+def near(lat: float = typer.Option(...,
+                                   '--lat',
+                                   '--latitude',
+                                   help='Latitude of the point.',
+                                   min=-90.0,
+                                   max=90.0,
+                                   ),
+         lng: float = typer.Option(...,
+                                   '--lng',
+                                   '--longitude',
+                                   help='Longitude of the point.',
+                                   min=-180.0,
+                                   max=180.0,
+                                   ),
+         radius: float = typer.Option(...,
+                                      help='Distance from the point in kilometres.',
+                                      min=0.0,
+                                      ),
+         ):
     """
-    List Users.
+    List users whose address is within a distance of a point, nearest first.
     """
-    response: requests.Response = rest.get(ENDPOINT)
-    if response.status_code != 200:
-        util.panic(f"Request resulted in error code {response.status_code}")
-    users = response.json()
-    typer.echo_via_pager(map(view_user, users))
+    found, grid = geo.users()
+    output.emit(({**found[key], 'distance': round(distance, 1)}
+                 for key, distance in grid.near(lat, lng, radius)), NEAR_FIELDS)
 
 
 @app.command()
-def get(id: int = typer.Argument(..., min=1)):
+def within(bbox: str = typer.Option(...,
+                                    '--bbox',
+                                    metavar='S,W,N,E',
+                                    help='Box of south,west,north,east edges in degrees, '
+                                    'west greater than east across the antimeridian.',
+                                    callback=geo.parse_bbox,
+                                    ),
+           ):
     """
-    Get info about user by ID.
+    List users whose address is within a box.
     """
-    response: requests.Response = rest.get(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to retrieve resource.')
-    typer.echo(view_user(response.json()))
+    found, grid = geo.users()
+    output.emit((found[key] for key in grid.within(*bbox)), FIELDS)
 
 
 @app.command()
-def delete(id: int = typer.Argument(..., min=1)):
+def delete(ids: List[str] = typer.Argument(...,
+                                           metavar='ID',
+                                           callback=util.parse_ids),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight at once.',
+                                           min=1,
+                                           ),
+           ):
     """
-    Delete an album by ID.
+    Delete users by ID, ranges such as 1-10 are accepted.
     """
-    response: requests.Response = rest.delete(f'{ENDPOINT}/{id}')
-    if response.status_code != 200:
-        util.panic('Failure to delete resource')
-    typer.echo('Resource deleted successfully.')
+    bulk.delete_many(ENDPOINT, ids, concurrency)
 
 
 @app.command()
@@ -100,97 +191,99 @@ def update(id: int = typer.Argument(..., min=1),
            catch_phrase: str = typer.Option(None,
                                             help='Catch phrase of the user\'s company'),
            bs: str = typer.Option(None, help='BS of the user\'s company'),
+           put: bool = typer.Option(False,
+                                    '--put',
+                                    help='Replace the whole resource with PUT.',
+                                    ),
            ):
     """
     Update an user by ID, omitted fields will be left unchanged.
     """
-    user_response = rest.get(f'{ENDPOINT}/{id}')
-    if user_response.status_code != 200:
+    user = models.User(
+        name=name,
+        username=username,
+        email=email,
+        address=models.Address(street=street, suite=suite, city=city, zipcode=zipcode,
+                               geo=models.Geo(lat=latitude, lng=longitude)),
+        phone=phone,
+        website=website,
+        company=models.Company(name=company_name, catchPhrase=catch_phrase, bs=bs),
+    )
+    response = rest.update(f'{ENDPOINT}/{id}', user.to_json(), replace=put)
+    if response.status_code == 404:
         util.panic('Failure to retrieve resource.')
-    user = user_response.json()
-    user = {
-        'name': name or user['name'],
-        'username': username or user['username'],
-        'email': email or user['email'],
-        'address': {
-            'street': street or user['address']['street'],
-            'suite': suite or user['address']['suite'],
-            'city': city or user['address']['city'],
-            'zipcode': zipcode or user['address']['zipcode'],
-            'geo': {
-                'lat': latitude or user['address']['geo']['lat'],
-                'lng': longitude or user['address']['geo']['lng']
-            }
-        },
-        'phone': phone or user['phone'],
-        'website': website or user['website'],
-        'company': {
-            'name': company_name or user['company']['name'],
-            'catchPhrase': catch_phrase or user['company']['catchPhrase'],
-            'bs': bs or user['company']['bs']
-        }
-    }
-    response = rest.put(f'{ENDPOINT}/{id}', user)
     if response.status_code != 200:
         util.panic('Failure to update resource.')
     typer.echo(view_user(response.json()))
 
 
 @app.command()
-def create(name: str = typer.Option(..., help='Name of the user.'),
-           username: str = typer.Option(..., help='Username of the user.'),
-           email: str = typer.Option(..., help='Email of the user.'),
-           street: str = typer.Option(..., help='Street of the user.'),
-           suite: str = typer.Option(..., help='Suite of the user.'),
-           city: str = typer.Option(..., help='City of the user.'),
-           zipcode: str = typer.Option(..., help='Zipcode of the user.'),
-           latitude: float = typer.Option(...,
+def create(ctx: typer.Context,
+           name: str = typer.Option(None, help='Name of the user.'),
+           username: str = typer.Option(None, help='Username of the user.'),
+           email: str = typer.Option(None, help='Email of the user.'),
+           street: str = typer.Option(None, help='Street of the user.'),
+           suite: str = typer.Option(None, help='Suite of the user.'),
+           city: str = typer.Option(None, help='City of the user.'),
+           zipcode: str = typer.Option(None, help='Zipcode of the user.'),
+           latitude: float = typer.Option(None,
                                           help='Latitude of the user.',
                                           min=-90.0,
                                           max=90.0,
                                           ),
-           longitude: float = typer.Option(...,
+           longitude: float = typer.Option(None,
                                            help='Longitude of the user.',
                                            min=-180.0,
                                            max=180.0,
                                            ),
-           phone: str = typer.Option(..., help='Phone of the user.'),
-           website: str = typer.Option(..., help='Website of the user.'),
-           company_name: str = typer.Option(...,
+           phone: str = typer.Option(None, help='Phone of the user.'),
+           website: str = typer.Option(None, help='Website of the user.'),
+           company_name: str = typer.Option(None,
                                             '--company-name',
                                             help='Company the user works at.',
                                             ),
-           catch_phrase: str = typer.Option(...,
+           catch_phrase: str = typer.Option(None,
                                             help='Catch phrase of the user\'s company'),
-           bs: str = typer.Option(..., help='BS of the user\'s company'),
+           bs: str = typer.Option(None, help='BS of the user\'s company'),
+           from_file: Path = typer.Option(None,
+                                          '--from-file',
+                                          exists=True,
+                                          dir_okay=False,
+                                          help='JSONL or CSV file of users to create.',
+                                          ),
+           output_file: Path = typer.Option(None,
+                                            '--output-file',
+                                            dir_okay=False,
+                                            help='JSONL file to write created users to.',
+                                            ),
+           concurrency: int = typer.Option(aio.CONCURRENCY,
+                                           help='Requests in flight with --from-file.',
+                                           min=1,
+                                           ),
            ):
     """
-    Create a user.
-    """
-    user = {
-        'name': name,
-        'username': username,
-        'email': email,
-        'address': {
-            'street': street,
-            'suite': suite,
-            'city': city,
-            'zipcode': zipcode,
-            'geo': {
-                'lat': latitude,
-                'lng': longitude
-            }
-        },
-        'phone': phone,
-        'website': website,
-        'company': {
-            'name': company_name,
-            'catchPhrase': catch_phrase,
-            'bs': bs
-        }
-    }
+    Create a user, or one per record of a JSONL or CSV file.
+    """
+    if from_file:
+        bulk.create_from_file(ENDPOINT, from_file, view_user, output_file,
+                              concurrency, types={'address.geo.lat': float,
+                                                  'address.geo.lng': float})
+        return
+    util.require(ctx, 'name', 'username', 'email', 'street', 'suite', 'city',
+                 'zipcode', 'latitude', 'longitude', 'phone', 'website',
+                 'company_name', 'catch_phrase', 'bs')
+    user = models.User(
+        name=name,
+        username=username,
+        email=email,
+        address=models.Address(street=street, suite=suite, city=city, zipcode=zipcode,
+                               geo=models.Geo(lat=latitude, lng=longitude)),
+        phone=phone,
+        website=website,
+        company=models.Company(name=company_name, catchPhrase=catch_phrase, bs=bs),
+    )
     response: requests.Response = rest.post(
-        ENDPOINT, user)
+        ENDPOINT, user.to_json())
     if response.status_code != 201:
         util.panic('Failure to create resource.')
     typer.echo(view_user(response.json()))
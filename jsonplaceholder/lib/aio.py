@@ -0,0 +1,189 @@
+"""Asyncio front end to jsonplaceholder.lib.rest.
+
+Requests are dispatched to a thread pool sharing the pooled session of the
+rest module, so connections are reused between calls while a semaphore
+bounds how many requests are in flight at once.
+"""
+import asyncio
+import concurrent.futures
+import functools
+import weakref
+from typing import Awaitable, Callable, Dict, Iterable, List
+
+import requests
+
+import jsonplaceholder.lib.rest as rest
+
+# Maximum number of requests in flight at once.
+CONCURRENCY = rest.POOL_MAXSIZE
+
+_executor: concurrent.futures.ThreadPoolExecutor = None
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def configure(concurrency: int):
+    """Changes the number of requests allowed in flight at once.
+
+    The connection pool of the rest module is grown to match, so that
+    concurrent requests do not have to open throwaway connections.
+
+    Args:
+        concurrency: Maximum number of requests in flight.
+    """
+    global CONCURRENCY, _executor
+    CONCURRENCY = concurrency
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+    if rest.POOL_MAXSIZE < concurrency:
+        rest.configure(pool_maxsize=concurrency)
+
+
+def _pool() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=CONCURRENCY)
+    return _executor
+
+
+def _limit() -> asyncio.Semaphore:
+    loop = asyncio.get_event_loop()
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(CONCURRENCY)
+    return _semaphores[loop]
+
+
+async def _call(func, *args) -> requests.Response:
+    async with _limit():
+        return await asyncio.get_event_loop().run_in_executor(
+            _pool(), functools.partial(func, *args))
+
+
+async def get(endpoint: str) -> requests.Response:
+    """Retrieves resource from jsonplaceholder at given endpoint.
+
+    Args:
+        endpoint: Endpoint of the resource to get.
+
+    Returns:
+        JSON Representation of the resource.
+    """
+    return await _call(rest.get, endpoint)
+
+
+async def conditional(endpoint: str, validators: Dict[str, str]) -> requests.Response:
+    """Retrieves a resource unless it still matches the validators.
+
+    Args:
+        endpoint: Endpoint of the resource to get.
+        validators: Conditional request headers, see cache.validators.
+
+    Returns:
+        The resource, or a 304 response if it has not changed.
+    """
+    return await _call(rest.conditional, endpoint, validators)
+
+
+async def post(endpoint: str, body: Dict[str, any]) -> requests.Response:
+    """Posts resource to jsonplaceholder at given endpoint.
+
+    Args:
+        endpoint: Endpoint of the resource to post the body.
+        body: Resource to post.
+
+    Returns:
+        JSON Representation of the resource.
+    """
+    return await _call(rest.post, endpoint, body)
+
+
+async def put(endpoint: str, body: Dict[str, any]) -> requests.Response:
+    """Updates resource in jsonplaceholder at given endpoint.
+
+    Args:
+        endpoint: Endpoint of the resource to be updated.
+        body: Updated state of the resource.
+
+    Returns:
+        JSON Representation of the resource.
+    """
+    return await _call(rest.put, endpoint, body)
+
+
+async def patch(endpoint: str, body: Dict[str, any]) -> requests.Response:
+    """Updates the given fields of the resource at given endpoint.
+
+    Args:
+        endpoint: Endpoint of the resource to be updated.
+        body: Fields to change.
+
+    Returns:
+        JSON Representation of the resource.
+    """
+    return await _call(rest.patch, endpoint, body)
+
+
+async def delete(endpoint: str) -> requests.Response:
+    """Deletes resource from jsonplaceholder at given endpoint.
+
+    Args:
+        endpoint: Endpoint of the resource to delete.
+
+    Returns:
+        JSON Representation of the resource.
+    """
+    return await _call(rest.delete, endpoint)
+
+
+def run(coroutine: Awaitable) -> any:
+    """Runs a coroutine to completion on a fresh event loop.
+
+    Args:
+        coroutine: Coroutine to run.
+
+    Returns:
+        Result of the coroutine.
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def get_all(endpoints: Iterable[str]) -> List[requests.Response]:
+    """Retrieves every endpoint concurrently.
+
+    Args:
+        endpoints: Endpoints of the resources to get.
+
+    Returns:
+        Responses in the same order as the endpoints.
+    """
+    async def fetch():
+        return await asyncio.gather(*[get(endpoint) for endpoint in endpoints])
+    return run(fetch())
+
+
+def each(items: Iterable[any], handle: Callable[[any], Awaitable]):
+    """Awaits a handler for every item with at most CONCURRENCY in flight.
+
+    Items are pulled from the iterable only as handlers finish, so large
+    inputs are never held in memory at once.
+
+    Args:
+        items: Items to handle.
+        handle: Coroutine function called with each item.
+    """
+    items = iter(items)
+
+    async def worker():
+        for item in items:
+            await handle(item)
+
+    async def work():
+        await asyncio.gather(*[worker() for _ in range(CONCURRENCY)])
+    run(work())
@@ -0,0 +1,237 @@
+"""Operations on many resources of a collection at once."""
+import csv
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+import requests
+import typer
+
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.plan as plan
+import jsonplaceholder.lib.rest as rest
+import jsonplaceholder.lib.util as util
+
+
+def get_many(endpoint: str, ids: List[int],
+             fields: List[str] = None) -> List[Dict[str, Union[int, str]]]:
+    """Retrieves resources by ID with the cheapest plan, see plan.choose.
+
+    IDs are usually coalesced into `?id=1&id=2...` queries which are sent
+    concurrently. Exits with an error if any of the IDs does not exist.
+
+    Args:
+        endpoint: Endpoint of the collection.
+        ids: IDs of the resources, may contain duplicates.
+        fields: Dotted paths to keep of each resource, all if None.
+
+    Returns:
+        Resources in the order of the given IDs.
+    """
+    unique = sorted(set(ids))
+    resources, = plan.fetch([plan.choose(endpoint, 'id', unique)])
+    found = {resource['id']: resource for resource in resources}
+    missing = [id for id in unique if id not in found]
+    if missing:
+        util.panic('Failure to retrieve resource. Not found: '
+                   + ', '.join(map(str, missing)))
+    if fields:
+        found = {id: util.project(resource, fields) for id, resource in found.items()}
+    return [found[id] for id in ids]
+
+
+def read_records(path: Path,
+                 types: Dict[str, Callable[[str], any]] = None
+                 ) -> Iterator[Tuple[int, Optional[Dict[str, any]]]]:
+    """Streams records from a JSONL or CSV file.
+
+    CSV columns name nested fields with dots, such as `address.geo.lat`,
+    and are converted with the callable given for the column in `types`.
+
+    Args:
+        path: File to read, CSV if its suffix is `.csv`, JSONL otherwise.
+        types: Converters for CSV columns that are not strings.
+
+    Yields:
+        Line numbers and records in the order they appear in the file,
+        None for a line that is not valid JSON or a row with a value its
+        converter rejects. A CSV record is numbered by the line it ends on.
+    """
+    with path.open(newline='', encoding='utf-8') as file:
+        if path.suffix.lower() != '.csv':
+            for number, line in enumerate(file, 1):
+                if line.strip():
+                    try:
+                        yield number, json.loads(line)
+                    except ValueError:
+                        yield number, None
+            return
+        reader = csv.DictReader(file)
+        for row in reader:
+            try:
+                for column, convert in (types or {}).items():
+                    if column in row:
+                        row[column] = convert(row[column])
+            except ValueError:
+                yield reader.line_num, None
+                continue
+            yield reader.line_num, util.unflatten(row)
+
+
+def create_from_file(endpoint: str,
+                     source: Path,
+                     view: Callable[[Dict[str, any]], str],
+                     output: Path = None,
+                     concurrency: int = None,
+                     types: Dict[str, Callable[[str], any]] = None):
+    """Creates every record of a JSONL or CSV file with concurrent POSTs.
+
+    Created resources are written to the output file as JSONL, or echoed
+    with the view function, as JSON if they lack a field it shows, in the
+    order the requests complete. Exits with
+    an error after all records are handled if any of them failed.
+
+    Args:
+        endpoint: Endpoint of the collection to create resources in.
+        source: JSONL or CSV file of records, see read_records.
+        view: Renders a created resource for the terminal.
+        output: JSONL file to write the created resources to.
+        concurrency: Maximum number of requests in flight.
+        types: Converters for CSV columns that are not strings.
+    """
+    if concurrency:
+        aio.configure(concurrency)
+    failed = []
+    created = 0
+    sink = output.open('w', encoding='utf-8') if output else None
+
+    async def create(item):
+        nonlocal created
+        line, record = item
+        if record is None:
+            failed.append(line)
+            return
+        try:
+            response = await aio.post(endpoint, record)
+        except requests.RequestException:
+            response = None
+        if response is None or response.status_code != 201:
+            failed.append(line)
+            return
+        created += 1
+        if sink:
+            sink.write(json.dumps(response.json()) + '\n')
+            sink.flush()
+        else:
+            created_resource = response.json()
+            try:
+                shown = view(created_resource)
+            except (KeyError, TypeError):
+                # A record may leave out fields the view shows.
+                shown = json.dumps(created_resource)
+            typer.echo(shown)
+
+    try:
+        aio.each(read_records(source, types), create)
+    finally:
+        if sink:
+            sink.close()
+    typer.echo(f'Created {created} resources.')
+    if failed:
+        util.panic('Failure to create resources from the records on lines: '
+                   + ', '.join(map(str, sorted(failed))))
+
+
+def params(filters: Dict[str, any]) -> List[Tuple[str, str]]:
+    """Query parameters of filters, skipping the ones not given.
+
+    A list or tuple of values repeats the key once per value, which
+    jsonplaceholder matches with any of them. Booleans are spelled the way
+    jsonplaceholder stores them.
+    """
+    return [(key, str(value).lower() if isinstance(value, bool) else str(value))
+            for key, values in filters.items() if values is not None
+            for value in (values if isinstance(values, (list, tuple)) else [values])]
+
+
+def query(filters: Dict[str, any]) -> str:
+    """Encodes filters as a query string, see params."""
+    return urlencode(params(filters))
+
+
+def find_ids(endpoint: str, filters: Dict[str, any]) -> List[int]:
+    """Resolves filters to the IDs of matching resources with one list query.
+
+    Args:
+        endpoint: Endpoint of the collection.
+        filters: Fields and the values they must have, None means any.
+
+    Returns:
+        IDs of the matching resources.
+    """
+    response = rest.get(f'{endpoint}?{query(filters)}')
+    if response.status_code != 200:
+        util.panic(f"Request resulted in error code {response.status_code}")
+    return [resource['id'] for resource in response.json()]
+
+
+def select_ids(endpoint: str, ids: List[int], filters: Dict[str, any]) -> List[int]:
+    """Narrows IDs down to the resources matching the filters.
+
+    Args:
+        endpoint: Endpoint of the collection.
+        ids: IDs given explicitly, empty to select every matching resource.
+        filters: Fields and the values they must have, None means any.
+
+    Returns:
+        The IDs unchanged if no filter is given, else the matching IDs.
+    """
+    if all(value is None for value in filters.values()):
+        return ids
+    matching = find_ids(endpoint, filters)
+    if not ids:
+        return matching
+    wanted = set(ids)
+    return [id for id in matching if id in wanted]
+
+
+def delete_many(endpoint: str, ids: List[int], concurrency: int = None):
+    """Deletes resources by ID with concurrent DELETEs.
+
+    A single ID is reported like a plain delete. For several IDs the outcome
+    of each is echoed as it completes, followed by a summary, and the
+    command fails after all IDs are handled if any of them failed.
+
+    Args:
+        endpoint: Endpoint of the collection.
+        ids: IDs of the resources to delete.
+        concurrency: Maximum number of requests in flight.
+    """
+    if concurrency:
+        aio.configure(concurrency)
+    unique = sorted(set(ids))
+    failed = []
+
+    async def remove(id):
+        try:
+            response = await aio.delete(f'{endpoint}/{id}')
+            status = response.status_code
+        except requests.RequestException as error:
+            status = type(error).__name__
+        if status != 200:
+            failed.append(id)
+        if len(unique) > 1:
+            typer.echo(f'id={id}: ' + ('deleted' if status == 200
+                                       else f'failed ({status})'))
+
+    aio.each(unique, remove)
+    if len(unique) == 1 and not failed:
+        typer.echo('Resource deleted successfully.')
+    elif len(unique) == 1:
+        util.panic('Failure to delete resource')
+    else:
+        typer.echo(f'Deleted {len(unique) - len(failed)} of {len(unique)} resources.')
+        if failed:
+            util.panic('Failure to delete resources: '
+                       + ', '.join(map(str, sorted(failed))))
@@ -0,0 +1,259 @@
+"""Persistent HTTP cache for responses retrieved from jsonplaceholder.
+
+Every entry is a single file holding a JSON header line with the status,
+headers and time of storage, followed by the raw body. Entries are grouped
+in one directory per resource so writes can invalidate everything they may
+have changed. Files are replaced atomically and read without locks, which
+keeps the cache safe to share between concurrently running processes.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+import requests.structures
+import requests.utils
+
+DIRECTORY = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'jsonplaceholder')
+# Size in bytes above which least recently used entries are evicted.
+MAX_SIZE = 64 * 1024 * 1024
+# Share of MAX_SIZE eviction frees the cache down to, so that a full cache
+# is not walked again on the very next write.
+EVICT_TO = 0.9
+ENABLED = True
+
+# Responses that embed or expand other resources may be changed by a write
+# to any resource, so they are kept apart and dropped on every write.
+RELATED = '_related'
+
+# Directory the cache was last walked in and its size since, counting what
+# was written after as added, so it is only walked when it may be full.
+_size = (None, 0)
+_lock = threading.Lock()
+
+
+def configure(directory: str = None, max_size: int = None, enabled: bool = None):
+    """Changes where and whether responses are cached.
+
+    Args:
+        directory: Directory to keep the cache in.
+        max_size: Size in bytes above which old entries are evicted.
+        enabled: Whether to use the cache at all.
+    """
+    global DIRECTORY, MAX_SIZE, ENABLED
+    if directory is not None:
+        DIRECTORY = directory
+    if max_size is not None:
+        MAX_SIZE = max_size
+    if enabled is not None:
+        ENABLED = enabled
+
+
+def bucket(url: str) -> str:
+    """Name of the resource whose representations the URL returns.
+
+    `/posts`, `/posts/1`, `/posts?userId=1` and `/users/1/posts` all
+    belong to `posts`.
+    """
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    if '_embed' in query or '_expand' in query:
+        return RELATED
+    segments = [segment for segment in parts.path.split('/')
+                if segment and not segment.isdigit()]
+    return segments[-1] if segments else RELATED
+
+
+def path(url: str) -> str:
+    key = hashlib.sha256(url.encode()).hexdigest()
+    return os.path.join(DIRECTORY, bucket(url), key)
+
+
+def directives(headers: Dict[str, str]) -> Dict[str, str]:
+    """Parses the Cache-Control header into a mapping of directives."""
+    result = {}
+    for directive in headers.get('Cache-Control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        if name:
+            result[name.lower()] = value.strip('"')
+    return result
+
+
+def load(url: str) -> Dict[str, any]:
+    """Reads the cached entry of a URL.
+
+    Returns:
+        Entry with `status`, `headers`, `stored` and `body` keys, or None
+        if the URL is not cached.
+    """
+    if not ENABLED:
+        return None
+    try:
+        with open(path(url), 'rb') as file:
+            entry = json.loads(file.readline())
+            entry['body'] = file.read()
+        os.utime(path(url))
+    except (OSError, ValueError):
+        return None
+    return entry
+
+
+def cached(url: str) -> bool:
+    """Whether the URL has an entry that may be used without revalidating
+    it, reading only its header."""
+    if not ENABLED:
+        return False
+    try:
+        with open(path(url), 'rb') as file:
+            return fresh(json.loads(file.readline()))
+    except (OSError, ValueError):
+        return False
+
+
+def fresh(entry: Dict[str, any]) -> bool:
+    """Whether an entry may be used without revalidating it."""
+    control = directives(entry['headers'])
+    if 'no-cache' in control or not control.get('max-age', '').isdigit():
+        return False
+    age = time.time() - entry['stored']
+    age += int(entry['headers'].get('Age', '0') or 0)
+    return age < int(control['max-age'])
+
+
+def validators(entry: Dict[str, any]) -> Dict[str, str]:
+    """Conditional request headers that revalidate an entry."""
+    headers = {}
+    if 'ETag' in entry['headers']:
+        headers['If-None-Match'] = entry['headers']['ETag']
+    if 'Last-Modified' in entry['headers']:
+        headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+    return headers
+
+
+def _write(url: str, entry: Dict[str, any]):
+    target = path(url)
+    header = dict(entry, body=None)
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(target))
+    except OSError:
+        return
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(json.dumps(header).encode() + b'\n')
+            file.write(entry['body'])
+            written = file.tell()
+        os.replace(temporary, target)
+    except OSError:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+        return
+    _grow(written)
+
+
+def _grow(written: int):
+    # Adds a write to the size of the cache, evicting only once it may
+    # have outgrown MAX_SIZE. The size does not subtract entries replaced
+    # or invalidated, so it only ever overestimates until the next walk.
+    global _size
+    with _lock:
+        directory, size = _size
+        if directory == DIRECTORY and size + written <= MAX_SIZE:
+            _size = (directory, size + written)
+            return
+    evict()
+
+
+def store(url: str, response: requests.Response):
+    """Caches a successful response if its headers allow it."""
+    if not ENABLED or response.status_code != 200:
+        return
+    headers = dict(response.headers)
+    control = directives(headers)
+    if 'no-store' in control:
+        return
+    if 'max-age' not in control and not validators({'headers': headers}):
+        return
+    _write(url, {'status': response.status_code,
+                 'headers': headers,
+                 'stored': time.time(),
+                 'body': response.content})
+
+
+def revalidated(url: str, entry: Dict[str, any],
+                response: requests.Response) -> Dict[str, any]:
+    """Refreshes an entry after the server answered 304 Not Modified."""
+    entry['headers'].update(response.headers)
+    entry['stored'] = time.time()
+    if ENABLED:
+        _write(url, entry)
+    return entry
+
+
+def response(url: str, entry: Dict[str, any]) -> requests.Response:
+    """Builds a response equivalent to the one an entry was stored from."""
+    result = requests.Response()
+    result.url = url
+    result.status_code = entry['status']
+    result.reason = 'OK'
+    result.headers = requests.structures.CaseInsensitiveDict(entry['headers'])
+    result.encoding = requests.utils.get_encoding_from_headers(result.headers)
+    result._content = entry['body']
+    result._content_consumed = True
+    return result
+
+
+def _files(directory: str) -> Iterator[os.DirEntry]:
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    yield from _files(entry.path)
+                else:
+                    yield entry
+    except OSError:
+        return
+
+
+def invalidate(url: str):
+    """Drops every entry a write to the URL may have made stale."""
+    for name in {bucket(url), RELATED}:
+        for file in _files(os.path.join(DIRECTORY, name)):
+            try:
+                os.unlink(file.path)
+            except OSError:
+                pass
+
+
+def evict():
+    """Removes least recently used entries, if the cache is larger than
+    MAX_SIZE, until it fits EVICT_TO of it."""
+    global _size
+    files = []
+    for file in _files(DIRECTORY):
+        try:
+            stat = file.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, file.path))
+    size = sum(file[1] for file in files)
+    if size > MAX_SIZE:
+        for _, file_size, file_path in sorted(files):
+            if size <= MAX_SIZE * EVICT_TO:
+                break
+            try:
+                os.unlink(file_path)
+            except OSError:
+                pass
+            size -= file_size
+    with _lock:
+        _size = (DIRECTORY, size)
@@ -0,0 +1,330 @@
+"""Column-oriented datasets of resources.
+
+Decoded JSON costs a dict per resource and an object per value, hundreds
+of bytes per resource. A Dataset keeps a column per field instead: `id`,
+`userId`, `postId` and `albumId` as arrays of machine integers,
+`completed` as an array of bytes, and every other field as interned
+strings: each distinct string stored once, as UTF-8 in a buffer shared by
+the column, and an array of the number of the string of each row. Nested
+fields are columns named by their dotted path, and fields with values of
+other types fall back to a list of the values.
+
+Filters and group-bys work a column at a time. A predicate is evaluated
+once per distinct value of its column and spread over the rows with a
+lookup in C, and conditions combine as masks of one byte per row.
+"""
+import array
+import collections
+import functools
+import itertools
+import json
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence
+
+import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.where as where
+
+# Fields kept as arrays of 64-bit integers.
+INTEGERS = ('id', 'userId', 'postId', 'albumId')
+# Fields kept as arrays of bytes.
+BOOLEANS = ('completed',)
+# Resources added to the columns at a time by from_records.
+CHUNK = 1024
+
+
+class _Missing:
+    """Value of a field a resource does not have."""
+
+    def __repr__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+class Numbers:
+    """A column of integers or booleans in an array."""
+
+    def __init__(self, typecode: str, values: Iterable[any] = ()):
+        self.array = array.array(typecode, values)
+        self.boolean = typecode == 'b'
+
+    def fits(self, values: List[any]) -> bool:
+        return set(map(type, values)) <= ({bool} if self.boolean else {int})
+
+    def extend(self, values: List[any]):
+        self.array.extend(values)
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, row: int) -> any:
+        return bool(self.array[row]) if self.boolean else self.array[row]
+
+    def __iter__(self) -> Iterator[any]:
+        return map(bool, self.array) if self.boolean else iter(self.array)
+
+    def mask(self, test: Callable[[any], bool]) -> bytes:
+        """One byte per row, 1 where the test holds for the value."""
+        truth = {value: bool(test(bool(value) if self.boolean else value))
+                 for value in set(self.array)}
+        return bytes(map(truth.__getitem__, self.array))
+
+    def count(self) -> Dict[any, int]:
+        return {bool(value) if self.boolean else value: count
+                for value, count in collections.Counter(self.array).items()}
+
+    def take(self, rows: Sequence[int]) -> 'Numbers':
+        return Numbers(self.array.typecode, map(self.array.__getitem__, rows))
+
+    def seal(self):
+        pass
+
+    def nbytes(self) -> int:
+        return self.array.itemsize * len(self.array)
+
+
+class Strings:
+    """A column of strings, each distinct one stored once as UTF-8 in a
+    single buffer, with an array of the number of each row's string."""
+
+    def __init__(self, values: List[str] = ()):
+        self.blob = bytearray()
+        self.offsets = array.array('I', [0])
+        self.codes = array.array('I')
+        self._index: Dict[str, int] = {}
+        self.extend(values)
+
+    def fits(self, values: List[any]) -> bool:
+        return set(map(type, values)) <= {str}
+
+    def extend(self, values: List[str]):
+        if self._index is None:
+            self.blob = bytearray(self.blob)
+            self._index = {text: code for code, text in enumerate(self.distinct())}
+        index = self._index
+        for value in dict.fromkeys(values):
+            if value not in index:
+                index[value] = len(self.offsets) - 1
+                self.blob += value.encode()
+                self.offsets.append(len(self.blob))
+        self.codes.extend(map(index.__getitem__, values))
+
+    def distinct(self) -> List[str]:
+        """The distinct strings, in the order they first appear."""
+        blob, offsets = self.blob, self.offsets
+        return [blob[offsets[code]:offsets[code + 1]].decode()
+                for code in range(len(offsets) - 1)]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> str:
+        code = self.codes[row]
+        return self.blob[self.offsets[code]:self.offsets[code + 1]].decode()
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.distinct().__getitem__, self.codes)
+
+    def mask(self, test: Callable[[any], bool]) -> bytes:
+        truth = bytes(bool(test(value)) for value in self.distinct())
+        return bytes(map(truth.__getitem__, self.codes))
+
+    def count(self) -> Dict[any, int]:
+        distinct = self.distinct()
+        return {distinct[code]: count
+                for code, count in collections.Counter(self.codes).items()}
+
+    def take(self, rows: Sequence[int]) -> 'Strings':
+        taken = Strings(list(map(self.distinct().__getitem__,
+                                 map(self.codes.__getitem__, rows))))
+        taken.seal()
+        return taken
+
+    def seal(self):
+        """Frees what is only needed to add rows."""
+        if self._index is not None:
+            self.blob = bytes(self.blob)
+            self._index = None
+
+    def nbytes(self) -> int:
+        return (len(self.blob) + self.offsets.itemsize * len(self.offsets)
+                + self.codes.itemsize * len(self.codes))
+
+
+class Values:
+    """A column of any values, for fields whose values are not all of the
+    type their name suggests, or are missing from some resources."""
+
+    def __init__(self, values: Iterable[any] = ()):
+        self.values = list(values)
+
+    def fits(self, values: List[any]) -> bool:
+        return True
+
+    def extend(self, values: List[any]):
+        self.values.extend(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, row: int) -> any:
+        return self.values[row]
+
+    def __iter__(self) -> Iterator[any]:
+        return iter(self.values)
+
+    def mask(self, test: Callable[[any], bool]) -> bytes:
+        return bytes(bool(test(value)) for value in self.values)
+
+    def count(self) -> Dict[any, int]:
+        return dict(collections.Counter(json.dumps(value) if isinstance(value, (list, dict))
+                                        else value for value in self.values))
+
+    def take(self, rows: Sequence[int]) -> 'Values':
+        return Values(map(self.values.__getitem__, rows))
+
+    def seal(self):
+        pass
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.values) + sum(sys.getsizeof(value) for value in self.values)
+
+
+def _column(path: str):
+    key = path.rpartition('.')[2]
+    if key in INTEGERS:
+        return Numbers('q')
+    if key in BOOLEANS:
+        return Numbers('b')
+    return Strings()
+
+
+class Dataset:
+    """Resources of a collection kept a column per field.
+
+    Attributes:
+        columns: Columns by the dotted path of their field, in the order
+            the fields first appear.
+    """
+
+    def __init__(self, columns: Dict[str, any] = None, size: int = 0):
+        self.columns = columns or {}
+        self.size = size
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, any]]) -> 'Dataset':
+        """Builds a dataset a chunk of resources at a time, so that a
+        stream of resources, as from rest.items, is never held in memory."""
+        dataset = cls()
+        records = iter(records)
+        chunk = list(itertools.islice(records, CHUNK))
+        while chunk:
+            dataset.extend(chunk)
+            chunk = list(itertools.islice(records, CHUNK))
+        for column in dataset.columns.values():
+            column.seal()
+        return dataset
+
+    def extend(self, records: List[Dict[str, any]]):
+        """Adds resources as the last rows."""
+        flat = [util.flatten(record) for record in records]
+        for path in dict.fromkeys(path for record in flat for path in record):
+            if path not in self.columns:
+                self.columns[path] = _column(path)
+                self._put(path, [MISSING] * self.size)
+        for path in self.columns:
+            self._put(path, [record.get(path, MISSING) for record in flat])
+        self.size += len(flat)
+
+    def _put(self, path: str, values: List[any]):
+        # A column falls back to a list on the first value of another type.
+        column = self.columns[path]
+        if not column.fits(values):
+            column = self.columns[path] = Values(column)
+        column.extend(values)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Dict[str, any]]:
+        return self.rows()
+
+    def rows(self, rows: Iterable[int] = None,
+             paths: List[str] = None) -> Iterator[Dict[str, any]]:
+        """Rebuilds resources as nested dicts.
+
+        Args:
+            rows: Row numbers of the resources, every row if None.
+            paths: Dotted paths to keep, as util.project, all if None.
+        """
+        names = [path for path in self.columns
+                 if paths is None or any(path == wanted or path.startswith(f'{wanted}.')
+                                         for wanted in paths)]
+        columns = [self.columns[name] for name in names]
+        for row in range(self.size) if rows is None else rows:
+            yield util.unflatten({name: value for name, value in
+                                  zip(names, (column[row] for column in columns))
+                                  if value is not MISSING})
+
+    def column(self, path: str) -> Iterator[any]:
+        """Values of a field in row order, None where resources lack it."""
+        column = self.columns.get(path)
+        if column is None:
+            return itertools.repeat(None, self.size)
+        return (None if value is MISSING else value for value in column)
+
+    def mask(self, condition) -> bytes:
+        """One byte per row, 1 where the row satisfies a where condition."""
+        if isinstance(condition, where.Predicate):
+            column = self.columns.get(condition.path)
+            if column is None:
+                return bytes([where.holds(condition, None)]) * self.size
+
+            def test(value):
+                return where.holds(condition, None if value is MISSING else value)
+            return column.mask(test)
+        masks = [int.from_bytes(self.mask(operand), 'little')
+                 for operand in condition.operands]
+        if condition.op == 'and':
+            combined = functools.reduce(int.__and__, masks)
+        elif condition.op == 'or':
+            combined = functools.reduce(int.__or__, masks)
+        else:
+            combined = masks[0] ^ int.from_bytes(b'\x01' * self.size, 'little')
+        return combined.to_bytes(self.size, 'little')
+
+    def select(self, condition) -> array.array:
+        """Row numbers of the rows satisfying a where condition."""
+        if condition is None:
+            return array.array('I', range(self.size))
+        return array.array('I', itertools.compress(range(self.size), self.mask(condition)))
+
+    def take(self, rows: Sequence[int]) -> 'Dataset':
+        """A dataset of the given rows, in their order."""
+        return Dataset({path: column.take(rows) for path, column in self.columns.items()},
+                       len(rows))
+
+    def count(self, path: str) -> Dict[any, int]:
+        """Number of rows by value of a field."""
+        column = self.columns.get(path)
+        if column is None:
+            return {None: self.size} if self.size else {}
+        counts = column.count()
+        if MISSING in counts:
+            counts[None] = counts.get(None, 0) + counts.pop(MISSING)
+        return counts
+
+    def group(self, path: str) -> Dict[any, array.array]:
+        """Row numbers by value of a field, values in order of appearance."""
+        groups: Dict[any, array.array] = {}
+        for row, value in enumerate(self.column(path)):
+            rows = groups.get(value)
+            if rows is None:
+                rows = groups[value] = array.array('I')
+            rows.append(row)
+        return groups
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the columns."""
+        return sum(column.nbytes() for column in self.columns.values())
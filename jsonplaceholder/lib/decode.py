@@ -0,0 +1,69 @@
+"""Incremental decoding of JSON arrays whose text arrives in chunks."""
+import json
+import re
+from typing import Iterable, Iterator
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+DELIMITERS = ' \t\n\r,]'
+
+_decoder = json.JSONDecoder()
+
+
+def elements(chunks: Iterable[str]) -> Iterator[any]:
+    """Decodes the elements of a JSON array as soon as each is complete.
+
+    Only the text of the element being decoded is kept, so memory does not
+    grow with the length of the array.
+
+    Args:
+        chunks: Text of a JSON array, split anywhere.
+
+    Yields:
+        Elements of the array in order.
+
+    Raises:
+        ValueError: If the text is not a JSON array.
+    """
+    buffer, index = '', 0
+    expecting = '['
+    chunks = iter(chunks)
+    final = False
+    while True:
+        chunk = next(chunks, None)
+        if chunk is None:
+            final = True
+        else:
+            buffer, index = buffer[index:] + chunk, 0
+        while True:
+            index = WHITESPACE.match(buffer, index).end()
+            if index == len(buffer):
+                break
+            if expecting == '[':
+                if buffer[index] != '[':
+                    raise ValueError(f'Expected a JSON array at {buffer[index:][:20]!r}')
+                index += 1
+                expecting = 'first'
+            elif expecting in ('first', ',') and buffer[index] == ']':
+                return
+            elif expecting == ',':
+                if buffer[index] != ',':
+                    raise ValueError(f'Expected , or ] at {buffer[index:][:20]!r}')
+                index += 1
+                expecting = 'value'
+            else:
+                try:
+                    element, end = _decoder.raw_decode(buffer, index)
+                except ValueError:
+                    if final:
+                        raise
+                    break
+                # A number may continue in the next chunk, as in `-1.` `5e3`.
+                if not final and (end == len(buffer) or (
+                        isinstance(element, (int, float))
+                        and buffer[end] not in DELIMITERS)):
+                    break
+                index = end
+                expecting = ','
+                yield element
+        if final:
+            raise ValueError('Unterminated JSON array')
@@ -0,0 +1,171 @@
+"""Expanding resources with the resources they relate to, for `--with`.
+
+A resource relates to the resources of the collections referring to it,
+named like the collection, such as the `posts` of a user, and to the
+resource it refers to, named in the singular, such as the `user` of a
+post. Relations nest with dots, `posts.comments` expands the posts of a
+user and the comments of each post.
+
+The relations of the requested resources are embedded in the responses
+with `_embed` and `_expand`, and so are those of every related resource
+fetched later. Whatever is still missing, the relations deeper than one
+level, is fetched a level at a time, all the relations of a level
+concurrently and each as planned by plan.choose, requesting each related
+resource once however many resources share it.
+"""
+import collections
+from typing import Dict, List, NamedTuple, Tuple
+from urllib.parse import urlencode
+
+import typer
+
+import jsonplaceholder.lib.bulk as bulk
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.plan as plan
+import jsonplaceholder.lib.util as util
+
+# Relations to expand by name, each with the relations to expand in turn
+# of the related resources.
+Relations = Dict[str, 'Relations']
+
+
+class Relation(NamedTuple):
+    """How the resources of a collection relate to other resources.
+
+    Attributes:
+        collection: Collection of the related resources.
+        key: Field of the related resources to match.
+        field: Field of the resource it matches.
+        many: Whether a resource has a list of them rather than one.
+    """
+    collection: str
+    key: str
+    field: str
+    many: bool
+
+
+def relations(collection: str) -> Dict[str, Relation]:
+    """Relations of the resources of a collection by name."""
+    found = {}
+    for table, reference in mirror.TABLES.items():
+        if reference and reference[1] == collection:
+            found[table] = Relation(table, reference[0], 'id', True)
+    reference = mirror.TABLES[collection]
+    if reference:
+        column, table = reference
+        found[table[:-1]] = Relation(table, 'id', column, False)
+    return found
+
+
+def parse(value: str) -> Relations:
+    """Parses `posts.comments,todos` into `{'posts': {'comments': {}},
+    'todos': {}}`, None if there is no value.
+
+    Raises:
+        typer.BadParameter: A relation is empty.
+    """
+    if value is None:
+        return None
+    tree = {}
+    for chain in value.split(','):
+        names = [name.strip() for name in chain.split('.')]
+        if not all(names):
+            raise typer.BadParameter('Expected relations such as posts,albums.photos.')
+        node = tree
+        for name in names:
+            node = node.setdefault(name, {})
+    return tree
+
+
+def _check(collection: str, tree: Relations, prefix: str = ''):
+    known = relations(collection)
+    for name, subtree in tree.items():
+        if name not in known:
+            raise typer.BadParameter(
+                f'{prefix}{name} is not one of '
+                + ', '.join(prefix + relation for relation in known),
+                param_hint="'--with'")
+        _check(known[name].collection, subtree, f'{prefix}{name}.')
+
+
+def _embedding(collection: str, tree: Relations) -> str:
+    known = relations(collection)
+    return urlencode([('_embed' if known[name].many else '_expand', name)
+                      for name in tree])
+
+
+def get_many(endpoint: str, ids: List[int], tree: Relations = None,
+             fields: List[str] = None) -> List[Dict[str, any]]:
+    """Retrieves resources by ID with their relations expanded.
+
+    Args:
+        endpoint: Endpoint of the collection.
+        ids: IDs of the resources, may contain duplicates.
+        tree: Relations to expand, see parse.
+        fields: Dotted paths to keep of each resource besides the
+            relations, all if None.
+
+    Returns:
+        Resources in the order of the given IDs.
+
+    Raises:
+        typer.BadParameter: The collection has no such relation.
+    """
+    if not tree:
+        return bulk.get_many(endpoint, ids, fields)
+    collection = endpoint.strip('/')
+    _check(collection, tree)
+    resources = bulk.get_many(f'{endpoint}?{_embedding(collection, tree)}', ids)
+    expand(collection, resources, tree)
+    if fields:
+        keep = fields + [name for name in tree if name not in fields]
+        resources = [util.project(resource, keep) for resource in resources]
+    return resources
+
+
+def expand(collection: str, resources: List[Dict[str, any]], tree: Relations):
+    """Adds the relations missing from resources in place.
+
+    Args:
+        collection: Collection of the resources.
+        resources: Resources to expand, may contain the same one twice.
+        tree: Relations to expand, see parse.
+    """
+    level = [(collection, resources, tree)]
+    while level:
+        wanted: List[Tuple[str, Relation, Relations, List[Dict[str, any]]]] = []
+        for collection, resources, tree in level:
+            known = relations(collection)
+            for name, subtree in tree.items():
+                missing = [resource for resource in resources if name not in resource]
+                if missing:
+                    wanted.append((name, known[name], subtree, missing))
+        plans = []
+        for name, relation, subtree, missing in wanted:
+            query = _embedding(relation.collection, subtree)
+            base = f'/{relation.collection}?{query}' if query else f'/{relation.collection}'
+            values = sorted({resource[relation.field] for resource in missing})
+            plans.append(plan.choose(base, relation.key, values))
+        for (name, relation, _, missing), related in zip(wanted, plan.fetch(plans)):
+            found = collections.defaultdict(list)
+            for resource in related:
+                found[resource[relation.key]].append(resource)
+            for resource in missing:
+                matching = found.get(resource[relation.field], [])
+                if relation.many:
+                    resource[name] = matching
+                else:
+                    resource[name] = matching[0] if matching else None
+
+        following = []
+        for collection, resources, tree in level:
+            known = relations(collection)
+            for name, subtree in tree.items():
+                if not subtree:
+                    continue
+                related = [item for resource in resources
+                           for item in (resource[name] if known[name].many
+                                        else [resource[name]])
+                           if item is not None]
+                following.append((known[name].collection, related, subtree))
+        level = following
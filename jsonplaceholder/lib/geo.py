@@ -0,0 +1,208 @@
+"""Finding users by the location of their address, for `users near` and
+`users within`.
+
+Points are kept in a grid of cells of CELL degrees, sorted by cell into
+arrays of coordinates, with the range of each cell that has any points.
+A bounding box visits only the cells it overlaps, taking the points of
+cells it covers whole and testing the others point by point. A radius is
+first narrowed down to the cells of the box around it, then distances
+are computed with the haversine formula over the arrays of the points
+left, from their latitudes in radians and cosines computed once.
+"""
+import array
+import collections
+import math
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import typer
+
+import jsonplaceholder.lib.models as models
+import jsonplaceholder.lib.rest as rest
+import jsonplaceholder.lib.util as util
+
+# Mean radius of the earth in kilometres.
+EARTH_RADIUS = 6371.0088
+# Size of the cells of the grid in degrees.
+CELL = 1.0
+
+
+def haversine(lat: float, lng: float, phis: Sequence[float], cosines: Sequence[float],
+              lngs: Sequence[float]) -> array.array:
+    """Kilometres from a point to each of many points.
+
+    Args:
+        lat: Latitude of the point in degrees.
+        lng: Longitude of the point in degrees.
+        phis: Latitudes of the points in radians.
+        cosines: Cosines of the latitudes of the points.
+        lngs: Longitudes of the points in degrees.
+    """
+    phi, lam = math.radians(lat), math.radians(lng)
+    cosine, sin, asin, sqrt = math.cos(phi), math.sin, math.asin, math.sqrt
+    diameter, radians = 2 * EARTH_RADIUS, math.pi / 180
+    return array.array('d', [
+        diameter * asin(min(1.0, sqrt(sin((other - phi) / 2) ** 2
+                                      + cosine * other_cosine
+                                      * sin((other_lng * radians - lam) / 2) ** 2)))
+        for other, other_cosine, other_lng in zip(phis, cosines, lngs)])
+
+
+class Grid:
+    """Points in cells of a grid, each point with a key.
+
+    Attributes:
+        keys: Keys of the points, sorted by cell.
+        lats: Latitudes of the points in degrees.
+        lngs: Longitudes of the points in degrees.
+        cells: Start and end of the points of each cell in the arrays, by
+            the number of the cell, its row times the columns plus its
+            column.
+    """
+
+    def __init__(self, keys: Sequence[int], lats: Sequence[float], lngs: Sequence[float],
+                 cell: float = CELL):
+        self.cell = cell
+        # One more than fit, for the points on the north pole and on the
+        # antimeridian at 180 degrees.
+        self.rows = int(180 / cell) + 1
+        self.columns = int(360 / cell) + 1
+        columns = self.columns
+        numbers = [int((lat + 90) / cell) * columns + int((lng + 180) / cell)
+                   for lat, lng in zip(lats, lngs)]
+        order = sorted(range(len(numbers)), key=numbers.__getitem__)
+        self.keys = array.array('q', map(keys.__getitem__, order))
+        self.lats = array.array('d', map(lats.__getitem__, order))
+        self.lngs = array.array('d', map(lngs.__getitem__, order))
+        self._phis = array.array('d', map(math.radians, self.lats))
+        self._cosines = array.array('d', map(math.cos, self._phis))
+        self.cells: Dict[int, Tuple[int, int]] = {}
+        start = 0
+        for number, count in sorted(collections.Counter(numbers).items()):
+            self.cells[number] = (start, start + count)
+            start += count
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _row(self, lat: float) -> int:
+        return int((lat + 90) / self.cell)
+
+    def _column(self, lng: float) -> int:
+        return int((lng + 180) / self.cell)
+
+    def _positions(self, south: float, west: float, north: float,
+                   east: float) -> Iterator[int]:
+        # Positions in the arrays of the points in a box, which crosses
+        # the antimeridian if west is east of east.
+        if west <= east:
+            spans = [(self._column(west), self._column(east))]
+        elif self._column(west) <= self._column(east):
+            # Both edges are in one column, so the box spans every column.
+            spans = [(0, self.columns - 1)]
+        else:
+            spans = [(self._column(west), self.columns - 1), (0, self._column(east))]
+        lats, lngs = self.lats, self.lngs
+        for row in range(self._row(south), self._row(north) + 1):
+            bottom = row * self.cell - 90
+            inside = south <= bottom and bottom + self.cell <= north
+            for first, last in spans:
+                for column in range(first, last + 1):
+                    span = self.cells.get(row * self.columns + column)
+                    if span is None:
+                        continue
+                    left = column * self.cell - 180
+                    if (inside and (west <= left and left + self.cell <= east
+                                    or west > east and (west <= left or left + self.cell <= east))):
+                        yield from range(*span)
+                        continue
+                    for position in range(*span):
+                        lat, lng = lats[position], lngs[position]
+                        if south <= lat <= north and (west <= lng <= east if west <= east
+                                                      else lng >= west or lng <= east):
+                            yield position
+
+    def within(self, south: float, west: float, north: float, east: float) -> List[int]:
+        """Keys of the points in a box, in the order of the keys.
+
+        Args:
+            south: Southern edge in degrees.
+            west: Western edge in degrees, east of the eastern edge for a
+                box across the antimeridian.
+            north: Northern edge in degrees.
+            east: Eastern edge in degrees.
+        """
+        return sorted(map(self.keys.__getitem__, self._positions(south, west, north, east)))
+
+    def near(self, lat: float, lng: float, radius: float) -> List[Tuple[int, float]]:
+        """Keys of the points within a distance of a point, nearest first.
+
+        Args:
+            lat: Latitude of the point in degrees.
+            lng: Longitude of the point in degrees.
+            radius: Distance in kilometres.
+
+        Returns:
+            The keys with the distance to each in kilometres.
+        """
+        angle = radius / EARTH_RADIUS
+        south = max(-90.0, lat - math.degrees(angle))
+        north = min(90.0, lat + math.degrees(angle))
+        west, east = -180.0, 180.0
+        # Longitudes are only narrowed down when the circle contains no pole.
+        if -90 < south and north < 90 and math.sin(angle) < math.cos(math.radians(lat)):
+            spread = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(lat))))
+            if spread < 180:
+                west = (lng - spread + 180) % 360 - 180
+                east = (lng + spread + 180) % 360 - 180
+        positions = array.array('q', self._positions(south, west, north, east))
+        distances = haversine(lat, lng, map(self._phis.__getitem__, positions),
+                              map(self._cosines.__getitem__, positions),
+                              map(self.lngs.__getitem__, positions))
+        return sorted(((self.keys[position], distance)
+                       for position, distance in zip(positions, distances)
+                       if distance <= radius), key=lambda item: item[1])
+
+
+def parse_bbox(value: str) -> Tuple[float, float, float, float]:
+    """Parses `south,west,north,east` in degrees, None if there is no value.
+
+    Raises:
+        typer.BadParameter: The value is not four coordinates in range, or
+            the south is north of the north.
+    """
+    if value is None:
+        return None
+    try:
+        south, west, north, east = map(float, value.split(','))
+    except ValueError:
+        raise typer.BadParameter('Expected south,west,north,east in degrees '
+                                 'such as -10,-20,10,20.')
+    if not all(-90 <= lat <= 90 for lat in (south, north)) or south > north:
+        raise typer.BadParameter('Latitudes must be between -90 and 90, south first.')
+    if not all(-180 <= lng <= 180 for lng in (west, east)):
+        raise typer.BadParameter('Longitudes must be between -180 and 180.')
+    return south, west, north, east
+
+
+def users() -> Tuple[List[Dict[str, any]], Grid]:
+    """Retrieves the users and a grid of their locations keyed by their
+    position in the list, leaving out users without a valid location.
+
+    Exits with an error if the request fails.
+    """
+    response = rest.get('/users')
+    if response.status_code != 200:
+        util.panic(f"Request resulted in error code {response.status_code}")
+    found = response.json()
+    keys, lats, lngs = [], array.array('d'), array.array('d')
+    for key, user in enumerate(found):
+        address = models.User.from_json(user).address
+        try:
+            lat, lng = float(address.geo.lat), float(address.geo.lng)
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if -90 <= lat <= 90 and -180 <= lng <= 180:
+            keys.append(key)
+            lats.append(lat)
+            lngs.append(lng)
+    return found, Grid(keys, lats, lngs)
@@ -0,0 +1,109 @@
+"""Listing a collection with filters, pages, `--fields` and `--where`."""
+import collections
+from typing import Dict, Iterator, List, Sequence, Tuple
+from urllib.parse import urlencode
+
+import requests
+import typer
+
+import jsonplaceholder.lib.bulk as bulk
+import jsonplaceholder.lib.columns as columns
+import jsonplaceholder.lib.pages as pages
+import jsonplaceholder.lib.plan as plan
+import jsonplaceholder.lib.rest as rest
+import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.view as view
+import jsonplaceholder.lib.where as where
+
+
+def records(endpoint: str,
+            fields: Sequence[view.Field],
+            filters: Dict[str, any] = None,
+            page: int = None,
+            limit: int = None,
+            follow: bool = False,
+            names: List[str] = None,
+            condition=None,
+            count_by: str = None) -> Tuple[Tuple[view.Field, ...], Iterator[Dict[str, any]]]:
+    """Lists the resources of a collection for the options of a list command.
+
+    Filters and the predicates of the condition json-server understands are
+    sent as query parameters, the condition is then evaluated on each
+    resource as it is decoded. Pages are pages of what the server returns,
+    so a condition it cannot evaluate may leave them short. Without pages,
+    a field that may take any of several values is fetched as planned by
+    plan.choose.
+
+    Counting by a field, the resources are kept in a columns.Dataset of
+    the fields the count and condition need, filtered and counted a column
+    at a time.
+
+    Args:
+        endpoint: Endpoint of the collection.
+        fields: Full row layout of the resources.
+        filters: Fields and the values they must have, None or no values
+            means any, several values any of them, see bulk.params.
+        page: Number of the first page, all resources if no page option.
+        limit: Resources per page.
+        follow: Whether to continue with the following pages.
+        names: Fields given with `--fields`.
+        condition: Parsed `--where` expression, see where.parse.
+        count_by: Field given with `--count-by`, to list the number of
+            resources of each of its values instead, most frequent first.
+
+    Returns:
+        The row layout and the resources, projected to the named fields.
+
+    Raises:
+        typer.BadParameter: A field named in the condition or counted by
+            does not exist.
+    """
+    layout, paths = view.select(fields, names)
+    known = {field.path: field for field in fields}
+    for path, option in [*((path, "'--where'") for path in where.paths(condition)),
+                         *([(count_by, "'--count-by'")] if count_by else [])]:
+        if path not in known:
+            raise typer.BadParameter(
+                f'{path} is not one of ' + ', '.join(known), param_hint=option)
+    if count_by:
+        paths = [count_by]
+    params = bulk.params(filters or {})
+    # json-server matches any of the values of a repeated key, so the
+    # predicates on fields already filtered on are only evaluated here.
+    filtered = {key for key, _ in params}
+    params += [(key, value) for key, value in where.pushdown(condition)
+               if key not in filtered]
+    counts = collections.Counter(key for key, _ in params)
+    spread = next((key for key, count in counts.items() if count > 1), None)
+    if page or limit or follow:
+        spread = None
+    query = urlencode([(key, value) for key, value in params if key != spread])
+    base = f'{endpoint}?{query}' if query else endpoint
+    keep = paths
+    if paths and condition is not None:
+        keep = paths + [path for path in where.paths(condition) if path not in paths]
+    if page or limit or follow:
+        resources = pages.records(base, page, limit, follow=follow, fields=keep)
+    elif spread:
+        values = list(dict.fromkeys(value for key, value in params if key == spread))
+        resources, = plan.fetch([plan.choose(base, spread, values)])
+        if keep:
+            resources = [util.project(resource, keep) for resource in resources]
+    else:
+        response: requests.Response = rest.stream(base)
+        if response.status_code != 200:
+            util.panic(f"Request resulted in error code {response.status_code}")
+        resources = rest.items(response, keep)
+    if count_by:
+        dataset = columns.Dataset.from_records(resources)
+        counts = dataset.take(dataset.select(condition)).count(count_by)
+        layout = (known[count_by]._replace(end=', ', label=count_by),
+                  view.Field('count', end=''))
+        return layout, (util.unflatten({count_by: value, 'count': count})
+                        for value, count in sorted(counts.items(),
+                                                   key=lambda item: item[1], reverse=True))
+    if condition is not None:
+        resources = where.select(condition, resources)
+        if keep != paths:
+            resources = (util.project(resource, paths) for resource in resources)
+    return layout, resources
@@ -0,0 +1,75 @@
+"""In-process memoization of responses for the lifetime of one invocation.
+
+The first caller of a method and URL performs the request while every
+concurrent caller of the same pair waits for, and shares, its response.
+Only successful responses are kept for later callers, a failed request
+or an error status is shared with the callers already waiting only.
+Writes drop the memoized responses of the resource they touch, the same
+way they invalidate the persistent cache.
+"""
+import concurrent.futures
+import threading
+from typing import Callable, Dict, Tuple
+
+import requests
+
+import jsonplaceholder.lib.cache as cache
+
+ENABLED = True
+
+_futures: Dict[Tuple[str, str], concurrent.futures.Future] = {}
+_lock = threading.Lock()
+
+
+def call(method: str, url: str,
+         fetch: Callable[[], requests.Response]) -> requests.Response:
+    """Performs a request once and shares its response with every caller.
+
+    Args:
+        method: HTTP method of the request.
+        url: URL of the request.
+        fetch: Performs the request when no response is memoized.
+
+    Returns:
+        Response of the first request made for the method and URL that
+        was successful, or of the request the caller waited for.
+    """
+    if not ENABLED:
+        return fetch()
+    key = (method, url)
+    with _lock:
+        future = _futures.get(key)
+        owner = future is None
+        if owner:
+            future = _futures[key] = concurrent.futures.Future()
+    if owner:
+        try:
+            response = fetch()
+        except BaseException as error:
+            _forget(key, future)
+            future.set_exception(error)
+        else:
+            if not 200 <= response.status_code < 300:
+                _forget(key, future)
+            future.set_result(response)
+    return future.result()
+
+
+def _forget(key: Tuple[str, str], future: concurrent.futures.Future):
+    with _lock:
+        if _futures.get(key) is future:
+            del _futures[key]
+
+
+def invalidate(url: str):
+    """Forgets every response a write to the URL may have made stale."""
+    buckets = {cache.bucket(url), cache.RELATED}
+    with _lock:
+        for key in [key for key in _futures if cache.bucket(key[1]) in buckets]:
+            del _futures[key]
+
+
+def clear():
+    """Forgets every memoized response."""
+    with _lock:
+        _futures.clear()
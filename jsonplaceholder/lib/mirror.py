@@ -0,0 +1,389 @@
+"""Local SQLite mirror of every resource of jsonplaceholder.
+
+Each collection is a table keyed by `id`, with its foreign key as an
+indexed column, the resource itself kept as JSON text and a hash of its
+content to tell changed resources apart without comparing them. The
+validators and IDs of every page a collection was last synced in are
+kept too, so a sync only downloads and rewrites the pages that changed.
+
+Offline, GET requests are answered from the mirror with the same bodies
+and status codes jsonplaceholder would send, so every command reading
+resources works unchanged, and collections are served by joining the
+stored texts without decoding them.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.where as where
+
+DATABASE = os.path.join(
+    os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share'),
+    'jsonplaceholder', 'mirror.sqlite3')
+OFFLINE = False
+# Resources per page when syncing a collection.
+PAGE_SIZE = 1000
+# Version of the schema, older mirrors are dropped and synced again.
+VERSION = 2
+
+# Collections in an order where every table follows the one it refers to,
+# with the foreign key column and the referenced table.
+TABLES = {
+    'users': None,
+    'posts': ('userId', 'users'),
+    'comments': ('postId', 'posts'),
+    'albums': ('userId', 'users'),
+    'photos': ('albumId', 'albums'),
+    'todos': ('userId', 'users'),
+}
+
+# Validators and resources of a page downloaded by a sync.
+Page = Tuple[Dict[str, str], List[Dict[str, any]]]
+
+_connection: sqlite3.Connection = None
+_lock = threading.Lock()
+
+
+def configure(database: str = None, offline: bool = None):
+    """Changes where the mirror is kept and whether to serve from it.
+
+    Args:
+        database: SQLite file of the mirror.
+        offline: Whether to answer GET requests from the mirror.
+    """
+    global DATABASE, OFFLINE
+    if database is not None:
+        close()
+        DATABASE = database
+    if offline is not None:
+        OFFLINE = offline
+
+
+class Counts(NamedTuple):
+    """Resources a sync added, changed and removed in a collection."""
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+
+
+def schema() -> str:
+    """Statements creating the tables and indexes of the mirror."""
+    statements = []
+    for table, reference in TABLES.items():
+        if reference is None:
+            statements.append(f'CREATE TABLE IF NOT EXISTS {table} ('
+                              'id INTEGER PRIMARY KEY, '
+                              'record TEXT NOT NULL, hash TEXT NOT NULL);')
+            continue
+        column, parent = reference
+        statements.append(
+            f'CREATE TABLE IF NOT EXISTS {table} ('
+            f'id INTEGER PRIMARY KEY, {column} INTEGER '
+            f'REFERENCES {parent}(id) DEFERRABLE INITIALLY DEFERRED, '
+            'record TEXT NOT NULL, hash TEXT NOT NULL);')
+        statements.append(f'CREATE INDEX IF NOT EXISTS {table}_{column} '
+                          f'ON {table}({column});')
+    statements.append('CREATE TABLE IF NOT EXISTS pages ('
+                      'collection TEXT, page INTEGER, size INTEGER, '
+                      'validators TEXT NOT NULL, ids TEXT NOT NULL, '
+                      'PRIMARY KEY (collection, page));')
+    statements.append('CREATE TABLE IF NOT EXISTS meta ('
+                      'key TEXT PRIMARY KEY, value INTEGER NOT NULL);')
+    statements.append(f'PRAGMA user_version = {VERSION};')
+    return '\n'.join(statements)
+
+
+def connect() -> sqlite3.Connection:
+    """Returns the connection to the mirror, creating the mirror if needed.
+
+    The connection is shared by every thread of the process and must only
+    be used while holding the lock, which the functions of this module take.
+    """
+    global _connection
+    if _connection is None:
+        os.makedirs(os.path.dirname(DATABASE), exist_ok=True)
+        _connection = sqlite3.connect(DATABASE, check_same_thread=False)
+        _connection.execute('PRAGMA foreign_keys = ON')
+        _connection.execute('PRAGMA journal_mode = WAL')
+        version, = _connection.execute('PRAGMA user_version').fetchone()
+        if version != VERSION:
+            _connection.executescript(''.join(
+                f'DROP TABLE IF EXISTS {table};'
+                for table in [*reversed(TABLES), 'pages']))
+        _connection.executescript(schema())
+    return _connection
+
+
+def close():
+    """Closes the connection to the mirror."""
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+
+def digest(resource: Dict[str, any]) -> str:
+    """Hash of the content of a resource, independent of key order."""
+    text = json.dumps(resource, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _row(table: str, resource: Dict[str, any]) -> List[any]:
+    reference = TABLES[table]
+    return ([resource.get('id')]
+            + ([resource.get(reference[0])] if reference else [])
+            + [json.dumps(resource, ensure_ascii=False), digest(resource)])
+
+
+def _insert(table: str, verb: str = 'INSERT') -> str:
+    reference = TABLES[table]
+    columns = ['id'] + ([reference[0]] if reference else []) + ['record', 'hash']
+    return (f'{verb} INTO {table} ({", ".join(columns)}) '
+            f'VALUES ({", ".join("?" * len(columns))})')
+
+
+def store(resources: Dict[str, Iterable[Dict[str, any]]]) -> Dict[str, int]:
+    """Replaces the mirrored collections in a single transaction.
+
+    The next sync of the replaced collections downloads them in full.
+
+    Args:
+        resources: Every resource of each collection, by collection name.
+
+    Returns:
+        Number of resources stored per collection.
+    """
+    counts = {}
+    with _lock:
+        connection = connect()
+        with connection:
+            for table in reversed(TABLES):
+                if table in resources:
+                    connection.execute(f'DELETE FROM {table}')
+                    connection.execute('DELETE FROM pages WHERE collection = ?', [table])
+            for table in TABLES:
+                if table not in resources:
+                    continue
+                rows = [_row(table, resource) for resource in resources[table]]
+                connection.executemany(_insert(table), rows)
+                counts[table] = len(rows)
+            _bump(connection)
+    return counts
+
+
+def pages(table: str) -> Dict[int, Tuple[Dict[str, str], List[int]]]:
+    """Validators and IDs of each page a collection was last synced in.
+
+    Pages synced with another PAGE_SIZE are left out.
+    """
+    with _lock:
+        rows = connect().execute(
+            'SELECT page, validators, ids FROM pages '
+            'WHERE collection = ? AND size = ?', [table, PAGE_SIZE]).fetchall()
+    return {page: (json.loads(validators), json.loads(ids))
+            for page, validators, ids in rows}
+
+
+def apply(changes: Dict[str, Tuple[Dict[int, Page], int]]) -> Dict[str, Counts]:
+    """Applies the pages a sync downloaded in a single transaction.
+
+    Only resources whose hash differs from the mirrored one are written,
+    and resources no longer in any page are removed.
+
+    Args:
+        changes: By collection name, the pages that changed, each with its
+            validators and resources, and the number of the last page.
+            Pages not given are unchanged since the previous sync.
+
+    Returns:
+        Resources added, changed and removed per collection.
+    """
+    counts = {}
+    with _lock:
+        connection = connect()
+        with connection:
+            for table, (changed, last) in changes.items():
+                counts[table] = _apply(connection, table, changed, last)
+            if any(any(count) for count in counts.values()):
+                _bump(connection)
+    return counts
+
+
+def _bump(connection: sqlite3.Connection):
+    connection.execute("INSERT INTO meta VALUES ('generation', 1) "
+                       'ON CONFLICT (key) DO UPDATE SET value = value + 1')
+
+
+def generation() -> int:
+    """Number of changes made to the mirror so far, to tell whether what
+    was derived from it is still current."""
+    rows = read("SELECT value FROM meta WHERE key = 'generation'")
+    return rows[0][0] if rows else 0
+
+
+def _apply(connection: sqlite3.Connection, table: str,
+           changed: Dict[int, Page], last: int) -> Counts:
+    known = {page: json.loads(ids) for page, ids in connection.execute(
+        'SELECT page, ids FROM pages WHERE collection = ? AND size = ?',
+        [table, PAGE_SIZE])}
+    if not changed and all(page in known for page in range(1, last + 1)) \
+            and max(known, default=0) == last:
+        return Counts()
+    hashes = dict(connection.execute(f'SELECT id, hash FROM {table}'))
+    present = set()
+    rows, updates = [], []
+    for page in range(1, last + 1):
+        if page not in changed:
+            present.update(known.get(page, []))
+            continue
+        _, resources = changed[page]
+        for resource in resources:
+            present.add(resource['id'])
+            row = _row(table, resource)
+            if resource['id'] not in hashes:
+                rows.append(row)
+            elif hashes[resource['id']] != row[-1]:
+                updates.append(row)
+    removed = [id for id in hashes if id not in present]
+    connection.executemany(f'DELETE FROM {table} WHERE id = ?', [[id] for id in removed])
+    connection.executemany(_insert(table, 'INSERT OR REPLACE'), rows + updates)
+    connection.execute('DELETE FROM pages WHERE collection = ? AND (page > ? OR size != ?)',
+                       [table, last, PAGE_SIZE])
+    connection.executemany(
+        'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)',
+        [[table, page, PAGE_SIZE, json.dumps(validators),
+          json.dumps([resource['id'] for resource in resources])]
+         for page, (validators, resources) in changed.items() if page <= last])
+    return Counts(len(rows), len(updates), len(removed))
+
+
+def last_page(total: int) -> int:
+    """Number of the last page of a collection of the given size."""
+    return max(math.ceil(total / PAGE_SIZE), 1)
+
+
+def read(sql: str, parameters: Iterable[any] = ()) -> List[tuple]:
+    """Runs a query against the mirror and returns every row."""
+    with _lock:
+        if _connection is None and not os.path.exists(DATABASE):
+            util.panic('No mirror to read from, run `jsonplaceholder sync` first.')
+        return connect().execute(sql, list(parameters)).fetchall()
+
+
+def _integers(values: List[str]) -> List[int]:
+    return [int(value) for value in values if value.lstrip('-').isdigit()]
+
+
+def _numbers(values: List[str]) -> List[float]:
+    try:
+        return [float(value) for value in values]
+    except ValueError:
+        return []
+
+
+def _indexed(table: str, filters: Dict[str, List[str]]) -> Tuple[List[str], List[any]]:
+    # Turns the filters on `id` and the foreign key into SQL conditions,
+    # which SQLite resolves through their indexes, and removes them.
+    columns = {'id'} | ({TABLES[table][0]} if TABLES[table] else set())
+    clauses, parameters = [], []
+    for key in list(filters):
+        column, _, suffix = key.rpartition('_')
+        if column not in columns:
+            column, suffix = key, ''
+        if column not in columns:
+            continue
+        values = filters[key]
+        if suffix == '':
+            values = _integers(values)
+            clauses.append(f'{column} IN ({", ".join("?" * len(values))})')
+        elif suffix in ('gte', 'lte') and _numbers(values):
+            clauses.append(f'{column} {">=" if suffix == "gte" else "<="} ?')
+            values = [min(_numbers(values)) if suffix == 'gte' else max(_numbers(values))]
+        elif suffix == 'ne' and len(values) == 1 and _integers(values):
+            clauses.append(f'{column} != ?')
+            values = _integers(values)
+        else:
+            continue
+        parameters.extend(values)
+        del filters[key]
+    return clauses, parameters
+
+
+def _body(status: int, text: str, headers: Dict[str, str] = None) -> Dict[str, any]:
+    return {'status': status,
+            'headers': dict({'Content-Type': 'application/json; charset=utf-8'},
+                            **(headers or {})),
+            'body': text.encode()}
+
+
+def answer(url: str) -> Dict[str, any]:
+    """Answers a GET request from the mirror the way jsonplaceholder would.
+
+    Supports `/collection`, `/collection/id`, nested routes such as
+    `/posts/1/comments` filtering by `postId`, filters on any field with
+    the operators of where.served, repeated for any of several values, and
+    `_page`, `_limit`, `_start` and `_end`. Filters on `id` and the
+    foreign key are resolved through their indexes.
+
+    Returns:
+        Entry with `status`, `headers` and `body` keys, see cache.response.
+    """
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split('/') if segment]
+    if not segments or segments[0] not in TABLES or len(segments) > 3:
+        return _body(404, '{}')
+    table = segments[0]
+    filters, options = {}, {}
+    if len(segments) == 3:
+        if segments[2] not in TABLES:
+            return _body(404, '{}')
+        table = segments[2]
+        filters[f'{segments[0][:-1]}Id'] = [segments[1]]
+    elif len(segments) == 2:
+        rows = read(f'SELECT record FROM {table} WHERE id = ?',
+                    _integers(segments[1:])[:1] or [None])
+        return _body(200, rows[0][0]) if rows else _body(404, '{}')
+
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        if key.startswith('_'):
+            options[key] = value
+        else:
+            filters.setdefault(key, []).append(value)
+    clauses, parameters = _indexed(table, filters)
+    condition = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+    records = [record for record, in read(
+        f'SELECT record FROM {table}{condition} ORDER BY id', parameters)]
+    if filters:
+        records = [record for record, resource in
+                   ((record, json.loads(record)) for record in records)
+                   if all(where.served(resource, key, values)
+                          for key, values in filters.items())]
+
+    headers = {}
+    start, end = options.get('_start'), options.get('_end')
+    limit = options.get('_limit')
+    if '_page' in options:
+        limit = int(limit or 10)
+        start = (max(int(options['_page']), 1) - 1) * limit
+        end = start + limit
+    elif limit is not None:
+        end = int(start or 0) + int(limit)
+    if start is not None or end is not None:
+        headers['X-Total-Count'] = str(len(records))
+        records = records[int(start or 0):None if end is None else int(end)]
+    return _body(200, f'[{",".join(records)}]', headers)
+
+
+def response(url: str) -> requests.Response:
+    """Builds the response jsonplaceholder would send to a GET of the URL."""
+    return cache.response(url, answer(url))
@@ -0,0 +1,117 @@
+"""Typed models of the resources of jsonplaceholder.
+
+Each model keeps its fields in `__slots__`, named as in the JSON, so an
+instance has no dict of its own. Like view.compile, the constructor and
+the conversions from and to decoded JSON are compiled once per model into
+straight-line functions, with no loop over the fields and no lookup of
+their names at run time.
+
+Fields a resource does not have are None, and are left out of its JSON
+along with nested resources left empty, so a model with only some fields
+set is the body of a partial update.
+"""
+from typing import Dict, Type
+
+
+def _compile(model: Type['Model']):
+    fields = model.__slots__
+    nested = model.NESTED
+    scope = {f'_{field}': type_ for field, type_ in nested.items()}
+    scope['_model'] = model
+    parameters = ', '.join(f'{field}=None' for field in fields)
+    init = [f'def __init__(self, {parameters}):']
+    init += [f'    self.{field} = {field}' for field in fields] or ['    pass']
+    from_json = ['def from_json(data):',
+                 '    self = _model.__new__(_model)',
+                 '    get = data.get']
+    to_json = ['def to_json(self):',
+               '    data = {}']
+    for field in fields:
+        if field in nested:
+            from_json += [f'    value = get({field!r})',
+                          f'    self.{field} = None if value is None '
+                          f'else _{field}.from_json(value)']
+            to_json += [f'    value = self.{field}',
+                        '    if value is not None:',
+                        '        value = value.to_json()',
+                        '        if value:',
+                        f'            data[{field!r}] = value']
+        else:
+            from_json.append(f'    self.{field} = get({field!r})')
+            to_json += [f'    if self.{field} is not None:',
+                        f'        data[{field!r}] = self.{field}']
+    from_json.append('    return self')
+    to_json.append('    return data')
+    exec('\n'.join(init + from_json + to_json), scope)
+    model.__init__ = scope['__init__']
+    model.from_json = staticmethod(scope['from_json'])
+    model.to_json = scope['to_json']
+
+
+class Model:
+    """Base of the models.
+
+    Every subclass is given these by _compile when it is defined:
+
+        from_json(data)  a static method building a model from a decoded
+                         resource, ignoring unknown fields
+        to_json()        the resource as JSON to encode, without the
+                         fields that are None
+
+    Attributes:
+        NESTED: Models of the fields holding nested resources.
+    """
+    __slots__ = ()
+    NESTED: Dict[str, Type['Model']] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _compile(cls)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class Geo(Model):
+    __slots__ = ('lat', 'lng')
+
+
+class Address(Model):
+    __slots__ = ('street', 'suite', 'city', 'zipcode', 'geo')
+    NESTED = {'geo': Geo}
+
+
+class Company(Model):
+    __slots__ = ('name', 'catchPhrase', 'bs')
+
+
+class User(Model):
+    __slots__ = ('id', 'name', 'username', 'email', 'address', 'phone', 'website',
+                 'company')
+    NESTED = {'address': Address, 'company': Company}
+
+
+class Post(Model):
+    __slots__ = ('userId', 'id', 'title', 'body')
+
+
+class Comment(Model):
+    __slots__ = ('postId', 'id', 'name', 'email', 'body')
+
+
+class Album(Model):
+    __slots__ = ('userId', 'id', 'title')
+
+
+class Photo(Model):
+    __slots__ = ('albumId', 'id', 'title', 'url', 'thumbnailUrl')
+
+
+class Todo(Model):
+    __slots__ = ('userId', 'id', 'title', 'completed')
@@ -0,0 +1,117 @@
+"""Writing resources to stdout as a styled table or in machine-readable formats.
+
+The table is paged and coloured on a terminal. Everything else, including
+the table when stdout is not a terminal, is written straight to the block
+buffered stdout, so piping into other tools costs neither styling nor a
+pager.
+"""
+import csv
+import enum
+import json
+import sys
+from typing import Callable, Dict, Iterable, Iterator, Sequence
+
+import typer
+
+import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.view as view
+
+
+class Format(str, enum.Enum):
+    table = 'table'
+    jsonl = 'jsonl'
+    csv = 'csv'
+    tsv = 'tsv'
+
+
+FORMAT = Format.table
+
+
+def configure(format: Format):
+    """Changes the format resources are written in."""
+    global FORMAT
+    FORMAT = Format(format)
+
+
+def emit(resources: Iterable[Dict[str, any]],
+         fields: Sequence[view.Field],
+         pager: bool = True,
+         relations: Dict[str, any] = None):
+    """Writes resources in the configured format.
+
+    Args:
+        resources: Resources to write.
+        fields: Layout of a table row, see view.compile.
+        pager: Whether to page the table on a terminal.
+        relations: Relations expanded in the resources, shown in the table
+            as indented rows under each resource, see expand.parse.
+    """
+    stream = sys.stdout
+    if FORMAT is Format.jsonl:
+        write_jsonl(resources, stream)
+    elif FORMAT is Format.csv:
+        write_csv(resources, stream, 'excel')
+    elif FORMAT is Format.tsv:
+        write_csv(resources, stream, 'excel-tab')
+    elif not stream.isatty():
+        render = _renderer(fields, relations, color=False)
+        for resource in resources:
+            stream.write(render(resource))
+            stream.write('\n')
+    elif pager:
+        render = _renderer(fields, relations)
+        typer.echo_via_pager(f'{render(resource)}\n' for resource in resources)
+    else:
+        render = _renderer(fields, relations)
+        for resource in resources:
+            typer.echo(render(resource))
+    stream.flush()
+
+
+def _renderer(fields: Sequence[view.Field], relations: Dict[str, any] = None,
+              color: bool = True) -> Callable[[Dict[str, any]], str]:
+    row = view.compile(fields, color)
+    if not relations:
+        return row
+    return lambda resource: '\n'.join([row(resource),
+                                       *_related(resource, relations, color, 1)])
+
+
+def _related(resource: Dict[str, any], relations: Dict[str, any], color: bool,
+             depth: int) -> Iterator[str]:
+    # Related resources have no layout of their own here, every field is
+    # shown in the order the resource has them.
+    for name, nested in relations.items():
+        related = resource.get(name)
+        for item in related if isinstance(related, list) else [related]:
+            if item is None:
+                continue
+            paths = list(util.flatten(
+                {key: value for key, value in item.items() if key not in nested}))
+            layout = tuple(view.Field(path, end=', ' if path != paths[-1] else '')
+                           for path in paths)
+            yield '  ' * depth + f'{name}: ' + view.compile(layout, color)(item)
+            yield from _related(item, nested, color, depth + 1)
+
+
+def write_jsonl(resources: Iterable[Dict[str, any]], stream):
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    for resource in resources:
+        stream.write(encode(resource))
+        stream.write('\n')
+
+
+def write_csv(resources: Iterable[Dict[str, any]], stream, dialect: str):
+    """Writes resources as rows under a header, nested fields as dotted
+    columns such as `address.geo.lat`. The columns are those of the first
+    resource."""
+    writer = csv.writer(stream, dialect=dialect)
+    columns = None
+    for resource in resources:
+        row = util.flatten(resource)
+        if columns is None:
+            columns = list(row)
+            writer.writerow(columns)
+        # Lists, such as the relations of --with, are written as JSON.
+        writer.writerow([json.dumps(value) if isinstance(value, list) else value
+                         for value in (row.get(column, '') for column in columns)])
@@ -0,0 +1,84 @@
+"""Paging through collections with jsonplaceholder's `_page` and `_limit`.
+
+While the resources of one page are being consumed, the next page is
+already being fetched in the background, so paging through a collection
+does not stall on the network and only two pages are held at a time.
+"""
+import concurrent.futures
+from typing import Dict, Iterator, List
+
+import requests
+
+import jsonplaceholder.lib.rest as rest
+import jsonplaceholder.lib.util as util
+
+# Resources per page when only a page number is given, as on the server.
+LIMIT = 10
+# Resources per page when paging through the rest of a collection.
+FOLLOW_LIMIT = 100
+
+
+def endpoint(base: str, page: int, limit: int) -> str:
+    """Endpoint of one page of a collection, which may already be filtered."""
+    separator = '&' if '?' in base else '?'
+    return f'{base}{separator}_page={page}&_limit={limit}'
+
+
+def _fetch(base: str, page: int, limit: int, fields: List[str]):
+    # Pages bypass the in-process memo, which would keep every page alive.
+    response = rest.stream(endpoint(base, page, limit))
+    if response.status_code != 200:
+        return response, []
+    return response, list(rest.items(response, fields))
+
+
+def _last(response: requests.Response, resources: List[Dict[str, any]],
+          page: int, limit: int) -> bool:
+    total = response.headers.get('X-Total-Count', '')
+    if total.isdigit():
+        return page * limit >= int(total)
+    return len(resources) < limit
+
+
+def records(base: str, page: int = None, limit: int = None, follow: bool = False,
+            fields: List[str] = None) -> Iterator[Dict[str, any]]:
+    """Retrieves a page of a collection, or every page from it onwards.
+
+    The first page is retrieved before returning, so failures are reported
+    before anything is rendered.
+
+    Args:
+        base: Endpoint of the collection, optionally with filters.
+        page: Number of the first page, starting at 1.
+        limit: Resources per page, LIMIT or FOLLOW_LIMIT if not given.
+        follow: Whether to continue with the following pages.
+        fields: Dotted paths to keep of each resource, all if None.
+
+    Returns:
+        Iterator over the resources of the pages in order.
+    """
+    page = page or 1
+    limit = limit or (FOLLOW_LIMIT if follow else LIMIT)
+    response, resources = _fetch(base, page, limit, fields)
+    if response.status_code != 200:
+        util.panic(f"Request resulted in error code {response.status_code}")
+    if not follow:
+        return iter(resources)
+    return _follow(base, page, limit, fields, response, resources)
+
+
+def _follow(base: str, page: int, limit: int, fields: List[str],
+            response: requests.Response,
+            resources: List[Dict[str, any]]) -> Iterator[Dict[str, any]]:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as prefetcher:
+        while True:
+            upcoming = None
+            if resources and not _last(response, resources, page, limit):
+                upcoming = prefetcher.submit(_fetch, base, page + 1, limit, fields)
+            yield from resources
+            if upcoming is None:
+                return
+            response, resources = upcoming.result()
+            if response.status_code != 200:
+                util.panic(f"Request resulted in error code {response.status_code}")
+            page += 1
@@ -0,0 +1,174 @@
+"""Planning how to fetch the resources of a collection whose field takes
+any of many values, such as the comments of 60 posts.
+
+These plans answer it:
+
+    batches  the values in as few requests as URLs allow, see rest.batch
+    routes   one nested route per value of a foreign key, `/posts/1/comments`
+    keys     one request per value, such as `/comments?postId=1`
+    scan     the whole collection in one request, filtered here
+
+Each is costed in the seconds it should take: the rounds of concurrent
+requests it sends times the latency of a request, plus the bytes it
+downloads over the bandwidth, both as observed by timings. The sizes of
+the collections of jsonplaceholder are known. Requests the HTTP cache can
+answer cost nothing, which is how one request per value wins when earlier
+commands fetched most of them already, by either spelling.
+
+Offline, batches are always chosen, the mirror resolves them through the
+index of the field.
+"""
+import itertools
+import math
+from typing import Dict, List, NamedTuple, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import typer
+
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.rest as rest
+import jsonplaceholder.lib.timings as timings
+import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.where as where
+
+# Resources in each collection of jsonplaceholder.
+SIZES = {'users': 10, 'posts': 100, 'comments': 500,
+         'albums': 100, 'photos': 5000, 'todos': 200}
+# Mean bytes of a resource in the indented JSON jsonplaceholder sends.
+BYTES = {'users': 560, 'posts': 280, 'comments': 310,
+         'albums': 90, 'photos': 210, 'todos': 120}
+# Strategies in the order ties are broken in.
+STRATEGIES = ('batches', 'routes', 'keys', 'scan')
+# Whether to describe every plan on stderr as it is chosen.
+EXPLAIN = False
+
+
+def configure(explain: bool = None):
+    """Changes whether plans are described as they are chosen."""
+    global EXPLAIN
+    if explain is not None:
+        EXPLAIN = explain
+
+
+class Plan(NamedTuple):
+    """How to fetch the resources whose field takes any of some values.
+
+    Attributes:
+        strategy: One of STRATEGIES.
+        endpoints: Endpoints to request.
+        key: Field the resources are selected by.
+        values: Values the field may take.
+        estimates: Requests and estimated seconds of each strategy that
+            applies.
+    """
+    strategy: str
+    endpoints: List[str]
+    key: str
+    values: List[any]
+    estimates: Dict[str, Tuple[int, float]]
+
+
+def matching(collection: str, key: str, count: int) -> float:
+    """Expected number of resources whose field takes any of count values.
+
+    IDs select a resource each and foreign keys the share of the
+    collection each referenced resource has, anything else may select
+    the whole collection.
+    """
+    size = SIZES[collection]
+    if key == 'id':
+        return min(count, size)
+    reference = mirror.TABLES.get(collection)
+    if reference and reference[0] == key:
+        return min(count * size / SIZES[reference[1]], size)
+    return size
+
+
+def cost(endpoints: List[str], resources: float, collection: str) -> float:
+    """Estimated seconds to request endpoints returning so many resources."""
+    uncached = [endpoint for endpoint in endpoints
+                if not cache.cached(f'{rest.URI}{endpoint}')]
+    if not uncached:
+        return 0.0
+    latency, bandwidth = timings.estimates()
+    rounds = math.ceil(len(uncached) / aio.CONCURRENCY)
+    downloaded = resources * len(uncached) / len(endpoints)
+    return rounds * latency + downloaded * BYTES[collection] / bandwidth
+
+
+def choose(endpoint: str, key: str, values: List[any]) -> Plan:
+    """Plans fetching the resources whose field takes any of the values.
+
+    Args:
+        endpoint: Endpoint of the collection, which may have a query.
+        key: Field to select by.
+        values: Values the field may take, without duplicates.
+
+    Returns:
+        The cheapest plan.
+    """
+    parts = urlsplit(endpoint)
+    collection = parts.path.strip('/')
+    separator = '&' if '?' in endpoint else '?'
+    candidates = {
+        'batches': rest.batch(endpoint, key, values),
+        'keys': [f'{endpoint}{separator}{urlencode({key: value})}' for value in values],
+        'scan': [endpoint],
+    }
+    reference = mirror.TABLES.get(collection)
+    if reference and reference[0] == key:
+        query = f'?{parts.query}' if parts.query else ''
+        candidates['routes'] = [f'/{reference[1]}/{value}/{collection}{query}'
+                                for value in values]
+    selected = matching(collection, key, len(values))
+    estimates = {strategy: (len(endpoints), cost(endpoints, selected, collection))
+                 for strategy, endpoints in candidates.items()}
+    estimates['scan'] = (1, cost([endpoint], SIZES[collection], collection))
+    if mirror.OFFLINE or not values:
+        strategy = 'batches'
+    else:
+        strategy = min((strategy for strategy in STRATEGIES if strategy in estimates),
+                       key=lambda strategy: estimates[strategy][1])
+    chosen = Plan(strategy, candidates[strategy], key, values, estimates)
+    if EXPLAIN:
+        typer.echo(explain(chosen, endpoint), err=True)
+    return chosen
+
+
+def explain(plan: Plan, endpoint: str) -> str:
+    """Describes a plan and the ones it was chosen over."""
+    lines = [f'{endpoint} by {plan.key}, {len(plan.values)} values'
+             + (', offline' if mirror.OFFLINE else '') + ':']
+    for strategy in (strategy for strategy in STRATEGIES if strategy in plan.estimates):
+        count, seconds = plan.estimates[strategy]
+        requests = f'{count} request' + ('' if count == 1 else 's')
+        lines.append(f'{"*" if strategy == plan.strategy else " "} {strategy:<8}'
+                     f'{requests:>14} {seconds:>9.3f} s')
+    return '\n'.join(lines)
+
+
+def fetch(plans: List[Plan]) -> List[List[Dict[str, any]]]:
+    """Carries out plans, sending all their requests concurrently.
+
+    Exits with an error if any request fails.
+
+    Returns:
+        The resources selected by each plan.
+    """
+    endpoints = [endpoint for plan in plans for endpoint in plan.endpoints]
+    responses = iter(aio.get_all(endpoints))
+    results = []
+    for plan in plans:
+        resources = []
+        for response in itertools.islice(responses, len(plan.endpoints)):
+            if response.status_code != 200:
+                util.panic('Failure to retrieve resource.')
+            resources.extend(response.json())
+        if plan.strategy == 'scan':
+            values = [str(value) for value in plan.values]
+            resources = [resource for resource in resources
+                         if where.served(resource, plan.key, values)]
+        results.append(resources)
+    return results
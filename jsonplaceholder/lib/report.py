@@ -0,0 +1,85 @@
+"""Statistics per user across the collections, for `stats`.
+
+Every collection is requested once, all of them concurrently, and kept as
+a columns.Dataset of only the fields the statistics need. Resources are
+counted by their foreign key a column at a time, and counts of resources
+further away from the users are rolled up along the references, photos by
+album to the user of the album and comments by post to the user of the
+post, so joining costs a step per distinct key rather than per resource.
+"""
+import collections
+from typing import Dict, List
+
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.columns as columns
+import jsonplaceholder.lib.util as util
+import jsonplaceholder.lib.where as where
+
+# Fields of each collection the statistics need.
+FIELDS = {
+    'users': ['id', 'name'],
+    'posts': ['id', 'userId'],
+    'comments': ['postId'],
+    'albums': ['id', 'userId'],
+    'photos': ['albumId'],
+    'todos': ['userId', 'completed'],
+}
+COMPLETED = where.parse('completed')
+
+
+def load() -> Dict[str, columns.Dataset]:
+    """Retrieves every collection concurrently into datasets.
+
+    Exits with an error if any request fails.
+    """
+    responses = aio.get_all([f'/{collection}' for collection in FIELDS])
+    datasets = {}
+    for (collection, fields), response in zip(FIELDS.items(), responses):
+        if response.status_code != 200:
+            util.panic(f"Request resulted in error code {response.status_code}")
+        datasets[collection] = columns.Dataset.from_records(
+            util.project(resource, fields) for resource in response.json())
+    return datasets
+
+
+def _rollup(counts: Dict[any, int], owners: columns.Dataset,
+            key: str) -> Dict[any, int]:
+    # Counts by the ID of resources of owners, summed by their key.
+    owner = dict(zip(owners.column('id'), owners.column(key)))
+    rolled = collections.Counter()
+    for id, count in counts.items():
+        rolled[owner.get(id)] += count
+    return rolled
+
+
+def per_user(datasets: Dict[str, columns.Dataset]) -> List[Dict[str, any]]:
+    """Counts the resources of every user.
+
+    Args:
+        datasets: Datasets of the collections by name, with at least the
+            fields in FIELDS, see load.
+
+    Returns:
+        A row per user in the order of the users, with the number of
+        posts, albums, photos in the albums, comments on the posts and
+        todos of the user, and the share of the todos completed, None
+        without todos.
+    """
+    users, posts, albums, todos = (datasets[collection] for collection in
+                                   ('users', 'posts', 'albums', 'todos'))
+    counts = {
+        'posts': posts.count('userId'),
+        'albums': albums.count('userId'),
+        'photos': _rollup(datasets['photos'].count('albumId'), albums, 'userId'),
+        'comments': _rollup(datasets['comments'].count('postId'), posts, 'userId'),
+        'todos': todos.count('userId'),
+    }
+    completed = todos.take(todos.select(COMPLETED)).count('userId')
+    rows = []
+    for id, name in zip(users.column('id'), users.column('name')):
+        row = {'id': id, 'name': name}
+        row.update((collection, counted.get(id, 0)) for collection, counted in counts.items())
+        total = row['todos']
+        row['completed'] = round(completed.get(id, 0) / total, 4) if total else None
+        rows.append(row)
+    return rows
@@ -1,24 +1,245 @@
-from typing import Dict
+import atexit
+import codecs
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List
+from urllib.parse import urlencode
 
 import requests
+import requests.adapters
+
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.decode as decode
+import jsonplaceholder.lib.memo as memo
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.timings as timings
+import jsonplaceholder.lib.util as util
 
 URI = 'https://jsonplaceholder.typicode.com'
 
+# Bytes read from the socket at a time when decoding a streamed body.
+CHUNK_SIZE = 64 * 1024
+# Longest URL sent to jsonplaceholder, multi-value queries are split to fit.
+MAX_URL_LENGTH = 2000
+
+# Number of distinct hosts to keep a connection pool for.
+POOL_CONNECTIONS = 4
+# Maximum number of keep-alive connections kept open per host.
+POOL_MAXSIZE = 10
+# Whether to wait for a free connection instead of opening one past the limit.
+POOL_BLOCK = False
+
+_session: requests.Session = None
+_session_lock = threading.Lock()
+
+
+def configure(pool_connections: int = None,
+              pool_maxsize: int = None,
+              pool_block: bool = None):
+    """Changes the connection pool settings of the shared session.
+
+    Omitted settings are left unchanged. The current session is closed and
+    a new one is created with the given settings on the next request.
+
+    Args:
+        pool_connections: Number of hosts to keep connection pools for.
+        pool_maxsize: Maximum number of connections kept open per host.
+        pool_block: Whether to block when all connections to a host are busy.
+    """
+    global POOL_CONNECTIONS, POOL_MAXSIZE, POOL_BLOCK
+    if pool_connections is not None:
+        POOL_CONNECTIONS = pool_connections
+    if pool_maxsize is not None:
+        POOL_MAXSIZE = pool_maxsize
+    if pool_block is not None:
+        POOL_BLOCK = pool_block
+    close()
+
+
+def session() -> requests.Session:
+    """Returns the process-wide session shared by every request.
+
+    Connections are kept alive and reused between calls, so only the first
+    request to a host pays for the TCP and TLS handshakes.
+
+    Returns:
+        Session with a pooled adapter mounted for HTTP and HTTPS.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE,
+                pool_block=POOL_BLOCK)
+            _session = requests.Session()
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+
+def close():
+    """Closes the shared session and every connection it holds."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+atexit.register(close)
+
+
+def batch(endpoint: str, key: str, values: Iterable[any]) -> List[str]:
+    """Splits a multi-value filter into as few endpoints as the URL length allows.
+
+    Args:
+        endpoint: Endpoint of the collection to filter, which may have a
+            query already.
+        key: Field to filter on, repeated once per value.
+        values: Values the field may take.
+
+    Returns:
+        Endpoints such as `/photos?id=1&id=2` covering every value once.
+    """
+    limit = MAX_URL_LENGTH - len(URI) - len(endpoint) - 1
+    separator = '&' if '?' in endpoint else '?'
+    endpoints = []
+    query = ''
+    for value in values:
+        param = urlencode({key: value})
+        if query and len(query) + len(param) + 1 > limit:
+            endpoints.append(f'{endpoint}{separator}{query}')
+            query = ''
+        query = f'{query}&{param}' if query else param
+    if query:
+        endpoints.append(f'{endpoint}{separator}{query}')
+    return endpoints
+
 
 def get(endpoint: str) -> requests.Response:
     """Retrieves resource from jsonplaceholder at given endpoint.
 
+    Responses are shared by every caller within the process and kept in the
+    persistent cache, which is revalidated with the server once stale.
+    Offline, the resource is read from the local mirror instead.
+
     Args:
         endpoint: Endpoint of the resource to get.
 
     Returns:
         JSON Representation of the resource.
     """
-    return requests.get(f'{URI}{endpoint}')
+    url = f'{URI}{endpoint}'
+    if mirror.OFFLINE:
+        return mirror.response(url)
+    return memo.call('GET', url, lambda: _get(url))
+
+
+def _get(url: str, streamed: bool = False) -> requests.Response:
+    if mirror.OFFLINE:
+        return mirror.response(url)
+    entry = cache.load(url)
+    if entry is not None and cache.fresh(entry):
+        return cache.response(url, entry)
+    headers = cache.validators(entry) if entry is not None else {}
+    started = time.perf_counter()
+    response = session().get(url, headers=headers, stream=streamed)
+    latency = response.elapsed.total_seconds()
+    if streamed:
+        timings.observe(latency)
+    else:
+        timings.observe(latency, len(response.content),
+                        time.perf_counter() - started - latency)
+    if entry is not None and response.status_code == 304:
+        return cache.response(url, cache.revalidated(url, entry, response))
+    if not streamed:
+        cache.store(url, response)
+    return response
+
+
+def conditional(endpoint: str, validators: Dict[str, str]) -> requests.Response:
+    """Retrieves a resource straight from jsonplaceholder, bypassing the
+    cache and memo, unless it still matches the given validators.
+
+    Args:
+        endpoint: Endpoint of the resource to get.
+        validators: Conditional request headers, see cache.validators.
+
+    Returns:
+        The resource, or a 304 response if it has not changed.
+    """
+    return session().get(f'{URI}{endpoint}', headers=validators)
+
+
+def stream(endpoint: str) -> requests.Response:
+    """Retrieves resource from jsonplaceholder without reading its body.
+
+    Responses found in the persistent cache are returned as get would,
+    otherwise the body is left on the socket to be decoded with items.
+
+    Args:
+        endpoint: Endpoint of the resources to get.
+
+    Returns:
+        Response whose body is a JSON array.
+    """
+    return _get(f'{URI}{endpoint}', streamed=True)
+
+
+def items(response: requests.Response,
+          fields: List[str] = None) -> Iterator[Dict[str, any]]:
+    """Decodes the JSON array in a response element by element.
+
+    Bodies still on the socket are decoded as they arrive, so rendering can
+    start before the download ends. Once read completely they are stored
+    in the persistent cache.
+
+    Args:
+        response: Response returned by stream or get.
+        fields: Dotted paths to keep of each element, all if None. Each
+            element is projected as soon as it is decoded, so the fields
+            left out are never held beyond it.
+
+    Yields:
+        Elements of the array in order.
+    """
+    if response._content_consumed:
+        yield from _project(decode.elements([response.text]), fields)
+        return
+    body = []
+    decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')()
+
+    def chunks():
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if cache.ENABLED:
+                body.append(chunk)
+            yield decoder.decode(chunk)
+        yield decoder.decode(b'', final=True)
+
+    try:
+        yield from _project(decode.elements(chunks()), fields)
+    finally:
+        response.close()
+    if cache.ENABLED:
+        response._content = b''.join(body)
+        cache.store(response.url, response)
+
+
+def _project(elements: Iterator[Dict[str, any]],
+             fields: List[str]) -> Iterator[Dict[str, any]]:
+    if not fields:
+        return elements
+    return (util.project(element, fields) for element in elements)
+
+
+def _online():
+    if mirror.OFFLINE:
+        util.panic('Changes cannot be made offline, the mirror is read-only.')
 
 
 def post(endpoint: str, body: Dict[str, any]) -> requests.Response:
-    """Posts resource to jsonplaceholder at given endpoint. 
+    """Posts resource to jsonplaceholder at given endpoint.
 
     Args:
         endpoint: Endpoint of the resource to post the body.
@@ -30,7 +251,11 @@ def post(endpoint: str, body: Dict[str, any]) -> requests.Response:
     headers = {
         'Content-Type': 'application/json; charset=UTF-8'
     }
-    return requests.post(f'{URI}{endpoint}', json=body, headers=headers)
+    _online()
+    response = session().post(f'{URI}{endpoint}', json=body, headers=headers)
+    cache.invalidate(response.url)
+    memo.invalidate(response.url)
+    return response
 
 
 def put(endpoint: str, body: Dict[str, any]) -> requests.Response:
@@ -46,7 +271,70 @@ def put(endpoint: str, body: Dict[str, any]) -> requests.Response:
     headers = {
         'Content-Type': 'application/json; charset=UTF-8'
     }
-    return requests.put(f'{URI}{endpoint}', json=body, headers=headers)
+    _online()
+    response = session().put(f'{URI}{endpoint}', json=body, headers=headers)
+    cache.invalidate(response.url)
+    memo.invalidate(response.url)
+    return response
+
+
+def patch(endpoint: str, body: Dict[str, any]) -> requests.Response:
+    """Updates the given fields of the resource at given endpoint.
+
+    Args:
+        endpoint: Endpoint of the resource to be updated.
+        body: Fields to change, nested resources are replaced as a whole.
+
+    Returns:
+        JSON Representation of the resource.
+    """
+    headers = {
+        'Content-Type': 'application/json; charset=UTF-8'
+    }
+    _online()
+    response = session().patch(f'{URI}{endpoint}', json=body, headers=headers)
+    cache.invalidate(response.url)
+    memo.invalidate(response.url)
+    return response
+
+
+def update(endpoint: str, changes: Dict[str, any],
+           replace: bool = False) -> requests.Response:
+    """Changes only the given fields of the resource at given endpoint.
+
+    The changes are sent in a single PATCH. Changes to nested resources,
+    which PATCH would replace as a whole, are merged into the current
+    state first. With `replace`, or when the server does not allow PATCH,
+    the merged resource is sent with PUT instead.
+
+    Args:
+        endpoint: Endpoint of the resource to be updated.
+        changes: Fields to change, nested fields may be given partially.
+        replace: Whether to replace the whole resource with PUT.
+
+    Returns:
+        JSON Representation of the resource, or the failed response.
+    """
+    methods_not_allowed = (405, 501)
+    if not replace and not any(isinstance(value, dict) for value in changes.values()):
+        response = patch(endpoint, changes)
+        if response.status_code not in methods_not_allowed:
+            # jsonplaceholder answers writes to missing resources with 500.
+            if response.status_code >= 500:
+                current = get(endpoint)
+                if current.status_code == 404:
+                    return current
+            return response
+        replace = True
+    current = get(endpoint)
+    if current.status_code != 200:
+        return current
+    merged = util.merge(current.json(), changes)
+    if not replace:
+        response = patch(endpoint, {key: merged[key] for key in changes})
+        if response.status_code not in methods_not_allowed:
+            return response
+    return put(endpoint, merged)
 
 
 def delete(endpoint: str) -> requests.Response:
@@ -56,4 +344,8 @@ def delete(endpoint: str) -> requests.Response:
     Returns:
         JSON Representation of the resource.
     """
-    return requests.delete(f'{URI}{endpoint}')
+    _online()
+    response = session().delete(f'{URI}{endpoint}')
+    cache.invalidate(response.url)
+    memo.invalidate(response.url)
+    return response
@@ -0,0 +1,281 @@
+"""Full-text search over the text fields of the mirrored resources.
+
+The inverted index is a single file next to the mirror, read through
+mmap so a query only touches the pages of the terms it looks up:
+
+    header     magic, version, mirror generation, counts and offsets
+    documents  collection, id, length in terms and content hash per document
+    terms      offsets into the blob of sorted UTF-8 terms, then the blob
+    postings   offsets into the postings, then (document, frequency) pairs
+
+When the mirror changes, only the documents whose hash changed are
+tokenized again, the postings of the others are carried over from the
+previous index, and the new file replaces the old one atomically.
+"""
+import array
+import collections
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import jsonplaceholder.lib.mirror as mirror
+
+# Fields indexed per collection.
+FIELDS = {
+    'posts': ('title', 'body'),
+    'comments': ('name', 'body', 'email'),
+    'albums': ('title',),
+    'photos': ('title',),
+    'todos': ('title',),
+}
+COLLECTIONS = tuple(FIELDS)
+
+# BM25 parameters, term frequency saturation and length normalisation.
+K1 = 1.2
+B = 0.75
+
+MAGIC = b'JPSI'
+FORMAT = 1
+HEADER = struct.Struct('<4sIQIIQ')
+DOCUMENT = struct.Struct('<III16s')
+
+WORD = re.compile(r'\w+')
+
+
+class Hit(NamedTuple):
+    """A document matching a query."""
+    collection: str
+    id: int
+    score: float
+
+
+def path() -> str:
+    """File of the index, next to the mirror."""
+    return os.path.join(os.path.dirname(mirror.DATABASE), 'search.index')
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into lowercase words."""
+    return WORD.findall(text.lower())
+
+
+def _ints(buffer, start: int, count: int) -> memoryview:
+    view = memoryview(buffer)[start:start + count * 4].cast('I')
+    if sys.byteorder == 'little':
+        return view
+    values = array.array('I', view)
+    values.byteswap()
+    return memoryview(values)
+
+
+class Index:
+    """An index file mapped into memory."""
+
+    def __init__(self, file: str):
+        with open(file, 'rb') as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.generation, self.size, self.terms,
+             self.length) = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != FORMAT:
+                raise ValueError(f'{file} is not a search index')
+            self._documents = HEADER.size
+            offsets = self._documents + self.size * DOCUMENT.size
+            # Lengths are read for every posting, straight from the
+            # documents as the third of the integers of each rather than
+            # through struct.
+            self._lengths = _ints(self._map, self._documents,
+                                  self.size * DOCUMENT.size // 4)[2::DOCUMENT.size // 4]
+            self._term_offsets = _ints(self._map, offsets, self.terms + 1)
+            self._blob = offsets + (self.terms + 1) * 4
+            postings = self._blob + self._term_offsets[self.terms]
+            postings += -postings % 4
+            self._posting_offsets = _ints(self._map, postings, self.terms + 1)
+            self._postings = _ints(self._map, postings + (self.terms + 1) * 4,
+                                   2 * self._posting_offsets[self.terms])
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        for name in ('_lengths', '_term_offsets', '_posting_offsets', '_postings'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def document(self, number: int) -> Tuple[str, int, int, bytes]:
+        """Collection, id, length and hash of a document."""
+        collection, id, length, digest = DOCUMENT.unpack_from(
+            self._map, self._documents + number * DOCUMENT.size)
+        return COLLECTIONS[collection], id, length, digest
+
+    def term(self, number: int) -> str:
+        start = self._blob + self._term_offsets[number]
+        end = self._blob + self._term_offsets[number + 1]
+        return self._map[start:end].decode()
+
+    def find(self, term: str) -> int:
+        """Number of a term by binary search, -1 if it is not indexed."""
+        wanted = term.encode()
+        low, high = 0, self.terms
+        while low < high:
+            middle = (low + high) // 2
+            start = self._blob + self._term_offsets[middle]
+            current = self._map[start:self._blob + self._term_offsets[middle + 1]]
+            if current < wanted:
+                low = middle + 1
+            elif current > wanted:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    def postings(self, number: int) -> Iterator[Tuple[int, int]]:
+        """Documents containing a term, with the number of occurrences."""
+        start, end = self._posting_offsets[number], self._posting_offsets[number + 1]
+        pairs = self._postings[2 * start:2 * end]
+        return zip(pairs[0::2], pairs[1::2])
+
+    def search(self, query: str, limit: int = 10) -> List[Hit]:
+        """Ranks the documents matching any term of a query with BM25."""
+        if not self.size:
+            return []
+        average = self.length / self.size
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            number = self.find(term)
+            if number < 0:
+                continue
+            postings = list(self.postings(number))
+            idf = math.log(1 + (self.size - len(postings) + 0.5) / (len(postings) + 0.5))
+            for document, frequency in postings:
+                length = self._lengths[document]
+                scores[document] = scores.get(document, 0.0) + idf * frequency * (K1 + 1) / (
+                    frequency + K1 * (1 - B + B * length / average))
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [Hit(*self.document(document)[:2], round(score, 4))
+                for document, score in best]
+
+
+def _hashes() -> Dict[Tuple[int, int], bytes]:
+    return {(collection, id): bytes.fromhex(digest)
+            for collection, name in enumerate(COLLECTIONS)
+            for id, digest in mirror.read(f'SELECT id, hash FROM {name}')}
+
+
+def _tokenized(keys: List[Tuple[int, int]]) -> Iterator[Tuple[Tuple[int, int], List[str]]]:
+    for collection, name in enumerate(COLLECTIONS):
+        ids = [id for number, id in keys if number == collection]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for id, record in mirror.read(
+                    f'SELECT id, record FROM {name} '
+                    f'WHERE id IN ({", ".join("?" * len(chunk))})', chunk):
+                resource = json.loads(record)
+                yield (collection, id), tokenize(' '.join(
+                    str(resource.get(field, '')) for field in FIELDS[name]))
+
+
+def update(previous: Index = None) -> int:
+    """Writes an index of the mirror as it is now.
+
+    Documents whose hash is the same as in the previous index keep their
+    postings, only the others are tokenized. The previous index is closed.
+
+    Args:
+        previous: Index to carry unchanged documents over from.
+
+    Returns:
+        Number of documents tokenized.
+    """
+    generation = mirror.generation()
+    hashes = _hashes()
+    keys = sorted(hashes)
+    numbers = {key: number for number, key in enumerate(keys)}
+    postings: Dict[str, List[Tuple[int, int]]] = collections.defaultdict(list)
+    lengths: Dict[Tuple[int, int], int] = {}
+    if previous is not None:
+        with previous:
+            renumbered = {}
+            for number in range(previous.size):
+                collection, id, length, digest = previous.document(number)
+                key = (COLLECTIONS.index(collection), id)
+                if hashes.get(key) == digest:
+                    renumbered[number] = numbers[key]
+                    lengths[key] = length
+            for term in range(previous.terms if renumbered else 0):
+                kept = [(renumbered[document], frequency)
+                        for document, frequency in previous.postings(term)
+                        if document in renumbered]
+                if kept:
+                    postings[previous.term(term)] = kept
+    changed = [key for key in keys if key not in lengths]
+    for key, words in _tokenized(changed):
+        lengths[key] = len(words)
+        for word, frequency in collections.Counter(words).items():
+            postings[word].append((numbers[key], frequency))
+    _write(generation, keys, hashes, lengths, postings)
+    return len(changed)
+
+
+def _write(generation: int, keys: List[Tuple[int, int]],
+           hashes: Dict[Tuple[int, int], bytes], lengths: Dict[Tuple[int, int], int],
+           postings: Dict[str, List[Tuple[int, int]]]):
+    terms = sorted(postings)
+    blob = b''.join(term.encode() for term in terms)
+    term_offsets = array.array('I', [0])
+    posting_offsets = array.array('I', [0])
+    pairs = array.array('I')
+    for term in terms:
+        term_offsets.append(term_offsets[-1] + len(term.encode()))
+        for document, frequency in sorted(postings[term]):
+            pairs.extend((document, frequency))
+        posting_offsets.append(len(pairs) // 2)
+    if sys.byteorder != 'little':
+        for values in (term_offsets, posting_offsets, pairs):
+            values.byteswap()
+    target = path()
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(target))
+    with os.fdopen(descriptor, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT, generation, len(keys), len(terms),
+                               sum(lengths.values())))
+        for key in keys:
+            file.write(DOCUMENT.pack(key[0], key[1], lengths[key], hashes[key]))
+        file.write(term_offsets.tobytes())
+        file.write(blob)
+        # Keeps the postings aligned for reading them as 32-bit integers.
+        file.write(b'\0' * (-len(blob) % 4))
+        file.write(posting_offsets.tobytes())
+        file.write(pairs.tobytes())
+    os.replace(temporary, target)
+
+
+def current() -> Index:
+    """Opens the index, updating it first if the mirror changed since.
+
+    Exits with an error if there is no mirror.
+    """
+    generation = mirror.generation()
+    try:
+        index = Index(path())
+    except (OSError, ValueError):
+        index = None
+    if index is not None and index.generation == generation:
+        return index
+    update(index)
+    return Index(path())
@@ -0,0 +1,110 @@
+"""Observed latency and bandwidth of requests to jsonplaceholder.
+
+Every request sent over the network updates moving averages of the time
+until its response headers arrive and of the rate its body is read at.
+The averages are saved in the cache directory when the invocation exits,
+so each one starts from what earlier ones observed, and are what plan
+costs requests with.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+from typing import Tuple
+
+import jsonplaceholder.lib.cache as cache
+
+# Estimates until anything is observed, seconds until the headers arrive
+# and bytes per second of the body.
+LATENCY = 0.1
+BANDWIDTH = 1e6
+# Weight of each new observation in the averages.
+WEIGHT = 0.2
+# Bodies smaller than this are read too fast to tell the bandwidth.
+MIN_BODY = 32 * 1024
+
+_estimates = None
+# Whether the estimates changed since they were read or saved.
+_changed = False
+_lock = threading.Lock()
+
+
+def path() -> str:
+    return os.path.join(cache.DIRECTORY, '_timings.json')
+
+
+def _load() -> dict:
+    try:
+        with open(path()) as file:
+            estimates = json.load(file)
+        return {'latency': float(estimates['latency']),
+                'bandwidth': float(estimates['bandwidth'])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {'latency': LATENCY, 'bandwidth': BANDWIDTH}
+
+
+def _current() -> dict:
+    # Called with the lock held.
+    global _estimates
+    if _estimates is None:
+        _estimates = _load()
+    return _estimates
+
+
+def estimates() -> Tuple[float, float]:
+    """Latency in seconds and bandwidth in bytes per second of a request."""
+    with _lock:
+        current = _current()
+        return current['latency'], current['bandwidth']
+
+
+def observe(latency: float, size: int = 0, transfer: float = 0.0):
+    """Records the timing of a request sent over the network.
+
+    Args:
+        latency: Seconds until the response headers arrived.
+        size: Bytes of the body, 0 if it was not read.
+        transfer: Seconds it took to read the body.
+    """
+    global _changed
+    with _lock:
+        current = _current()
+        current['latency'] += WEIGHT * (latency - current['latency'])
+        if size >= MIN_BODY and transfer > 0:
+            current['bandwidth'] += WEIGHT * (size / transfer - current['bandwidth'])
+        _changed = True
+
+
+def save():
+    """Writes the estimates to the cache directory if they changed, as is
+    done when the invocation exits."""
+    global _changed
+    with _lock:
+        if not _changed or _estimates is None or not cache.ENABLED:
+            return
+        try:
+            os.makedirs(cache.DIRECTORY, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=cache.DIRECTORY)
+            try:
+                with os.fdopen(descriptor, 'w') as file:
+                    json.dump(_estimates, file)
+                os.replace(temporary, path())
+            except OSError:
+                os.unlink(temporary)
+                raise
+        except OSError:
+            return
+        _changed = False
+
+
+atexit.register(save)
+
+
+def reset():
+    """Forgets the estimates read and any changes to them not saved, so
+    they are read again when needed."""
+    global _estimates, _changed
+    with _lock:
+        _estimates = None
+        _changed = False
@@ -1,3 +1,6 @@
+from typing import Dict, List
+
+import click
 import typer
 
 
@@ -5,3 +8,117 @@ def panic(msg: str, exit_code: int = 127):
     typer.secho(
         msg, err=True, fg=typer.colors.BRIGHT_RED)
     raise typer.Exit(exit_code)
+
+
+def parse_ids(values: List[str]) -> List[int]:
+    """Expands IDs and inclusive ranges such as `1-500` into a list of IDs.
+
+    Args:
+        values: IDs and ranges as given on the command line.
+
+    Returns:
+        IDs in the order they were given.
+    """
+    ids = []
+    for value in values:
+        start, _, end = value.partition('-')
+        if not start.isdigit() or (end and not end.isdigit()):
+            raise typer.BadParameter(f'{value} is not an ID or a range of IDs.')
+        start, end = int(start), int(end or start)
+        if start < 1 or end < start:
+            raise typer.BadParameter(f'{value} is not a valid ID or range.')
+        ids.extend(range(start, end + 1))
+    return ids
+
+
+def parse_fields(value: str) -> List[str]:
+    """Splits a comma separated list of field names such as `id,title`."""
+    if value is None:
+        return None
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    if not names:
+        raise typer.BadParameter('Expected field names such as id,title.')
+    return names
+
+
+def require(ctx: typer.Context, *names: str):
+    """Fails like a missing required option for the first option not given.
+
+    For options that are only required outside of a bulk mode. Empty
+    lists of a variadic argument count as missing.
+
+    Args:
+        ctx: Context of the running command.
+        names: Parameter names of the options to check, in order.
+    """
+    for name in names:
+        if ctx.params.get(name) in (None, [], ()):
+            param = next(param for param in ctx.command.params
+                         if param.name == name)
+            raise click.MissingParameter(ctx=ctx, param=param)
+
+
+def flatten(record: Dict[str, any], prefix: str = '') -> Dict[str, any]:
+    """Joins the keys of nested records with dots, `{'address': {'geo':
+    {'lat': 1}}}` becomes `{'address.geo.lat': 1}`.
+    """
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{prefix}{key}.'))
+        else:
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+def unflatten(record: Dict[str, any]) -> Dict[str, any]:
+    """Nests dotted keys, `{'address.geo.lat': 1}` becomes
+    `{'address': {'geo': {'lat': 1}}}`.
+    """
+    nested = {}
+    for key, value in record.items():
+        *parents, name = key.split('.')
+        target = nested
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[name] = value
+    return nested
+
+
+def parse_bool(value: str) -> bool:
+    """Parses the spellings of a boolean found in CSV files."""
+    if value.strip().lower() in ('1', 'true', 'yes', 'y'):
+        return True
+    if value.strip().lower() in ('', '0', 'false', 'no', 'n'):
+        return False
+    raise ValueError(f'{value} is not a boolean.')
+
+
+def project(record: Dict[str, any], paths: List[str]) -> Dict[str, any]:
+    """Copies only the given dotted paths of a record, keeping them nested.
+
+    Paths the record does not have are left out.
+    """
+    result = {}
+    for path in paths:
+        *parents, name = path.split('.')
+        source, target = record, result
+        for parent in parents:
+            source = source.get(parent)
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(parent, {})
+        else:
+            if name in source:
+                target[name] = source[name]
+    return result
+
+
+def merge(record: Dict[str, any], changes: Dict[str, any]) -> Dict[str, any]:
+    """Copies a record with changes applied, merging nested records."""
+    result = dict(record)
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            value = merge(result[key], value)
+        result[key] = value
+    return result
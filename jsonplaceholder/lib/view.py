@@ -0,0 +1,97 @@
+"""Rendering resources as rows of `name=value` fields.
+
+A row layout is compiled once into a function returning a single f-string,
+with the colour escape sequences of its fields already in place and nested
+fields looked up directly, so rendering a row styles nothing and parses
+nothing.
+"""
+import functools
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+import typer
+
+
+class Field(NamedTuple):
+    """A field of a row.
+
+    Attributes:
+        path: Key of the field, nested keys joined with dots.
+        color: Colour of the field, uncoloured if None.
+        end: Text following the value, styled with the field.
+        label: Name shown before the value, the last key of the path if None.
+    """
+    path: str
+    color: str = None
+    end: str = ', '
+    label: str = None
+
+
+def _literal(text: str) -> str:
+    # Text as it is written inside a double quoted f-string.
+    return (text.encode('unicode_escape').decode('ascii')
+            .replace('"', '\\"').replace('{', '{{').replace('}', '}}'))
+
+
+@functools.lru_cache(maxsize=None)
+def compile(fields: Sequence[Field], color: bool = True) -> Callable[[Dict[str, any]], str]:
+    """Compiles a row layout into a function rendering a resource.
+
+    Args:
+        fields: Fields of the row in order.
+        color: Whether to colour the fields.
+
+    Returns:
+        Function rendering a resource as a row, without a trailing newline.
+
+    Raises:
+        ValueError: A key of a path is not an identifier.
+    """
+    body = []
+    for field in fields:
+        keys = field.path.split('.')
+        if not all(key.isidentifier() for key in keys):
+            raise ValueError(f'Invalid field: {field.path}')
+        start, reset = '', ''
+        if color and field.color:
+            start, reset = typer.style('|', fg=field.color).split('|')
+        label = field.label or keys[-1]
+        lookup = 'resource' + ''.join(f"['{key}']" for key in keys)
+        body.append(_literal(f'{start}{label}=') + '{' + lookup + '}'
+                    + _literal(f'{field.end}{reset}'))
+    return eval(f'lambda resource: f"{"".join(body)}"', {})
+
+
+def select(fields: Sequence[Field],
+           names: List[str] = None) -> Tuple[Tuple[Field, ...], List[str]]:
+    """Narrows a row layout down to the named fields.
+
+    A name selects the field with that path or every field under it, so
+    `address` selects `address.street`, `address.geo.lat` and so on.
+    Selected fields are shown in the order they are named, labelled with
+    their full path.
+
+    Args:
+        fields: Full layout of the row.
+        names: Names given with `--fields`, None to keep every field.
+
+    Returns:
+        The layout and the paths to keep of each resource, None if every
+        field is kept.
+
+    Raises:
+        typer.BadParameter: A name matches no field.
+    """
+    if not names:
+        return tuple(fields), None
+    selected = []
+    for name in names:
+        matching = [field for field in fields
+                    if field.path == name or field.path.startswith(f'{name}.')]
+        if not matching:
+            raise typer.BadParameter(
+                f'{name} is not one of ' + ', '.join(field.path for field in fields),
+                param_hint="'--fields'")
+        selected.extend(field for field in matching if field not in selected)
+    layout = tuple(field._replace(end=', ', label=field.path) for field in selected)
+    layout = layout[:-1] + (layout[-1]._replace(end=''),)
+    return layout, [field.path for field in layout]
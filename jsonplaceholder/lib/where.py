@@ -0,0 +1,342 @@
+"""Filter expressions for `--where`, such as
+`userId in (1, 2) and title contains 'qui' and not completed`.
+
+Expressions combine predicates on any field, nested fields written with
+dots as in `address.geo.lat > 0`, with `and`, `or`, `not` and
+parentheses. A predicate is a comparison with `=`, `!=`, `<`, `<=`, `>` or
+`>=`, `field in (a, b)`, `field contains 'text'`, a regular expression
+match `field ~ 'pattern'`, or a field on its own, true when it is true.
+
+The predicates every resource must satisfy that json-server understands
+are sent along as query parameters, which only ever narrow the response
+down to a superset of the matches. The whole expression is then evaluated
+on what comes back.
+"""
+import operator
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import typer
+
+COMPARISONS = {'=': operator.eq, '!=': operator.ne,
+               '<': operator.lt, '<=': operator.le,
+               '>': operator.gt, '>=': operator.ge}
+KEYWORDS = ('and', 'or', 'not', 'in', 'contains', 'true', 'false')
+# Fields jsonplaceholder stores as numbers. json-server compares strings
+# with `_gte` and `_lte` as strings, so ranges are only sent for these.
+NUMERIC = ('id', 'userId', 'postId', 'albumId')
+
+TOKEN = re.compile(r'''\s*(?:
+    (?P<number>-?\d+(?:\.\d+)?)(?![\w.])
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<symbol><=|>=|!=|=|<|>|~|\(|\)|,)
+  | (?P<word>[A-Za-z_][\w.]*)
+)''', re.VERBOSE)
+
+
+class Predicate(NamedTuple):
+    """A condition on one field.
+
+    Attributes:
+        path: Field, nested keys joined with dots.
+        op: A key of COMPARISONS, `in`, `contains`, `~` or `is`, the last
+            for a field on its own.
+        value: Value compared with, a tuple for `in`, a compiled pattern
+            for `~` and True for `is`.
+    """
+    path: str
+    op: str
+    value: any
+
+
+class Logical(NamedTuple):
+    """`and`, `or` or `not` of other conditions."""
+    op: str
+    operands: Tuple[any, ...]
+
+
+def _tokens(text: str) -> List[Tuple[str, any]]:
+    tokens, index = [], 0
+    text = text.rstrip()
+    while index < len(text):
+        match = TOKEN.match(text, index)
+        if not match or match.end() == index:
+            raise typer.BadParameter(f'Unexpected text at {text[index:].strip()[:20]!r}.')
+        index = match.end()
+        kind = match.lastgroup
+        token = match.group(kind)
+        if kind == 'number':
+            token = float(token) if '.' in token else int(token)
+        elif kind == 'string':
+            token = token[1:-1].replace('\\' + token[0], token[0])
+        elif kind == 'word' and token.lower() in KEYWORDS:
+            kind, token = 'keyword', token.lower()
+        tokens.append((kind, token))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokens(text)
+        self.index = 0
+
+    def peek(self, *expected) -> bool:
+        if self.index >= len(self.tokens):
+            return False
+        return self.tokens[self.index][1] in expected
+
+    def take(self, *kinds: str) -> Tuple[str, any]:
+        if self.index >= len(self.tokens):
+            raise typer.BadParameter('Unexpected end of expression.')
+        kind, token = self.tokens[self.index]
+        if kinds and kind not in kinds:
+            raise typer.BadParameter(f'Unexpected {token!r}.')
+        self.index += 1
+        return kind, token
+
+    def expect(self, symbol: str):
+        if not self.peek(symbol):
+            raise typer.BadParameter(f'Expected {symbol!r}.')
+        self.index += 1
+
+    def expression(self):
+        operands = [self.term()]
+        while self.peek('or'):
+            self.index += 1
+            operands.append(self.term())
+        return operands[0] if len(operands) == 1 else Logical('or', tuple(operands))
+
+    def term(self):
+        operands = [self.factor()]
+        while self.peek('and'):
+            self.index += 1
+            operands.append(self.factor())
+        return operands[0] if len(operands) == 1 else Logical('and', tuple(operands))
+
+    def factor(self):
+        if self.peek('not'):
+            self.index += 1
+            return Logical('not', (self.factor(),))
+        if self.peek('('):
+            self.index += 1
+            condition = self.expression()
+            self.expect(')')
+            return condition
+        return self.predicate()
+
+    def value(self) -> any:
+        kind, token = self.take('number', 'string', 'word', 'keyword')
+        if kind == 'keyword':
+            if token not in ('true', 'false'):
+                raise typer.BadParameter(f'Unexpected {token!r}.')
+            return token == 'true'
+        return token
+
+    def predicate(self) -> Predicate:
+        _, path = self.take('word')
+        if self.peek(*COMPARISONS):
+            _, op = self.take()
+            return Predicate(path, op, self.value())
+        if self.peek('in'):
+            self.index += 1
+            self.expect('(')
+            values = [self.value()]
+            while self.peek(','):
+                self.index += 1
+                values.append(self.value())
+            self.expect(')')
+            return Predicate(path, 'in', tuple(values))
+        if self.peek('contains'):
+            self.index += 1
+            return Predicate(path, 'contains', str(self.value()))
+        if self.peek('~'):
+            self.index += 1
+            pattern = str(self.value())
+            try:
+                return Predicate(path, '~', re.compile(pattern))
+            except re.error as error:
+                raise typer.BadParameter(f'Invalid pattern {pattern!r}: {error}.')
+        return Predicate(path, 'is', True)
+
+
+def parse(text: str):
+    """Parses a filter expression, None if there is none.
+
+    Raises:
+        typer.BadParameter: The expression is malformed.
+    """
+    if text is None:
+        return None
+    parser = _Parser(text)
+    condition = parser.expression()
+    if parser.index < len(parser.tokens):
+        raise typer.BadParameter(f'Unexpected {parser.tokens[parser.index][1]!r}.')
+    return condition
+
+
+def paths(condition) -> List[str]:
+    """Fields a condition refers to."""
+    if condition is None:
+        return []
+    if isinstance(condition, Predicate):
+        return [condition.path]
+    return [path for operand in condition.operands for path in paths(operand)]
+
+
+def lookup(resource: Dict[str, any], path: str) -> any:
+    """Value of a dotted path in a resource, None if it has none."""
+    value = resource
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _coerce(value: any, literal: any) -> any:
+    # Fields compare like the literal they are compared with, so that
+    # `address.geo.lat > 0` compares numbers although lat is a string.
+    if isinstance(literal, bool):
+        return value if isinstance(value, bool) else str(value).lower() == 'true'
+    if isinstance(literal, (int, float)) and isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    if isinstance(literal, str) and not isinstance(value, str):
+        return str(value).lower() if isinstance(value, bool) else str(value)
+    return value
+
+
+def holds(predicate: Predicate, value: any) -> bool:
+    """Whether a value of the field of a predicate satisfies it."""
+    op, literal = predicate.op, predicate.value
+    if value is None:
+        return op == '!='
+    if op == 'is':
+        return _coerce(value, True) is True
+    if op == 'in':
+        return any(_coerce(value, item) == item for item in literal)
+    if op == 'contains':
+        return literal in str(value)
+    if op == '~':
+        return literal.search(str(value)) is not None
+    try:
+        return COMPARISONS[op](_coerce(value, literal), literal)
+    except TypeError:
+        return False
+
+
+def evaluate(condition, resource: Dict[str, any]) -> bool:
+    """Whether a resource satisfies a condition."""
+    if isinstance(condition, Predicate):
+        return holds(condition, lookup(resource, condition.path))
+    if condition.op == 'and':
+        return all(evaluate(operand, resource) for operand in condition.operands)
+    if condition.op == 'or':
+        return any(evaluate(operand, resource) for operand in condition.operands)
+    return not evaluate(condition.operands[0], resource)
+
+
+def select(condition, resources: Iterable[Dict[str, any]]) -> Iterator[Dict[str, any]]:
+    """Lazily keeps the resources satisfying a condition."""
+    return (resource for resource in resources if evaluate(condition, resource))
+
+
+def _text(value: any) -> str:
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+def _exact(path: str, literal: any) -> bool:
+    # Whether json-server, comparing the text of the field with the text
+    # of the literal, finds every value the literal equals once coerced:
+    # a number equals a string field such as lat when its text differs.
+    if isinstance(literal, (str, bool)):
+        return True
+    return isinstance(literal, int) and path in NUMERIC
+
+
+def _param(predicate: Predicate) -> Optional[List[Tuple[str, str]]]:
+    path, op, value = predicate
+    numeric = (path in NUMERIC and isinstance(value, (int, float))
+               and not isinstance(value, bool))
+    if op == '=' and _exact(path, value):
+        return [(path, _text(value))]
+    if op == 'in' and all(_exact(path, item) for item in value):
+        return [(path, _text(item)) for item in value]
+    if op == 'is':
+        return [(path, 'true')]
+    if op == '!=':
+        return [(f'{path}_ne', _text(value))]
+    if op in ('>', '>=') and numeric:
+        return [(f'{path}_gte', _text(value))]
+    if op in ('<', '<=') and numeric:
+        return [(f'{path}_lte', _text(value))]
+    if op == 'contains':
+        return [(f'{path}_like', re.escape(value))]
+    return None
+
+
+def pushdown(condition) -> List[Tuple[str, str]]:
+    """Query parameters narrowing a collection down for a condition.
+
+    Only predicates every match must satisfy are sent, those joined to the
+    rest with `and`, and json-server only ever returns more than they
+    select: `>` is sent as `_gte`, `contains` as a case-insensitive
+    `_like`. Ranges are only sent for the fields in NUMERIC, equality with
+    a number only for an integer on those, and regular expressions are
+    left out, their dialects differ.
+
+    Returns:
+        Parameters in the order of the predicates, repeated keys for `in`.
+    """
+    if condition is None:
+        return []
+    if isinstance(condition, Predicate):
+        return _param(condition) or []
+    if condition.op == 'and':
+        return [param for operand in condition.operands for param in pushdown(operand)]
+    negated = condition.operands[0]
+    if condition.op == 'not' and isinstance(negated, Predicate) and negated.op == 'is':
+        return [(negated.path, 'false')]
+    return []
+
+
+def _ordered(value: any, expected: str) -> Tuple[any, any]:
+    # Operands of a json-server range, None if they never compare true.
+    if isinstance(value, str):
+        return value, expected
+    if not isinstance(value, (int, float)):
+        return None, None
+    try:
+        return value, float(expected)
+    except ValueError:
+        return None, None
+
+
+def served(resource: Dict[str, any], key: str, values: List[str]) -> bool:
+    """Whether json-server keeps a resource for a query parameter.
+
+    Keys name a field, nested keys joined with dots, optionally suffixed
+    with `_gte`, `_lte`, `_ne` or `_like`. Repeated keys match any value.
+    Like JavaScript, `_gte` and `_lte` compare strings as strings and
+    anything else as numbers.
+    """
+    path, _, suffix = key.rpartition('_')
+    if suffix not in ('gte', 'lte', 'ne', 'like') or not path:
+        path, suffix = key, ''
+    value = lookup(resource, path)
+    text = _text(value)
+
+    def holds(expected: str) -> bool:
+        if suffix in ('gte', 'lte'):
+            actual, wanted = _ordered(value, expected)
+            if actual is None:
+                return False
+            return actual >= wanted if suffix == 'gte' else actual <= wanted
+        if suffix == 'ne':
+            return text != expected
+        if suffix == 'like':
+            return re.search(expected, text, re.IGNORECASE) is not None
+        return text == expected
+    return any(holds(expected) for expected in values)
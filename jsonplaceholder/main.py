@@ -2,8 +2,15 @@ import jsonplaceholder.cmd.albums as albums
 import jsonplaceholder.cmd.comments as comments
 import jsonplaceholder.cmd.photos as photos
 import jsonplaceholder.cmd.posts as posts
+import jsonplaceholder.cmd.search as search
+import jsonplaceholder.cmd.stats as stats
+import jsonplaceholder.cmd.sync as sync
 import jsonplaceholder.cmd.todos as todos
 import jsonplaceholder.cmd.users as users
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.output as output
+import jsonplaceholder.lib.plan as plan
 import typer
 
 app = typer.Typer()
@@ -13,13 +20,36 @@ app.add_typer(photos.app, name='photos', help='Manage photos')
 app.add_typer(posts.app, name='posts', help='Manage posts')
 app.add_typer(todos.app, name='todos', help='Manage todos')
 app.add_typer(users.app, name='users', help='Manage users')
+app.command()(sync.sync)
+app.command()(search.search)
+app.command()(stats.stats)
 
 
 @app.callback()
-def main():
+def main(no_cache: bool = typer.Option(False,
+                                       '--no-cache',
+                                       help='Bypass the persistent HTTP cache.'),
+         output_format: output.Format = typer.Option(output.Format.table,
+                                                     '--output',
+                                                     '-o',
+                                                     help='Format to write resources in.',
+                                                     case_sensitive=False,
+                                                     ),
+         offline: bool = typer.Option(False,
+                                      '--offline',
+                                      help='Read resources from the mirror made by sync.'),
+         explain: bool = typer.Option(False,
+                                      '--explain',
+                                      help='Describe how resources selected by many values '
+                                      'are fetched, on stderr.'),
+         ):
     """
     Command Line Interface for https://jsonplaceholder.typicode.com .
     """
+    cache.configure(enabled=not no_cache)
+    output.configure(output_format)
+    mirror.configure(offline=offline)
+    plan.configure(explain=explain)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+"""Memory held by decoded resources as dicts versus a columns.Dataset, and
+the time to filter and count them.
+
+Resources are decoded from their JSON, as commands receive them, and the
+bytes still allocated once they are decoded are measured with tracemalloc.
+Run directly for a table over every collection:
+
+    python -m tests.bench.columns
+"""
+import collections
+import gc
+import json
+import time
+import tracemalloc
+
+import jsonplaceholder.lib.columns as columns
+import jsonplaceholder.lib.where as where
+import tests.stub as stub
+
+CONDITION = "albumId < 20 and title ~ '1'"
+
+
+def held(build) -> int:
+    """Returns the bytes still allocated by what build returns."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def memory(records: list) -> tuple:
+    """Returns the bytes per resource held as dicts and as a dataset."""
+    body = json.dumps(records)
+    dicts = held(lambda: json.loads(body))
+    dataset = held(lambda: columns.Dataset.from_records(json.loads(body)))
+    return dicts / len(records), dataset / len(records)
+
+
+def latency(function, count: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    return (time.perf_counter() - start) / count
+
+
+def operations(records: list) -> dict:
+    """Returns the seconds to filter and count photos both ways."""
+    condition = where.parse(CONDITION)
+    dataset = columns.Dataset.from_records(records)
+    return {
+        'filter': (latency(lambda: list(where.select(condition, records))),
+                   latency(lambda: dataset.select(condition))),
+        'count': (latency(lambda: collections.Counter(record['albumId'] for record in records)),
+                  latency(lambda: dataset.count('albumId'))),
+    }
+
+
+def test_dataset_holds_less_than_dicts():
+    data = stub.make_dataset()
+    for collection in ('posts', 'comments', 'photos', 'todos'):
+        dicts, dataset = memory(data[collection])
+        print(f'\n{collection}: dicts {dicts:.0f} B, dataset {dataset:.0f} B per resource', end='')
+        assert dataset * 2 < dicts
+    timings = operations(data['photos'])
+    for name, (dicts, dataset) in timings.items():
+        print(f'\n{name}: dicts {dicts * 1e3:.2f} ms, dataset {dataset * 1e3:.2f} ms', end='')
+    assert timings['filter'][1] < timings['filter'][0]
+
+
+if __name__ == '__main__':
+    data = stub.make_dataset()
+    print(f'{"collection":>10} {"dicts B":>9} {"dataset B":>10}')
+    for collection, records in data.items():
+        dicts, dataset = memory(records)
+        print(f'{collection:>10} {dicts:>9.0f} {dataset:>10.0f}')
+    print(f'\n{"photos":>10} {"dicts ms":>9} {"dataset ms":>10}')
+    for name, (dicts, dataset) in operations(data['photos']).items():
+        print(f'{name:>10} {dicts * 1e3:>9.2f} {dataset * 1e3:>10.2f}')
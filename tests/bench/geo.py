@@ -0,0 +1,65 @@
+"""Time of building the grid of users and of queries on it versus a
+haversine over every user, on synthetic users.
+
+The test uses 100,000 users. Run directly for a table up to a million:
+
+    python -m tests.bench.geo
+"""
+import math
+import random
+import time
+
+import jsonplaceholder.lib.geo as geo
+
+QUERIES = [(48.85, 2.35, 50), (-33.9, 151.2, 300), (40.7, -74.0, 1000), (0.0, 179.9, 100)]
+BOXES = [(45, 0, 50, 5), (-40, 140, -30, 155), (30, 170, 40, -170)]
+
+
+def users(count: int, seed: int = 0) -> tuple:
+    """Returns keys, latitudes and longitudes spread evenly over the earth."""
+    generator = random.Random(seed)
+    lats = [math.degrees(math.asin(generator.uniform(-1, 1))) for _ in range(count)]
+    lngs = [generator.uniform(-180, 180) for _ in range(count)]
+    return list(range(count)), lats, lngs
+
+
+def scan(lats: list, lngs: list, lat: float, lng: float, radius: float) -> list:
+    """Returns the keys within the radius, computing every distance."""
+    phis = list(map(math.radians, lats))
+    distances = geo.haversine(lat, lng, phis, list(map(math.cos, phis)), lngs)
+    return sorted(key for key, distance in enumerate(distances) if distance <= radius)
+
+
+def measure(count: int) -> dict:
+    keys, lats, lngs = users(count)
+    start = time.perf_counter()
+    grid = geo.Grid(keys, lats, lngs)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    found = [grid.near(*query) for query in QUERIES]
+    near = (time.perf_counter() - start) / len(QUERIES)
+    start = time.perf_counter()
+    for box in BOXES:
+        grid.within(*box)
+    within = (time.perf_counter() - start) / len(BOXES)
+    start = time.perf_counter()
+    scanned = scan(lats, lngs, *QUERIES[0])
+    brute = time.perf_counter() - start
+    assert scanned == sorted(key for key, _ in found[0])
+    return {'build': build, 'near': near, 'within': within, 'scan': brute}
+
+
+def test_grid_queries_beat_a_scan():
+    timings = measure(100000)
+    print('\n' + ', '.join(f'{name} {value * 1e3:.1f} ms' for name, value in timings.items()),
+          end='')
+    assert timings['near'] * 10 < timings['scan']
+    assert timings['within'] * 10 < timings['scan']
+
+
+if __name__ == '__main__':
+    print(f'{"users":>9} {"build ms":>9} {"near ms":>8} {"within ms":>10} {"scan ms":>8}')
+    for count in (10000, 100000, 1000000):
+        timings = measure(count)
+        print(f'{count:>9} ' + ' '.join(f'{timings[name] * 1e3:>{width}.2f}' for name, width in
+                                        (('build', 9), ('near', 8), ('within', 10), ('scan', 8))))
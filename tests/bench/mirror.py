@@ -0,0 +1,59 @@
+"""Latency of reading resources over HTTP versus from the local mirror.
+
+Run directly for a table against the local stub:
+
+    python -m tests.bench.mirror
+"""
+import os
+import tempfile
+import time
+
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.memo as memo
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.rest as rest
+import tests.stub as stub
+
+ENDPOINTS = ('/posts/1', '/comments?postId=7', '/photos?albumId=3')
+
+
+def latency(endpoint: str, count: int) -> float:
+    """Returns the mean seconds per GET of the endpoint."""
+    start = time.perf_counter()
+    for _ in range(count):
+        assert rest.get(endpoint).status_code == 200
+    return (time.perf_counter() - start) / count
+
+
+def measure(count: int):
+    enabled = cache.ENABLED, memo.ENABLED
+    cache.ENABLED = memo.ENABLED = False
+    try:
+        online = [latency(endpoint, count) for endpoint in ENDPOINTS]
+        mirror.store(stub.make_dataset())
+        mirror.configure(offline=True)
+        try:
+            offline = [latency(endpoint, count) for endpoint in ENDPOINTS]
+        finally:
+            mirror.configure(offline=False)
+    finally:
+        cache.ENABLED, memo.ENABLED = enabled
+    return online, offline
+
+
+def test_mirror_reads_outpace_http(server):
+    online, offline = measure(50)
+    for endpoint, http, local in zip(ENDPOINTS, online, offline):
+        print(f'\n{endpoint}: http {http * 1e6:.0f} us, mirror {local * 1e6:.0f} us', end='')
+        assert local < http
+
+
+if __name__ == '__main__':
+    with stub.serve() as server, tempfile.TemporaryDirectory() as directory:
+        rest.URI = server.uri
+        mirror.configure(database=os.path.join(directory, 'mirror.sqlite3'))
+        online, offline = measure(500)
+        mirror.close()
+    print(f'{"endpoint":>20} {"http us":>10} {"mirror us":>10}')
+    for endpoint, http, local in zip(ENDPOINTS, online, offline):
+        print(f'{endpoint:>20} {http * 1e6:>10.0f} {local * 1e6:>10.0f}')
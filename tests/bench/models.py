@@ -0,0 +1,81 @@
+"""Memory and construction throughput of the models versus the dicts
+`response.json()` gives, over the full dataset.
+
+Memory is measured both at its peak, which for the models includes the
+dicts of the collection being converted, and as held once built.
+
+Run directly for a table:
+
+    python -m tests.bench.models
+"""
+import gc
+import json
+import time
+import tracemalloc
+
+import jsonplaceholder.lib.models as models
+import tests.stub as stub
+
+MODELS = {'users': models.User, 'posts': models.Post, 'comments': models.Comment,
+          'albums': models.Album, 'photos': models.Photo, 'todos': models.Todo}
+
+
+def memory(build) -> tuple:
+    """Returns the peak bytes allocated while building and the bytes held."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return peak, held
+
+
+def as_dicts(bodies: dict) -> dict:
+    return {collection: json.loads(body) for collection, body in bodies.items()}
+
+
+def as_models(bodies: dict) -> dict:
+    # The decoded dicts of a collection are dropped once it is converted.
+    return {collection: list(map(MODELS[collection].from_json, json.loads(body)))
+            for collection, body in bodies.items()}
+
+
+def throughput(data: dict, count: int = 5) -> tuple:
+    """Returns resources built from dicts and serialised back per second."""
+    total = sum(map(len, data.values())) * count
+    start = time.perf_counter()
+    for _ in range(count):
+        built = {collection: list(map(MODELS[collection].from_json, resources))
+                 for collection, resources in data.items()}
+    constructed = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(count):
+        for instances in built.values():
+            for instance in instances:
+                instance.to_json()
+    serialised = time.perf_counter() - start
+    return total / constructed, total / serialised
+
+
+def measure() -> tuple:
+    data = stub.make_dataset()
+    bodies = {collection: json.dumps(resources) for collection, resources in data.items()}
+    return memory(lambda: as_dicts(bodies)), memory(lambda: as_models(bodies)), throughput(data)
+
+
+def test_models_hold_less_than_dicts():
+    dicts, instances, (constructed, serialised) = measure()
+    print(f'\ndicts peak {dicts[0] / 1024:.0f} KiB, held {dicts[1] / 1024:.0f} KiB, '
+          f'models peak {instances[0] / 1024:.0f} KiB, held {instances[1] / 1024:.0f} KiB, '
+          f'{constructed:.0f} built/s, {serialised:.0f} serialised/s', end='')
+    assert instances[1] < dicts[1]
+
+
+if __name__ == '__main__':
+    dicts, instances, (constructed, serialised) = measure()
+    print(f'{"":>7} {"peak KiB":>9} {"held KiB":>9}')
+    for name, (peak, held) in (('dicts', dicts), ('models', instances)):
+        print(f'{name:>7} {peak / 1024:>9.0f} {held / 1024:>9.0f}')
+    print(f'\n{constructed:.0f} models built and {serialised:.0f} serialised per second')
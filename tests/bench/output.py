@@ -0,0 +1,70 @@
+"""Rows per second written by `photos list` in each output format.
+
+The styled table is what every row cost before `--output`; the other
+formats write to a buffered stream without styling. Run directly for a
+table:
+
+    python -m tests.bench.output
+"""
+import io
+import time
+
+import click
+
+import jsonplaceholder.cmd.photos as photos
+import jsonplaceholder.lib.output as output
+import jsonplaceholder.lib.view as view
+import tests.stub as stub
+
+
+def styled(records, stream):
+    for photo in records:
+        click.echo(photos.view_photo(photo), file=stream, color=True)
+
+
+def table(records, stream):
+    render = view.compile(photos.FIELDS, color=False)
+    for photo in records:
+        stream.write(render(photo))
+        stream.write('\n')
+
+
+def jsonl(records, stream):
+    output.write_jsonl(records, stream)
+
+
+def csv(records, stream):
+    output.write_csv(records, stream, 'excel')
+
+
+def tsv(records, stream):
+    output.write_csv(records, stream, 'excel-tab')
+
+
+WRITERS = (styled, table, jsonl, csv, tsv)
+
+
+def measure(write, records, repeat=3):
+    """Returns the best rows per second over a few runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        stream = io.StringIO()
+        start = time.perf_counter()
+        write(records, stream)
+        best = min(best, time.perf_counter() - start)
+    return len(records) / best
+
+
+def test_unstyled_table_outpaces_styled_table():
+    records = stub.make_dataset()['photos']
+    rates = {write.__name__: measure(write, records) for write in WRITERS}
+    print('\n' + '\n'.join(f'{name:>8}: {rate:,.0f} rows/s'
+                           for name, rate in rates.items()))
+    assert rates['table'] > rates['styled']
+
+
+if __name__ == '__main__':
+    records = stub.make_dataset()['photos']
+    print(f'{"format":>8} {"rows/s":>12}')
+    for write in WRITERS:
+        print(f'{write.__name__:>8} {measure(write, records):>12,.0f}')
@@ -0,0 +1,55 @@
+"""Time to first row and peak memory of rendering `photos list`.
+
+Compares materialising every formatted row before paging with rendering
+rows lazily as the pager consumes them. Run directly for a table:
+
+    python -m tests.bench.render
+"""
+import time
+import tracemalloc
+
+import jsonplaceholder.cmd.photos as photos
+import tests.stub as stub
+
+
+def materialised(records):
+    return [f'{photos.view_photo(photo)}\n' for photo in records]
+
+
+def streamed(records):
+    return (f'{photos.view_photo(photo)}\n' for photo in records)
+
+
+def measure(render, records):
+    """Returns seconds until the first row and peak bytes allocated."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = iter(render(records))
+    next(rows)
+    first = time.perf_counter() - start
+    for _ in rows:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, peak
+
+
+def test_streamed_rendering_is_flat():
+    records = stub.make_dataset()['photos']
+    list_first, list_peak = measure(materialised, records)
+    stream_first, stream_peak = measure(streamed, records)
+    print(f'\nmaterialised: first row {list_first * 1000:.2f} ms, peak {list_peak} B'
+          f'\nstreamed:     first row {stream_first * 1000:.2f} ms, peak {stream_peak} B')
+    assert stream_first < list_first
+    assert stream_peak * 10 < list_peak
+
+
+if __name__ == '__main__':
+    dataset = stub.make_dataset()['photos']
+    print(f'{"rows":>8} {"render":>14} {"first row ms":>14} {"peak KiB":>10}')
+    for size in (500, 5000, 50000):
+        records = (dataset * (size // len(dataset) + 1))[:size]
+        for render in (materialised, streamed):
+            first, peak = measure(render, records)
+            print(f'{size:>8} {render.__name__:>14} {first * 1000:>14.3f} '
+                  f'{peak / 1024:>10.1f}')
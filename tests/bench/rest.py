@@ -0,0 +1,50 @@
+"""Requests per second with a throwaway session per call versus the pooled one.
+
+Run directly for a longer measurement:
+
+    python -m tests.bench.rest 2000
+"""
+import sys
+import time
+
+import requests
+
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.memo as memo
+import jsonplaceholder.lib.rest as rest
+import tests.stub as stub
+
+
+def rate(fetch, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        assert fetch().status_code == 200
+    return count / (time.perf_counter() - start)
+
+
+def measure(uri: str, count: int):
+    rest.URI = uri
+    enabled = cache.ENABLED, memo.ENABLED
+    cache.ENABLED = memo.ENABLED = False
+    try:
+        unpooled = rate(lambda: requests.get(f'{uri}/posts/1'), count)
+        pooled = rate(lambda: rest.get('/posts/1'), count)
+    finally:
+        cache.ENABLED, memo.ENABLED = enabled
+    return unpooled, pooled
+
+
+def test_pooled_session_throughput(server):
+    unpooled, pooled = measure(server.uri, 200)
+    print(f'\nunpooled: {unpooled:.0f} req/s, pooled: {pooled:.0f} req/s')
+    assert server.connections == 200 + 1
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with stub.serve() as server:
+        unpooled, pooled = measure(server.uri, count)
+    print(f'requests:  {count}')
+    print(f'unpooled:  {unpooled:8.0f} req/s')
+    print(f'pooled:    {pooled:8.0f} req/s')
+    print(f'speedup:   {pooled / unpooled:8.2f}x')
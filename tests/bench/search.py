@@ -0,0 +1,65 @@
+"""Latency of searching the index versus scanning the mirrored resources.
+
+Run directly for a table:
+
+    python -m tests.bench.search
+"""
+import json
+import os
+import tempfile
+import time
+
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.search as search
+import tests.stub as stub
+
+QUERIES = ('post title 42', 'commenter7', 'photo 4321', 'second line')
+
+
+def scan(query: str) -> list:
+    """Returns the documents containing every term of a query, read from the mirror."""
+    terms = set(search.tokenize(query))
+    matches = []
+    for name, fields in search.FIELDS.items():
+        for id, record in mirror.read(f'SELECT id, record FROM {name}'):
+            resource = json.loads(record)
+            words = set(search.tokenize(' '.join(str(resource[field]) for field in fields)))
+            if terms <= words:
+                matches.append((name, id))
+    return matches
+
+
+def latency(function, count: int) -> float:
+    """Returns the mean seconds per call of the function over the queries."""
+    start = time.perf_counter()
+    for _ in range(count):
+        for query in QUERIES:
+            function(query)
+    return (time.perf_counter() - start) / (count * len(QUERIES))
+
+
+def measure(count: int):
+    mirror.store(stub.make_dataset())
+    start = time.perf_counter()
+    search.current().close()
+    build = time.perf_counter() - start
+    with search.current() as index:
+        indexed = latency(index.search, count)
+    scanned = latency(scan, max(1, count // 50))
+    return build, indexed, scanned
+
+
+def test_search_beats_a_scan():
+    build, indexed, scanned = measure(50)
+    print(f'\nbuild {build * 1e3:.0f} ms, search {indexed * 1e3:.2f} ms, '
+          f'scan {scanned * 1e3:.0f} ms', end='')
+    assert indexed < scanned
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        mirror.configure(database=os.path.join(directory, 'mirror.sqlite3'))
+        build, indexed, scanned = measure(500)
+        mirror.close()
+    print(f'{"build ms":>10} {"search ms":>10} {"scan ms":>10}')
+    print(f'{build * 1e3:>10.1f} {indexed * 1e3:>10.3f} {scanned * 1e3:>10.1f}')
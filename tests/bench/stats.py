@@ -0,0 +1,75 @@
+"""Time of `stats` with and without the HTTP cache, and of its aggregation
+over datasets versus the same statistics computed over the decoded dicts.
+
+Run directly for a table:
+
+    python -m tests.bench.stats
+"""
+import collections
+import time
+
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.report as report
+import jsonplaceholder.lib.rest as rest
+import tests.stub as stub
+
+
+def with_dicts(data: dict) -> list:
+    """Returns the statistics of report.per_user counted over dicts."""
+    post_user = {post['id']: post['userId'] for post in data['posts']}
+    album_user = {album['id']: album['userId'] for album in data['albums']}
+    posts = collections.Counter(post['userId'] for post in data['posts'])
+    albums = collections.Counter(album['userId'] for album in data['albums'])
+    photos = collections.Counter(album_user.get(photo['albumId']) for photo in data['photos'])
+    comments = collections.Counter(post_user.get(comment['postId'])
+                                   for comment in data['comments'])
+    todos = collections.Counter(todo['userId'] for todo in data['todos'])
+    completed = collections.Counter(todo['userId'] for todo in data['todos']
+                                    if todo['completed'])
+    return [{'id': user['id'], 'name': user['name'], 'posts': posts[user['id']],
+             'albums': albums[user['id']], 'photos': photos[user['id']],
+             'comments': comments[user['id']], 'todos': todos[user['id']],
+             'completed': round(completed[user['id']] / todos[user['id']], 4)
+             if todos[user['id']] else None}
+            for user in data['users']]
+
+
+def seconds(function, count: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        result = function()
+    return (time.perf_counter() - start) / count, result
+
+
+def measure() -> dict:
+    """Returns seconds to load and aggregate, uncached and cached, and to
+    aggregate alone both ways."""
+    enabled = cache.ENABLED
+    cache.ENABLED = False
+    try:
+        uncached, _ = seconds(lambda: report.per_user(report.load()))
+    finally:
+        cache.ENABLED = enabled
+    report.per_user(report.load())
+    cached, _ = seconds(lambda: report.per_user(report.load()), 5)
+    datasets = report.load()
+    data = {collection: rest.get(f'/{collection}').json() for collection in report.FIELDS}
+    columnar, rows = seconds(lambda: report.per_user(datasets), 20)
+    dicts, expected = seconds(lambda: with_dicts(data), 20)
+    assert rows == expected
+    return {'uncached': uncached, 'cached': cached, 'datasets': columnar, 'dicts': dicts}
+
+
+def test_stats_cached_beats_uncached(server):
+    timings = measure()
+    print('\n' + ', '.join(f'{name} {value * 1e3:.1f} ms' for name, value in timings.items()),
+          end='')
+    assert timings['cached'] < timings['uncached']
+
+
+if __name__ == '__main__':
+    with stub.serve_in_process() as uri:
+        rest.URI = uri
+        timings = measure()
+    for name, value in timings.items():
+        print(f'{name:>10} {value * 1e3:8.2f} ms')
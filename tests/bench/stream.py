@@ -0,0 +1,70 @@
+"""Wall time and peak memory of listing photos with and without streaming.
+
+`response.json()` downloads and decodes the whole body before the first
+row is rendered; `rest.items` decodes rows as bytes arrive, overlapping
+download, decoding and rendering. Run directly for a table over links of
+different bandwidth:
+
+    python -m tests.bench.stream
+"""
+import time
+import tracemalloc
+
+import jsonplaceholder.cmd.photos as photos
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.rest as rest
+import tests.stub as stub
+
+
+def whole():
+    response = rest.session().get(f'{rest.URI}/photos')
+    for photo in response.json():
+        photos.view_photo(photo)
+
+
+def streamed():
+    response = rest.stream('/photos')
+    for photo in rest.items(response):
+        photos.view_photo(photo)
+
+
+def measure(list_photos):
+    """Returns seconds taken and peak bytes allocated.
+
+    Time is measured on a separate run since tracing allocations slows
+    down Python code far more than the C decoder.
+    """
+    enabled = cache.ENABLED
+    cache.ENABLED = False
+    # Have a stub running in this process serialise the body untraced.
+    rest.session().get(f'{rest.URI}/photos')
+    try:
+        start = time.perf_counter()
+        list_photos()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        list_photos()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        cache.ENABLED = enabled
+    return elapsed, peak
+
+
+def test_streaming_lowers_peak_memory(server):
+    whole_time, whole_peak = measure(whole)
+    stream_time, stream_peak = measure(streamed)
+    print(f'\nwhole:    {whole_time * 1000:.0f} ms, peak {whole_peak} B'
+          f'\nstreamed: {stream_time * 1000:.0f} ms, peak {stream_peak} B')
+    assert stream_peak * 4 < whole_peak
+
+
+if __name__ == '__main__':
+    for bandwidth in (None, 50 * 1024 * 1024, 10 * 1024 * 1024):
+        link = f'{bandwidth // 1024 // 1024} MiB/s' if bandwidth else 'loopback'
+        with stub.serve_in_process(bandwidth=bandwidth) as uri:
+            rest.URI = uri
+            for list_photos in (whole, streamed):
+                elapsed, peak = measure(list_photos)
+                print(f'{link:>10} {list_photos.__name__:>8}: '
+                      f'{elapsed * 1000:8.1f} ms {peak / 1024:10.1f} KiB peak')
@@ -0,0 +1,66 @@
+"""Rows per second rendered by styling each field per row and by the
+compiled row formatters of jsonplaceholder.lib.view.
+
+Run directly for a table:
+
+    python -m tests.bench.view
+"""
+import time
+
+import typer
+
+import jsonplaceholder.cmd.photos as photos
+import jsonplaceholder.cmd.users as users
+import tests.stub as stub
+
+
+def view_photo(photo):
+    albumId = typer.style(f'albumId={photo["albumId"]}, ', fg=typer.colors.GREEN)
+    id = typer.style(f'id={photo["id"]}, ', fg=typer.colors.RED)
+    title = typer.style(f'title={photo["title"]}, ', fg=typer.colors.BLUE)
+    url = typer.style(f'url={photo["url"]}, ', fg=typer.colors.GREEN)
+    thumbnailUrl = typer.style(f'thumbnailUrl={photo["thumbnailUrl"]}',
+                               fg=typer.colors.RED)
+    return f'{id}{albumId}{title}{url}{thumbnailUrl}'
+
+
+def view_user(user):
+    address = user['address']
+    geo = address['geo']
+    company = user['company']
+    return f'\
+id={user["id"]}, name={user["name"]}, username={user["username"]}, email={user["email"]}\n\
+    address=street={address["street"]}, suite={address["suite"]}, city={address["city"]}, \
+zipcode={address["zipcode"]}\n\
+    geo=lat={geo["lat"]}, lng={geo["lng"]} \n\
+phone={user["phone"]}, website={user["website"]} \n\
+    Company=name={company["name"]}, catchPhrase={company["catchPhrase"]}, bs={company["bs"]}\n'
+
+
+def measure(render, records, repeat=5):
+    """Returns the best rows per second over a few runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for record in records:
+            render(record)
+        best = min(best, time.perf_counter() - start)
+    return len(records) / best
+
+
+def test_compiled_photo_rows_outpace_styled_fields():
+    records = stub.make_dataset()['photos']
+    styled = measure(view_photo, records)
+    compiled = measure(photos.view_photo, records)
+    print(f'\nstyled: {styled:,.0f} rows/s, compiled: {compiled:,.0f} rows/s')
+    assert compiled > 2 * styled
+
+
+if __name__ == '__main__':
+    dataset = stub.make_dataset()
+    print(f'{"resource":>10} {"styled rows/s":>14} {"compiled rows/s":>16}')
+    for name, styled, compiled in (('photos', view_photo, photos.view_photo),
+                                   ('users', view_user, users.view_user)):
+        records = dataset[name] * (5000 // len(dataset[name]))
+        print(f'{name:>10} {measure(styled, records):>14,.0f} '
+              f'{measure(compiled, records):>16,.0f}')
@@ -140,3 +140,20 @@ def test_delete_out_of_range_id():
     result = runner.invoke(comments.app, ['delete', '0'])
     assert result.exit_code == 2
     assert 'Error: Invalid value for \'ID\':' in result.output
+
+
+def test_list_repeated_postid(server):
+    result = runner.invoke(comments.app, ['list', '--postid', '3', '--postid', '1',
+                                          '--postid', '3', '--fields', 'id'])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [f'id={id}' for id in (1, 2, 3, 4, 5,
+                                                                11, 12, 13, 14, 15)]
+    assert server.requests == 1
+
+
+def test_list_repeated_postid_with_where(server):
+    result = runner.invoke(comments.app, ['list', '--postid', '1', '--postid', '2',
+                                          '--where', 'postId = 2 and id != 7',
+                                          '--fields', 'id'])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ['id=6', 'id=8', 'id=9', 'id=10']
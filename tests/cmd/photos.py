@@ -141,3 +141,30 @@ def test_delete_out_of_range_id():
     result = runner.invoke(photos.app, ['delete', '0'])
     assert result.exit_code == 2
     assert 'Error: Invalid value for \'ID\':' in result.output
+
+
+def test_get_many_ids_in_few_requests(server):
+    result = runner.invoke(photos.app, ['get', '1-500', '742', '3'])
+    assert result.exit_code == 0
+    ids = [line.split(',')[0] for line in result.output.splitlines()]
+    assert ids == [f'id={id}' for id in [*range(1, 501), 742, 3]]
+    assert server.requests < 5
+
+
+def test_get_many_missing_id(server):
+    result = runner.invoke(photos.app, ['get', '4999-5002'])
+    assert result.exit_code == 127
+    assert 'Not found: 5001, 5002' in result.output
+
+
+def test_get_invalid_range():
+    result = runner.invoke(photos.app, ['get', '5-2'])
+    assert result.exit_code == 2
+    assert 'Error: Invalid value for \'ID\':' in result.output
+
+
+def test_list_streams_every_photo(server):
+    result = runner.invoke(photos.app, ['list'])
+    assert result.exit_code == 0
+    assert len([line for line in result.output.splitlines()
+                if line.startswith('id=')]) == 5000
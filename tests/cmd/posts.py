@@ -137,3 +137,72 @@ def test_delete_out_of_range_id():
     result = runner.invoke(posts.app, ['delete', '0'])
     assert result.exit_code == 2
     assert 'Error: Invalid value for \'ID\':' in result.output
+
+
+def test_delete_many(server):
+    result = runner.invoke(posts.app, ['delete', '1-20', '50'])
+    assert result.exit_code == 0
+    assert 'id=50: deleted' in result.output
+    assert 'Deleted 21 of 21 resources.' in result.output
+    assert server.requests == 21
+
+
+def test_update_sends_single_patch(server):
+    result = runner.invoke(posts.app, ['update', '1', '--title', 'test'])
+    assert result.exit_code == 0
+    assert 'id=1, userId=1, title=test, body=post body 1' in result.output
+    assert server.requests == 1
+
+
+def test_update_falls_back_to_put(server):
+    server.allow_patch = False
+    result = runner.invoke(posts.app, ['update', '1', '--title', 'test'])
+    assert result.exit_code == 0
+    assert 'id=1, userId=1, title=test, body=post body 1' in result.output
+
+
+def test_update_with_put(server):
+    result = runner.invoke(posts.app, ['update', '2', '--put', '--body', 'b'])
+    assert result.exit_code == 0
+    assert 'id=2, userId=1, title=post title 2, body=b' in result.output
+    assert server.requests == 2
+
+
+def test_update_missing_id(server):
+    result = runner.invoke(posts.app, ['update', '12345', '--title', 'test'])
+    assert result.exit_code == 127
+    assert 'Failure to retrieve resource.' in result.output
+
+
+def test_list_page(server):
+    result = runner.invoke(posts.app, ['list', '--page', '2', '--limit', '5'])
+    assert result.exit_code == 0
+    assert [line.split(',')[0] for line in result.output.splitlines()
+            if line.startswith('id=')] == [f'id={id}' for id in range(6, 11)]
+
+
+def test_list_paginate(server):
+    result = runner.invoke(posts.app, ['list', '--paginate', '--limit', '30'])
+    assert result.exit_code == 0
+    assert len([line for line in result.output.splitlines()
+                if line.startswith('id=')]) == 100
+    assert server.requests == 4
+
+
+def test_list_fields(server):
+    result = runner.invoke(posts.app, ['list', '--userid', '1', '--fields', 'id,title'])
+    assert result.exit_code == 0
+    assert result.output.splitlines()[0] == 'id=1, title=post title 1'
+
+
+def test_get_fields(server):
+    result = runner.invoke(posts.app, ['get', '2', '--fields', 'body'])
+    assert result.exit_code == 0
+    assert result.output.startswith('body=')
+    assert 'id=' not in result.output
+
+
+def test_unknown_field(server):
+    result = runner.invoke(posts.app, ['list', '--fields', 'id,author'])
+    assert result.exit_code == 2
+    assert "Invalid value for '--fields': author is not one of" in result.output
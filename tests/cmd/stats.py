@@ -0,0 +1,25 @@
+import json
+
+import jsonplaceholder.main as main
+import typer.testing as test
+
+runner = test.CliRunner()
+
+
+def test_stats(server):
+    result = runner.invoke(main.app, ['stats'])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == 10
+    assert lines[0].startswith('id=1, name=User 1, posts=10, albums=10, photos=500, '
+                               'comments=50, todos=20, completed=')
+
+
+def test_stats_jsonl_requests_each_collection_once(server):
+    requests = server.requests
+    result = runner.invoke(main.app, ['-o', 'jsonl', 'stats'])
+    assert result.exit_code == 0
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert sum(row['photos'] for row in rows) == 5000
+    assert sum(row['comments'] for row in rows) == 500
+    assert server.requests - requests == 6
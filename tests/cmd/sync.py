@@ -0,0 +1,60 @@
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.main as main
+import typer.testing as test
+
+runner = test.CliRunner()
+
+
+def change(server):
+    server.data['posts'][3]['title'] = 'changed'
+    server.data['albums'].pop()
+    server.data['photos'] = [photo for photo in server.data['photos']
+                             if photo['albumId'] != 100]
+    server.data['todos'].append({'userId': 1, 'id': 201, 'title': 'new',
+                                 'completed': False})
+    server.bodies.clear()
+
+
+def test_sync_without_changes_is_conditional(server):
+    assert runner.invoke(main.app, ['sync']).exit_code == 0
+    requests = server.requests
+    result = runner.invoke(main.app, ['sync'])
+    assert result.exit_code == 0
+    assert 'Added 0, changed 0, removed 0 resources.' in result.output
+    # One page of each collection but photos, five full pages of photos
+    # and the empty page after them.
+    assert server.requests - requests == 11
+
+
+def test_sync_reports_changes(server):
+    assert runner.invoke(main.app, ['sync']).exit_code == 0
+    change(server)
+    result = runner.invoke(main.app, ['sync'])
+    assert result.exit_code == 0
+    assert 'posts: 0 added, 1 changed, 0 removed' in result.output
+    assert 'albums: 0 added, 0 changed, 1 removed' in result.output
+    assert 'photos: 0 added, 0 changed, 50 removed' in result.output
+    assert 'todos: 1 added, 0 changed, 0 removed' in result.output
+    assert 'Added 1, changed 1, removed 51 resources.' in result.output
+    result = runner.invoke(main.app, ['--offline', 'posts', 'get', '4'])
+    assert 'title=changed' in result.output
+
+
+def test_sync_downloads_only_changed_pages(server, monkeypatch):
+    monkeypatch.setattr(mirror, 'PAGE_SIZE', 100)
+    assert runner.invoke(main.app, ['sync']).exit_code == 0
+    server.data['photos'][4321]['title'] = 'changed'
+    server.bodies.clear()
+    result = runner.invoke(main.app, ['sync'])
+    assert 'photos: 0 added, 1 changed, 0 removed' in result.output
+    assert len(mirror.read('SELECT * FROM pages WHERE collection = ?', ['photos'])) == 51
+
+
+def test_sync_rejects_inconsistent_resources(server):
+    assert runner.invoke(main.app, ['sync']).exit_code == 0
+    server.data['users'].pop()
+    server.bodies.clear()
+    result = runner.invoke(main.app, ['sync'])
+    assert result.exit_code == 127
+    assert 'Mirror left unchanged' in result.output
+    assert mirror.read('SELECT count(*) FROM users') == [(10,)]
@@ -1,4 +1,7 @@
+import json
+
 import jsonplaceholder.cmd.todos as todos
+import tests.stub as stub
 import typer.testing as test
 
 runner = test.CliRunner()
@@ -137,3 +140,106 @@ def test_delete_out_of_range_id():
     result = runner.invoke(todos.app, ['delete', '0'])
     assert result.exit_code == 2
     assert 'Error: Invalid value for \'ID\':' in result.output
+
+
+def test_create_from_jsonl_file(server, tmp_path):
+    source = tmp_path / 'todos.jsonl'
+    source.write_text('\n'.join(
+        json.dumps({'userId': 1, 'title': f'todo {n}', 'completed': n % 2 == 0})
+        for n in range(50)))
+    result = runner.invoke(
+        todos.app, ['create', '--from-file', str(source), '--concurrency', '4'])
+    assert result.exit_code == 0
+    assert result.output.count('id=201, userId=1, title=todo ') == 50
+    assert 'Created 50 resources.' in result.output
+    assert server.connections <= 4
+
+
+def test_create_from_jsonl_file_with_bad_lines(server, tmp_path):
+    source = tmp_path / 'todos.jsonl'
+    source.write_text('\n'.join([
+        json.dumps({'userId': 1, 'title': 'first', 'completed': False}),
+        '',
+        '{"userId": 1, "title": ',
+        json.dumps({'userId': 1, 'title': 'last', 'completed': True}),
+    ]))
+    result = runner.invoke(todos.app, ['create', '--from-file', str(source)])
+    assert result.exit_code == 127
+    assert result.output.count('id=201, userId=1, title=') == 2
+    assert 'Created 2 resources.' in result.output
+    assert 'Failure to create resources from the records on lines: 3' in result.output
+
+
+def test_create_from_jsonl_file_with_partial_record(server, tmp_path):
+    source = tmp_path / 'todos.jsonl'
+    source.write_text('\n'.join([
+        json.dumps({'userId': 1, 'title': 'first', 'completed': False}),
+        json.dumps({'title': 'only'}),
+        json.dumps({'userId': 1, 'title': 'last', 'completed': True}),
+    ]))
+    result = runner.invoke(todos.app, ['create', '--from-file', str(source)])
+    assert result.exit_code == 0
+    assert result.output.count('id=201, userId=1, title=') == 2
+    assert '"title": "only"' in result.output
+    assert 'Created 3 resources.' in result.output
+
+
+def test_create_from_missing_file():
+    result = runner.invoke(todos.app, ['create', '--from-file', 'missing.jsonl'])
+    assert result.exit_code == 2
+
+
+def test_delete_by_filter(server):
+    result = runner.invoke(todos.app, ['delete', '--userid', '3', '--completed'])
+    assert result.exit_code == 0
+    deleted = sorted(int(line[3:].split(':')[0])
+                     for line in result.output.splitlines()
+                     if line.startswith('id='))
+    assert deleted == [id for id in range(41, 61) if id % 3 == 0]
+    assert f'Deleted {len(deleted)} of {len(deleted)} resources.' in result.output
+
+
+def test_delete_by_filter_and_ids(server):
+    result = runner.invoke(todos.app, ['delete', '1-45', '--userid', '3'])
+    assert result.exit_code == 0
+    assert 'Deleted 5 of 5 resources.' in result.output
+
+
+def test_delete_without_ids_or_filters():
+    result = runner.invoke(todos.app, ['delete'])
+    assert result.exit_code == 2
+    assert 'Error: Missing argument \'ID\'.' in result.output
+
+
+def test_update_to_not_completed(server):
+    result = runner.invoke(todos.app, ['update', '3', '--not-completed'])
+    assert result.exit_code == 0
+    assert 'id=3, userId=1, title=todo title 3, completed=False' in result.output
+
+
+def test_list_where(server):
+    result = runner.invoke(todos.app, ['list', '--where',
+                                       "userId = 2 and completed and title ~ '[03]$'"])
+    assert result.exit_code == 0
+    assert [line.split(',')[0] for line in result.output.splitlines()] == ['id=30', 'id=33']
+
+
+def test_list_where_unknown_field():
+    result = runner.invoke(todos.app, ['list', '--where', 'done'])
+    assert result.exit_code == 2
+    assert "Invalid value for '--where': done is not one of" in result.output
+
+
+def test_list_count_by(server):
+    result = runner.invoke(todos.app, ['list', '--count-by', 'completed',
+                                       '--where', 'userId in (1, 2)'])
+    assert result.exit_code == 0
+    completed = sum(todo['completed'] for todo in stub.make_dataset()['todos'][:40])
+    assert sorted(result.output.splitlines()) == sorted([
+        f'completed=True, count={completed}', f'completed=False, count={40 - completed}'])
+
+
+def test_list_count_by_unknown_field():
+    result = runner.invoke(todos.app, ['list', '--count-by', 'done'])
+    assert result.exit_code == 2
+    assert "Invalid value for '--count-by': done is not one of" in result.output
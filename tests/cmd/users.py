@@ -1,4 +1,7 @@
+import json
+
 import jsonplaceholder.cmd.users as users
+import jsonplaceholder.main as main
 import typer.testing as test
 
 runner = test.CliRunner()
@@ -65,6 +68,12 @@ def test_get_successfully():
     assert 'id=1, name=Leanne Graham' in result.output
 
 
+def test_get_ends_with_blank_line(server):
+    result = runner.invoke(users.app, ['get', '1'])
+    assert result.exit_code == 0
+    assert result.output.endswith('bs=bs 1\n\n')
+
+
 def test_get_incorrect_id():
     result = runner.invoke(users.app, ['get', '12345'])
     assert result.exit_code == 127
@@ -154,3 +163,116 @@ def test_delete_out_of_range_id():
     result = runner.invoke(users.app, ['delete', '0'])
     assert result.exit_code == 2
     assert 'Error: Invalid value for \'ID\':' in result.output
+
+
+def test_create_from_csv_file(server, tmp_path):
+    source = tmp_path / 'users.csv'
+    source.write_text(
+        'name,username,address.city,address.geo.lat,address.geo.lng,company.name\n'
+        'Ahmetcan,glacion,testcity,45.0,90.0,testcompany\n'
+        'Other,other,othercity,-10.5,20.25,othercompany\n')
+    output = tmp_path / 'created.jsonl'
+    result = runner.invoke(users.app, ['create',
+                                       '--from-file', str(source),
+                                       '--output-file', str(output)])
+    assert result.exit_code == 0
+    assert 'Created 2 resources.' in result.output
+    created = sorted((json.loads(line) for line in output.read_text().splitlines()),
+                     key=lambda user: user['name'])
+    assert created[0]['address'] == {'city': 'testcity',
+                                     'geo': {'lat': 45.0, 'lng': 90.0}}
+    assert created[1]['company'] == {'name': 'othercompany'}
+
+
+def test_create_from_csv_file_with_bad_row(server, tmp_path):
+    source = tmp_path / 'users.csv'
+    source.write_text(
+        'name,address.geo.lat,address.geo.lng\n'
+        'First,45.0,90.0\n'
+        'Bad,north,90.0\n'
+        'Last,-10.5,20.25\n')
+    output = tmp_path / 'created.jsonl'
+    result = runner.invoke(users.app, ['create', '--from-file', str(source),
+                                       '--output-file', str(output)])
+    assert result.exit_code == 127
+    assert 'Created 2 resources.' in result.output
+    assert len(output.read_text().splitlines()) == 2
+    assert 'Failure to create resources from the records on lines: 3' in result.output
+
+
+def test_update_nested_field_keeps_siblings(server):
+    result = runner.invoke(users.app, ['update', '2', '--city', 'testcity'])
+    assert result.exit_code == 0
+    assert 'street=2 Main Street, suite=Apt. 200, city=testcity' in result.output
+    assert 'lat=-26.0000, lng=-55.5000' in result.output
+
+
+def test_list_fields_skip_nested_records(server):
+    result = runner.invoke(main.app, ['-o', 'jsonl', 'users', 'list',
+                                      '--fields', 'id,address.geo'])
+    assert result.exit_code == 0
+    assert json.loads(result.output.splitlines()[0]) == \
+        {'id': 1, 'address': {'geo': {'lat': '-35.5000', 'lng': '-72.7500'}}}
+
+
+def test_list_where_nested_field(server):
+    result = runner.invoke(users.app, ['list', '--where', 'address.geo.lng < 0',
+                                       '--fields', 'id'])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [f'id={id}' for id in range(1, 6)]
+
+
+def test_list_where_range_on_string_field(server):
+    # Latitudes are strings, '12.0000' and '5' compare differently as such.
+    result = runner.invoke(users.app, ['list', '--where', 'address.geo.lat > 5',
+                                       '--fields', 'id'])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [f'id={id}' for id in range(6, 11)]
+
+
+def test_list_where_number_equals_string_field(server):
+    result = runner.invoke(users.app, ['list', '--where', 'address.geo.lat = -26',
+                                       '--fields', 'id'])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ['id=2']
+
+
+def test_list_where_float_equals_integer_field(server):
+    result = runner.invoke(main.app, ['posts', 'list', '--where', 'id = 1.0',
+                                      '--fields', 'id'])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ['id=1']
+
+
+def test_near(server):
+    result = runner.invoke(main.app, ['-o', 'jsonl', 'users', 'near', '--lat', '-26',
+                                      '--lng', '-55', '--radius', '2000'])
+    assert result.exit_code == 0
+    found = [json.loads(line) for line in result.output.splitlines()]
+    assert [(user['id'], user['distance']) for user in found] == [(2, 50.0), (1, 1993.3)]
+
+
+def test_near_table(server):
+    result = runner.invoke(users.app, ['near', '--latitude', '12', '--longitude', '13.5',
+                                       '--radius', '1'])
+    assert result.exit_code == 0
+    assert result.output.startswith('id=6, ')
+    assert result.output.rstrip().endswith('bs=bs 6, distance=0.0 km')
+
+
+def test_near_out_of_range():
+    result = runner.invoke(users.app, ['near', '--lat', '91', '--lng', '0', '--radius', '1'])
+    assert result.exit_code == 2
+
+
+def test_within(server):
+    result = runner.invoke(users.app, ['within', '--bbox', '-30,-60,10,0'])
+    assert result.exit_code == 0
+    assert [line.split(',')[0] for line in result.output.splitlines()
+            if line.startswith('id=')] == ['id=2', 'id=3', 'id=4', 'id=5']
+
+
+def test_within_invalid_bbox():
+    result = runner.invoke(users.app, ['within', '--bbox', '10,0,-10,5'])
+    assert result.exit_code == 2
+    assert "Invalid value for '--bbox'" in result.output
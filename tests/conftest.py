@@ -0,0 +1,35 @@
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.memo as memo
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.output as output
+import jsonplaceholder.lib.plan as plan
+import jsonplaceholder.lib.rest as rest
+import jsonplaceholder.lib.timings as timings
+import pytest
+import tests.stub as stub
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(monkeypatch, tmp_path):
+    """Keeps caches and client settings of every test apart from the others."""
+    monkeypatch.setattr(cache, 'DIRECTORY', str(tmp_path / 'cache'))
+    memo.clear()
+    monkeypatch.setattr(output, 'FORMAT', output.Format.table)
+    monkeypatch.setattr(mirror, 'DATABASE', str(tmp_path / 'mirror.sqlite3'))
+    monkeypatch.setattr(mirror, 'OFFLINE', False)
+    monkeypatch.setattr(plan, 'EXPLAIN', False)
+    timings.reset()
+    concurrency = aio.CONCURRENCY
+    yield
+    mirror.close()
+    if aio.CONCURRENCY != concurrency:
+        aio.configure(concurrency)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Points the client at a local stub of jsonplaceholder."""
+    with stub.serve() as srv:
+        monkeypatch.setattr(rest, 'URI', srv.uri)
+        yield srv
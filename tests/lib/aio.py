@@ -0,0 +1,48 @@
+import threading
+import time
+
+import jsonplaceholder.lib.aio as aio
+import jsonplaceholder.lib.rest as rest
+
+
+def test_get_all_keeps_order(server):
+    responses = aio.get_all([f'/posts/{id}' for id in (3, 1, 2)])
+    assert [response.json()['id'] for response in responses] == [3, 1, 2]
+
+
+def test_get_all_reuses_connections(server):
+    responses = aio.get_all([f'/posts/{id}' for id in range(1, 51)])
+    assert all(response.status_code == 200 for response in responses)
+    assert server.connections <= aio.CONCURRENCY
+
+
+def test_concurrency_is_bounded(monkeypatch):
+    lock = threading.Lock()
+    state = {'current': 0, 'peak': 0}
+
+    def slow_get(endpoint):
+        with lock:
+            state['current'] += 1
+            state['peak'] = max(state['peak'], state['current'])
+        time.sleep(0.01)
+        with lock:
+            state['current'] -= 1
+        return endpoint
+
+    monkeypatch.setattr(rest, 'get', slow_get)
+    aio.configure(3)
+    assert aio.get_all(str(id) for id in range(20)) == \
+        [str(id) for id in range(20)]
+    assert state['peak'] == 3
+
+
+def test_write_methods(server):
+    async def write():
+        created = await aio.post('/posts', {'userId': 1, 'title': 'test'})
+        updated = await aio.put('/posts/1', {'title': 'test'})
+        deleted = await aio.delete('/posts/1')
+        return created, updated, deleted
+    created, updated, deleted = aio.run(write())
+    assert created.status_code == 201
+    assert updated.json()['title'] == 'test'
+    assert deleted.status_code == 200
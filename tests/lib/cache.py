@@ -0,0 +1,89 @@
+import os
+
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.memo as memo
+import jsonplaceholder.lib.rest as rest
+
+
+def test_bucket():
+    assert cache.bucket('http://host/posts') == 'posts'
+    assert cache.bucket('http://host/posts/1') == 'posts'
+    assert cache.bucket('http://host/posts?userId=1') == 'posts'
+    assert cache.bucket('http://host/users/1/posts') == 'posts'
+    assert cache.bucket('http://host/users/1?_embed=posts') == cache.RELATED
+
+
+def test_fresh_response_is_served_from_disk(server):
+    server.cache_control = 'max-age=60'
+    first = rest.get('/posts/1')
+    memo.clear()
+    second = rest.get('/posts/1')
+    assert server.requests == 1
+    assert second.json() == first.json()
+
+
+def test_stale_response_is_revalidated(server):
+    first = rest.get('/posts')
+    assert 'If-None-Match' in cache.validators(cache.load(first.url))
+    memo.clear()
+    second = rest.get('/posts')
+    assert server.requests == 2
+    assert second.status_code == 200
+    assert second.json() == first.json()
+
+
+def test_write_invalidates_resource(server):
+    server.cache_control = 'max-age=60'
+    rest.get('/posts/1')
+    rest.get('/users/1/posts')
+    rest.get('/users/1')
+    rest.put('/posts/1', {'title': 'foo'})
+    assert cache.load(f'{server.uri}/posts/1') is None
+    assert cache.load(f'{server.uri}/users/1/posts') is None
+    assert cache.load(f'{server.uri}/users/1') is not None
+
+
+def test_eviction_keeps_recently_used(server, monkeypatch):
+    server.cache_control = 'max-age=60'
+    rest.get('/posts/1')
+    size = os.path.getsize(cache.path(f'{server.uri}/posts/1'))
+    monkeypatch.setattr(cache, 'MAX_SIZE', size * 2)
+    for id in range(2, 6):
+        rest.get(f'/posts/{id}')
+    assert cache.load(f'{server.uri}/posts/1') is None
+    assert cache.load(f'{server.uri}/posts/5') is not None
+
+
+def test_cache_walked_only_when_it_may_be_full(server, monkeypatch):
+    server.cache_control = 'max-age=60'
+    walks = []
+    evict = cache.evict
+
+    def counted():
+        walks.append(cache.DIRECTORY)
+        evict()
+    monkeypatch.setattr(cache, 'evict', counted)
+    for id in range(1, 6):
+        rest.get(f'/posts/{id}')
+    assert len(walks) == 1
+    monkeypatch.setattr(cache, 'MAX_SIZE', 0)
+    rest.get('/posts/6')
+    assert len(walks) == 2
+
+
+def test_failed_write_leaves_no_file(server, monkeypatch):
+    def replace(source, target):
+        raise OSError()
+    monkeypatch.setattr(os, 'replace', replace)
+    server.cache_control = 'max-age=60'
+    rest.get('/posts/1')
+    assert os.listdir(os.path.dirname(cache.path(f'{server.uri}/posts/1'))) == []
+
+
+def test_disabled_cache(server, monkeypatch):
+    monkeypatch.setattr(cache, 'ENABLED', False)
+    server.cache_control = 'max-age=60'
+    rest.get('/posts/1')
+    memo.clear()
+    rest.get('/posts/1')
+    assert server.requests == 2
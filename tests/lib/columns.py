@@ -0,0 +1,67 @@
+import jsonplaceholder.lib.columns as columns
+import jsonplaceholder.lib.where as where
+import pytest
+import tests.stub as stub
+
+DATA = stub.make_dataset()
+
+
+@pytest.mark.parametrize('collection', sorted(DATA))
+def test_rows_are_the_resources(collection):
+    dataset = columns.Dataset.from_records(DATA[collection])
+    assert list(dataset) == DATA[collection]
+
+
+def test_column_types():
+    dataset = columns.Dataset.from_records(DATA['todos'])
+    assert dataset.columns['id'].array.typecode == 'q'
+    assert dataset.columns['completed'].array.typecode == 'b'
+    assert isinstance(dataset.columns['title'], columns.Strings)
+
+
+def test_strings_stored_once():
+    dataset = columns.Dataset.from_records(DATA['comments'])
+    strings = dataset.columns['email']
+    assert len(strings.distinct()) == len({comment['email'] for comment in DATA['comments']})
+    assert isinstance(strings.blob, bytes)
+
+
+def test_falls_back_to_values():
+    dataset = columns.Dataset.from_records([{'id': 1, 'title': 'a'},
+                                            {'id': 'two', 'extra': [1, 2]}])
+    assert isinstance(dataset.columns['id'], columns.Values)
+    assert list(dataset) == [{'id': 1, 'title': 'a'}, {'id': 'two', 'extra': [1, 2]}]
+    assert list(dataset.column('title')) == ['a', None]
+
+
+@pytest.mark.parametrize('text', [
+    'userId = 2 and completed',
+    "title ~ '[03]$' or id > 190",
+    'not completed',
+    'missing = 1',
+    'missing != 1',
+])
+def test_select_agrees_with_where(text):
+    condition = where.parse(text)
+    dataset = columns.Dataset.from_records(DATA['todos'])
+    assert list(dataset.rows(dataset.select(condition))) == list(
+        where.select(condition, DATA['todos']))
+
+
+def test_nested_fields():
+    dataset = columns.Dataset.from_records(DATA['users'])
+    rows = dataset.select(where.parse('address.geo.lat > 0'))
+    assert list(dataset.rows(rows, ['id', 'address.geo'])) == [
+        {'id': user['id'], 'address': {'geo': user['address']['geo']}}
+        for user in DATA['users'] if float(user['address']['geo']['lat']) > 0]
+
+
+def test_count_and_group():
+    dataset = columns.Dataset.from_records(DATA['todos'])
+    assert dataset.count('userId') == {user: 20 for user in range(1, 11)}
+    completed = dataset.take(dataset.select(where.parse('completed')))
+    assert sum(completed.count('userId').values()) == sum(
+        todo['completed'] for todo in DATA['todos'])
+    groups = dataset.group('userId')
+    assert list(groups[3]) == list(range(40, 60))
+    assert dataset.count('missing') == {None: 200}
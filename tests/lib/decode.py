@@ -0,0 +1,34 @@
+import json
+
+import jsonplaceholder.lib.decode as decode
+import pytest
+
+DOCUMENT = json.dumps([{'id': 1, 'title': 'a, b ] c'}, 12345, 'x', [1, [2]],
+                       {'nested': {'geo': {'lat': '-37.3159'}}}, True, None,
+                       -1.5e3], indent=2)
+
+
+def test_elements_in_one_chunk():
+    assert list(decode.elements([DOCUMENT])) == json.loads(DOCUMENT)
+
+
+def test_elements_split_anywhere():
+    for size in (1, 2, 3, 7):
+        chunks = [DOCUMENT[i:i + size] for i in range(0, len(DOCUMENT), size)]
+        assert list(decode.elements(chunks)) == json.loads(DOCUMENT)
+
+
+def test_empty_array():
+    assert list(decode.elements(['[', ' ', ']'])) == []
+
+
+def test_elements_are_yielded_before_the_end():
+    elements = decode.elements(iter(['[{"id": 1}, ', '{"id"']))
+    assert next(elements) == {'id': 1}
+    with pytest.raises(ValueError):
+        next(elements)
+
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        list(decode.elements(['{"id": 1}']))
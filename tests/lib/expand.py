@@ -0,0 +1,81 @@
+import json
+
+import jsonplaceholder.lib.expand as expand
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.main as main
+import pytest
+import tests.stub as stub
+import typer
+import typer.testing as test
+
+runner = test.CliRunner()
+
+
+def test_parse():
+    assert expand.parse('posts.comments, todos,posts.user') == \
+        {'posts': {'comments': {}, 'user': {}}, 'todos': {}}
+    assert expand.parse(None) is None
+    with pytest.raises(typer.BadParameter):
+        expand.parse('posts.,todos')
+
+
+def test_relations():
+    assert expand.relations('posts') == {
+        'comments': expand.Relation('comments', 'postId', 'id', True),
+        'user': expand.Relation('users', 'id', 'userId', False)}
+
+
+def test_embeds_first_level_and_batches_the_next(server):
+    users = expand.get_many('/users', [1, 2],
+                            expand.parse('posts.comments,todos,albums.photos'))
+    # The users with their posts, todos and albums, then the comments
+    # and photos of all of them at once.
+    assert server.requests == 3
+    assert [len(user['posts']) for user in users] == [10, 10]
+    assert [comment['postId'] for comment in users[1]['posts'][0]['comments']] == [11] * 5
+    assert len(users[0]['albums'][9]['photos']) == 50
+    assert [todo['id'] for todo in users[0]['todos']][:2] == [1, 2]
+
+
+def test_shared_relations_are_fetched_once(server):
+    comments = expand.get_many('/comments', [1, 2, 6, 1], expand.parse('post.user'),
+                               fields=['id'])
+    assert server.requests == 2
+    assert [comment['post']['id'] for comment in comments] == [1, 1, 2, 1]
+    assert [set(comment) for comment in comments] == [{'id', 'post'}] * 4
+    assert comments[0]['post']['user']['name'] == 'User 1'
+
+
+def test_expands_without_embedding(server, monkeypatch):
+    monkeypatch.setattr(expand, '_embedding', lambda collection, tree: '')
+    posts = expand.get_many('/posts', [3, 14], expand.parse('comments,user'))
+    assert server.requests == 3
+    assert [post['user']['id'] for post in posts] == [1, 2]
+    assert [comment['id'] for comment in posts[1]['comments']] == list(range(66, 71))
+
+
+def test_unknown_relation(server):
+    result = runner.invoke(main.app, ['posts', 'get', '1', '--with', 'user.photos'])
+    assert result.exit_code == 2
+    assert "Invalid value for '--with': user.photos is not one of user.posts" in result.output
+
+
+def test_with_offline():
+    mirror.store(stub.make_dataset())
+    result = runner.invoke(main.app, ['--offline', '-o', 'jsonl', 'albums', 'get', '2',
+                                      '--with', 'user,photos'])
+    assert result.exit_code == 0
+    album = json.loads(result.output)
+    assert album['user']['id'] == 1
+    assert [photo['id'] for photo in album['photos']] == list(range(51, 101))
+
+
+def test_with_table(server):
+    result = runner.invoke(main.app, ['posts', 'get', '12', '--with', 'comments',
+                                      '--fields', 'id'])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0] == 'id=12'
+    assert lines[1] == ('  comments: postId=12, id=56, name=comment name 56, '
+                        'email=commenter56@example.com, body=comment body 56')
+    assert len(lines) == 6
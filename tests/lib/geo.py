@@ -0,0 +1,73 @@
+import math
+import random
+
+import jsonplaceholder.lib.geo as geo
+import pytest
+import typer
+
+RANDOM = random.Random(25)
+LATS = [RANDOM.uniform(-90, 90) for _ in range(3000)] + [90.0, -90.0, 0.0]
+LNGS = [RANDOM.uniform(-180, 180) for _ in range(3000)] + [0.0, 180.0, -180.0]
+GRID = geo.Grid(list(range(len(LATS))), LATS, LNGS, cell=5.0)
+
+
+def distance(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlam = phi2 - phi1, math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+    return 2 * geo.EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def test_haversine():
+    # Paris to London.
+    distances = geo.haversine(48.8566, 2.3522, [math.radians(51.5074)],
+                              [math.cos(math.radians(51.5074))], [-0.1278])
+    assert distances[0] == pytest.approx(343.5, abs=0.5)
+
+
+@pytest.mark.parametrize('lat, lng, radius', [
+    (0, 0, 1000),
+    (45, 179.5, 800),
+    (-60, -179, 1500),
+    (88, 10, 500),
+    (-89.5, 0, 200),
+    (10, 20, 0),
+    (0, 0, 25000),
+])
+def test_near_agrees_with_brute_force(lat, lng, radius):
+    expected = sorted(key for key in range(len(LATS))
+                      if distance(lat, lng, LATS[key], LNGS[key]) <= radius)
+    found = GRID.near(lat, lng, radius)
+    assert sorted(key for key, _ in found) == expected
+    assert [item[1] for item in found] == sorted(item[1] for item in found)
+    for key, kilometres in found:
+        assert kilometres == pytest.approx(distance(lat, lng, LATS[key], LNGS[key]))
+
+
+@pytest.mark.parametrize('south, west, north, east', [
+    (-10, -20, 10, 20),
+    (-90, -180, 90, 180),
+    (30, 170, 60, -170),
+    (12.3, 4.56, 47.8, 91.2),
+    (80, -180, 90, 180),
+    (-30, 12, 30, 11),
+])
+def test_within_agrees_with_brute_force(south, west, north, east):
+    expected = [key for key in range(len(LATS))
+                if south <= LATS[key] <= north
+                and (west <= LNGS[key] <= east if west <= east
+                     else LNGS[key] >= west or LNGS[key] <= east)]
+    assert GRID.within(south, west, north, east) == expected
+
+
+def test_within_across_antimeridian_with_edges_in_one_cell():
+    grid = geo.Grid([1, 2], [10, 10], [-60.5, -60.95])
+    assert grid.within(0, -60.7, 20, -60.8) == [1, 2]
+
+
+def test_parse_bbox():
+    assert geo.parse_bbox('-10, -20,10,20') == (-10, -20, 10, 20)
+    assert geo.parse_bbox(None) is None
+    for value in ('1,2,3', 'a,b,c,d', '10,0,-10,5', '0,0,91,0', '0,-181,1,0'):
+        with pytest.raises(typer.BadParameter):
+            geo.parse_bbox(value)
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import jsonplaceholder.lib.memo as memo
+import jsonplaceholder.lib.rest as rest
+import pytest
+import requests
+
+
+def response(text: str, status: int = 200) -> requests.Response:
+    result = requests.Response()
+    result.status_code = status
+    result._content = text.encode()
+    return result
+
+
+def test_concurrent_callers_share_one_request():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return response('response')
+
+    results = []
+    threads = [threading.Thread(
+        target=lambda: results.append(memo.call('GET', 'http://host/posts', fetch)))
+        for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert [result.text for result in results] == ['response'] * 8
+
+
+def test_failures_are_not_memoized():
+    def fail():
+        raise ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        memo.call('GET', 'http://host/posts', fail)
+    assert memo.call('GET', 'http://host/posts', lambda: response('ok')).text == 'ok'
+
+
+@pytest.mark.parametrize('status', [304, 404, 429, 503])
+def test_error_statuses_are_not_memoized(status):
+    assert memo.call('GET', 'http://host/posts',
+                     lambda: response('busy', status)).status_code == status
+    assert memo.call('GET', 'http://host/posts', lambda: response('ok')).text == 'ok'
+
+
+def test_invalidate_drops_resource_only():
+    memo.call('GET', 'http://host/posts/1', lambda: response('post'))
+    memo.call('GET', 'http://host/users/1', lambda: response('user'))
+    memo.invalidate('http://host/posts/1')
+    assert memo.call('GET', 'http://host/posts/1', lambda: response('new')).text == 'new'
+    assert memo.call('GET', 'http://host/users/1', lambda: response('new')).text == 'user'
+
+
+def test_rest_get_is_memoized_until_write(server):
+    rest.get('/posts/1')
+    rest.get('/posts/1')
+    assert server.requests == 1
+    rest.put('/posts/1', {'title': 'foo'})
+    rest.get('/posts/1')
+    assert server.requests == 3
@@ -0,0 +1,114 @@
+import json
+import sqlite3
+
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.rest as rest
+import jsonplaceholder.main as main
+import pytest
+import tests.stub as stub
+import typer.testing as test
+
+runner = test.CliRunner()
+
+
+@pytest.fixture
+def synced():
+    mirror.store(stub.make_dataset())
+    mirror.configure(offline=True)
+
+
+def test_store_counts():
+    counts = mirror.store(stub.make_dataset())
+    assert counts == {'users': 10, 'posts': 100, 'comments': 500,
+                      'albums': 100, 'photos': 5000, 'todos': 200}
+
+
+def test_schema_indexes_foreign_keys():
+    mirror.store({'users': []})
+    indexes = {name for name, in mirror.read(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'posts_userId', 'comments_postId', 'albums_userId',
+            'photos_albumId', 'todos_userId'} <= indexes
+
+
+def test_store_rejects_dangling_references():
+    with pytest.raises(sqlite3.IntegrityError):
+        mirror.store({'users': [], 'posts': [{'id': 1, 'userId': 1}]})
+
+
+def test_digest_ignores_key_order():
+    assert mirror.digest({'id': 1, 'title': 'a'}) == mirror.digest({'title': 'a', 'id': 1})
+    assert mirror.digest({'id': 1, 'title': 'a'}) != mirror.digest({'id': 1, 'title': 'b'})
+
+
+def test_apply_writes_only_changed_resources():
+    mirror.store({'users': [{'id': 1}, {'id': 2}, {'id': 3}]})
+    counts = mirror.apply({'users': ({1: ({}, [{'id': 1}, {'id': 2, 'name': 'b'},
+                                              {'id': 4}])}, 1)})
+    assert counts == {'users': mirror.Counts(added=1, changed=1, removed=1)}
+    assert mirror.pages('users') == {1: ({}, [1, 2, 4])}
+
+
+def test_answers_like_jsonplaceholder(synced):
+    assert rest.get('/posts/3').json()['id'] == 3
+    assert rest.get('/posts/101').status_code == 404
+    assert [post['id'] for post in rest.get('/posts?userId=2').json()] == \
+        list(range(11, 21))
+    assert [todo['id'] for todo in rest.get('/todos?userId=1&completed=true').json()] == \
+        [3, 6, 9, 12, 15, 18]
+    assert [photo['id'] for photo in rest.get('/photos?id=7&id=2').json()] == [2, 7]
+
+
+def test_pages(synced):
+    response = rest.get('/comments?postId=1&_page=2&_limit=2')
+    assert [comment['id'] for comment in response.json()] == [3, 4]
+    assert response.headers['X-Total-Count'] == '5'
+
+
+def test_offline_without_mirror():
+    mirror.configure(offline=True)
+    result = runner.invoke(main.app, ['--offline', 'users', 'get', '1'])
+    assert result.exit_code == 127
+    assert 'run `jsonplaceholder sync` first' in result.output
+
+
+def test_sync_then_offline(server):
+    result = runner.invoke(main.app, ['sync'])
+    assert result.exit_code == 0
+    assert 'Added 5910, changed 0, removed 0 resources.' in result.output
+    requests = server.requests
+    result = runner.invoke(main.app, ['--offline', '-o', 'jsonl', 'photos', 'list',
+                                      '--albumid', '2', '--fields', 'id'])
+    assert result.exit_code == 0
+    assert [json.loads(line)['id'] for line in result.output.splitlines()] == \
+        list(range(51, 101))
+    assert server.requests == requests
+
+
+def test_offline_writes_fail(synced):
+    result = runner.invoke(main.app, ['--offline', 'posts', 'delete', '1'])
+    assert result.exit_code == 127
+    assert 'Changes cannot be made offline' in result.output
+
+
+def test_operators_on_indexed_and_nested_fields(synced):
+    assert [post['id'] for post in rest.get('/posts?id_gte=95&userId_ne=9').json()] == \
+        list(range(95, 101))
+    assert [user['id'] for user in rest.get('/users?address.geo.lat_gte=0').json()] == \
+        [5, 6, 7, 8, 9, 10]
+    assert [todo['id'] for todo in rest.get('/todos?title_like=TITLE 1[05]$&userId=1').json()] == \
+        [10, 15]
+
+
+def test_where_offline(synced):
+    result = runner.invoke(main.app, ['--offline', 'comments', 'list', '--where',
+                                      "postId = 3 and email contains '12'", '--fields', 'id'])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ['id=12']
+
+
+def test_nested_routes(synced):
+    assert [comment['id'] for comment in rest.get('/posts/2/comments').json()] == \
+        [6, 7, 8, 9, 10]
+    assert rest.get('/users/1/comments').json() == []
+    assert rest.get('/posts/1/nothing').status_code == 404
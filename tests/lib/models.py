@@ -0,0 +1,41 @@
+import jsonplaceholder.lib.models as models
+import pytest
+import tests.stub as stub
+
+DATA = stub.make_dataset()
+MODELS = {'users': models.User, 'posts': models.Post, 'comments': models.Comment,
+          'albums': models.Album, 'photos': models.Photo, 'todos': models.Todo}
+
+
+@pytest.mark.parametrize('collection', sorted(MODELS))
+def test_round_trip(collection):
+    for resource in DATA[collection]:
+        assert MODELS[collection].from_json(resource).to_json() == resource
+
+
+def test_nested_models():
+    user = models.User.from_json(DATA['users'][6])
+    assert isinstance(user.address.geo, models.Geo)
+    assert user.address.geo.lat == DATA['users'][6]['address']['geo']['lat']
+    assert user.company.catchPhrase == 'Catch phrase 7'
+    assert not hasattr(user, '__dict__')
+
+
+def test_missing_fields_are_none_and_left_out():
+    todo = models.Todo.from_json({'id': 3, 'title': 'title', 'extra': 1})
+    assert todo.userId is None and todo.completed is None
+    assert todo.to_json() == {'id': 3, 'title': 'title'}
+    assert models.Todo(completed=False).to_json() == {'completed': False}
+
+
+def test_empty_nested_models_are_left_out():
+    user = models.User(name='name', address=models.Address(geo=models.Geo()),
+                       company=models.Company(bs='bs'))
+    assert user.to_json() == {'name': 'name', 'company': {'bs': 'bs'}}
+
+
+def test_equality():
+    assert models.Post(id=1, title='a') == models.Post(id=1, title='a')
+    assert models.Post(id=1) != models.Post(id=2)
+    assert models.Post(id=1) != models.Album(id=1)
+    assert repr(models.Geo(lat=1)) == 'Geo(lat=1, lng=None)'
@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+
+import jsonplaceholder.lib.output as output
+import jsonplaceholder.main as main
+import tests.stub as stub
+import typer.testing as test
+
+runner = test.CliRunner()
+
+
+def test_jsonl_round_trips():
+    records = stub.make_dataset()['users'][:3]
+    stream = io.StringIO()
+    output.write_jsonl(records, stream)
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == records
+
+
+def test_csv_flattens_nested_fields():
+    records = stub.make_dataset()['users'][:2]
+    stream = io.StringIO()
+    output.write_csv(records, stream, 'excel')
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert len(rows) == 2
+    assert rows[1]['address.geo.lat'] == records[1]['address']['geo']['lat']
+    assert rows[0]['company.name'] == records[0]['company']['name']
+
+
+def test_tsv_uses_tabs():
+    stream = io.StringIO()
+    output.write_csv([{'id': 1, 'title': 'a, b'}], stream, 'excel-tab')
+    assert stream.getvalue().splitlines() == ['id\ttitle', '1\ta, b']
+
+
+def test_table_off_a_terminal_is_unstyled(server):
+    result = runner.invoke(main.app, ['users', 'get', '1'])
+    assert result.exit_code == 0
+    assert result.output.startswith('id=1, name=')
+    assert '\x1b[' not in result.output
+
+
+def test_output_option(server):
+    result = runner.invoke(main.app, ['--output', 'jsonl', 'users', 'list'])
+    assert result.exit_code == 0
+    assert [json.loads(line)['id'] for line in result.output.splitlines()] == \
+        list(range(1, 11))
+
+
+def test_output_option_is_case_insensitive(server):
+    result = runner.invoke(main.app, ['-o', 'CSV', 'todos', 'list', '--userid', '1'])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0] == 'userId,id,title,completed'
+    assert len(lines) == 21
+
+
+def test_unknown_output_format():
+    result = runner.invoke(main.app, ['--output', 'xml', 'users', 'list'])
+    assert result.exit_code == 2
+    assert "Invalid value for '--output' / '-o'" in result.output
@@ -0,0 +1,32 @@
+import time
+
+import jsonplaceholder.lib.pages as pages
+
+
+def test_endpoint_keeps_filters():
+    assert pages.endpoint('/posts', 2, 10) == '/posts?_page=2&_limit=10'
+    assert pages.endpoint('/posts?userId=1', 1, 5) == \
+        '/posts?userId=1&_page=1&_limit=5'
+
+
+def test_single_page(server):
+    posts = list(pages.records('/posts', 2))
+    assert [post['id'] for post in posts] == list(range(11, 21))
+    assert server.requests == 1
+
+
+def test_follow_every_page(server):
+    photos = list(pages.records('/photos', limit=700, follow=True))
+    assert [photo['id'] for photo in photos] == list(range(1, 5001))
+    assert server.requests == 8
+
+
+def test_follow_prefetches_next_page(server):
+    photos = pages.records('/photos', 3, limit=1000, follow=True)
+    assert next(photos)['id'] == 2001
+    deadline = time.time() + 5
+    while server.requests < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert server.requests == 2
+    assert [photo['id'] for photo in photos][-1] == 5000
+    assert server.requests == 3
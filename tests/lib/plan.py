@@ -0,0 +1,85 @@
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.plan as plan
+import jsonplaceholder.lib.rest as rest
+import jsonplaceholder.lib.timings as timings
+import jsonplaceholder.main as main
+import pytest
+import tests.stub as stub
+import typer.testing as test
+
+runner = test.CliRunner(mix_stderr=False)
+
+
+@pytest.fixture(autouse=True)
+def estimates(monkeypatch):
+    monkeypatch.setattr(timings, 'estimates', lambda: (0.05, 1e6))
+
+
+def test_matching():
+    assert plan.matching('comments', 'postId', 60) == 300
+    assert plan.matching('comments', 'postId', 200) == 500
+    assert plan.matching('photos', 'id', 7) == 7
+    assert plan.matching('todos', 'completed', 1) == 200
+
+
+def test_batches_few_values():
+    chosen = plan.choose('/comments', 'postId', list(range(1, 61)))
+    assert chosen.strategy == 'batches'
+    assert chosen.endpoints == [rest.batch('/comments', 'postId', range(1, 61))[0]]
+    assert chosen.estimates['keys'][0] == 60
+
+
+def test_scans_when_batches_take_rounds():
+    chosen = plan.choose('/photos', 'id', list(range(1, 5001)))
+    assert chosen.strategy == 'scan'
+    assert chosen.endpoints == ['/photos']
+
+
+def test_keys_when_cached(server):
+    server.cache_control = 'max-age=60'
+    for post in (1, 2, 3):
+        rest.get(f'/comments?postId={post}')
+    chosen = plan.choose('/comments', 'postId', [1, 2, 3])
+    assert chosen.strategy == 'keys'
+    assert chosen.estimates['keys'][1] == 0.0
+    requests = server.requests
+    resources, = plan.fetch([chosen])
+    assert [comment['id'] for comment in resources] == list(range(1, 16))
+    assert server.requests == requests
+
+
+def test_scan_selects_the_values(server, monkeypatch):
+    monkeypatch.setattr(plan, 'STRATEGIES', ('scan',))
+    chosen = plan.choose('/todos?completed=true', 'userId', ['2', '5'])
+    resources, = plan.fetch([chosen])
+    assert server.requests == 1
+    assert {todo['userId'] for todo in resources} == {2, 5}
+    assert len(resources) == 14
+
+
+def test_offline_batches(monkeypatch):
+    mirror.store(stub.make_dataset())
+    mirror.configure(offline=True)
+    assert plan.choose('/photos', 'id', list(range(1, 5001))).strategy == 'batches'
+
+
+def test_explain(server):
+    ids = ', '.join(map(str, range(1, 61)))
+    result = runner.invoke(main.app, ['--explain', 'comments', 'list',
+                                      '--where', f'postId in ({ids})', '--fields', 'id'])
+    assert result.exit_code == 0
+    assert len(result.stdout.splitlines()) == 300
+    assert result.stderr.splitlines()[:2] == [
+        '/comments by postId, 60 values:',
+        '* batches      1 request     0.143 s']
+    assert server.requests == 1
+
+
+def test_routes_when_cached(server):
+    server.cache_control = 'max-age=60'
+    for album in (4, 9):
+        assert len(rest.get(f'/albums/{album}/photos').json()) == 50
+    chosen = plan.choose('/photos', 'albumId', [4, 9])
+    assert chosen.strategy == 'routes'
+    assert chosen.endpoints == ['/albums/4/photos', '/albums/9/photos']
+    assert 'routes' not in plan.choose('/photos', 'id', [4, 9]).estimates
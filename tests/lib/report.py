@@ -0,0 +1,52 @@
+import collections
+
+import jsonplaceholder.lib.columns as columns
+import jsonplaceholder.lib.report as report
+import tests.stub as stub
+
+
+def datasets(data):
+    return {collection: columns.Dataset.from_records(data[collection])
+            for collection in report.FIELDS}
+
+
+def expected(data):
+    post_user = {post['id']: post['userId'] for post in data['posts']}
+    album_user = {album['id']: album['userId'] for album in data['albums']}
+    rows = []
+    for user in data['users']:
+        todos = [todo for todo in data['todos'] if todo['userId'] == user['id']]
+        rows.append({
+            'id': user['id'],
+            'name': user['name'],
+            'posts': sum(post['userId'] == user['id'] for post in data['posts']),
+            'albums': sum(album['userId'] == user['id'] for album in data['albums']),
+            'photos': sum(album_user.get(photo['albumId']) == user['id']
+                          for photo in data['photos']),
+            'comments': sum(post_user.get(comment['postId']) == user['id']
+                            for comment in data['comments']),
+            'todos': len(todos),
+            'completed': round(sum(todo['completed'] for todo in todos) / len(todos), 4)
+            if todos else None,
+        })
+    return rows
+
+
+def test_per_user():
+    data = stub.make_dataset()
+    assert report.per_user(datasets(data)) == expected(data)
+
+
+def test_per_user_uneven():
+    data = stub.make_dataset()
+    data['todos'] = [todo for todo in data['todos'] if todo['userId'] != 4]
+    data['albums'] = [album for album in data['albums'] if album['id'] != 7]
+    data['posts'][0]['userId'] = 2
+    data['users'].append(stub.make_user(11))
+    rows = report.per_user(datasets(data))
+    assert rows == expected(data)
+    by_id = {row['id']: row for row in rows}
+    assert by_id[4]['completed'] is None
+    assert by_id[11] == {'id': 11, 'name': 'User 11', 'posts': 0, 'albums': 0, 'photos': 0,
+                         'comments': 0, 'todos': 0, 'completed': None}
+    assert collections.Counter(row['photos'] for row in rows)[450] == 1
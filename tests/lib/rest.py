@@ -73,3 +73,49 @@ def test_deletes_user():
         '/users/1')
     assert response != None
     assert response.status_code == 200
+
+
+def test_requests_reuse_pooled_connection(server):
+    for id in range(1, 21):
+        assert jsonplaceholder.lib.rest.get(f'/posts/{id}').status_code == 200
+    assert server.requests == 20
+    assert server.connections == 1
+
+
+def test_configure_replaces_session(server):
+    session = jsonplaceholder.lib.rest.session()
+    jsonplaceholder.lib.rest.configure(pool_maxsize=2)
+    try:
+        assert jsonplaceholder.lib.rest.session() is not session
+        adapter = jsonplaceholder.lib.rest.session().get_adapter(server.uri)
+        assert adapter._pool_maxsize == 2
+    finally:
+        jsonplaceholder.lib.rest.configure(pool_maxsize=10)
+
+
+def test_batch_respects_url_length():
+    endpoints = jsonplaceholder.lib.rest.batch('/photos', 'id', range(1, 1001))
+    assert len(endpoints) > 1
+    assert all(len(jsonplaceholder.lib.rest.URI + endpoint)
+               <= jsonplaceholder.lib.rest.MAX_URL_LENGTH
+               for endpoint in endpoints)
+    ids = [int(param[3:]) for endpoint in endpoints
+           for param in endpoint.split('?')[1].split('&')]
+    assert ids == list(range(1, 1001))
+
+
+def test_stream_items_decodes_and_caches(server):
+    server.cache_control = 'max-age=60'
+    response = jsonplaceholder.lib.rest.stream('/photos')
+    assert response.status_code == 200
+    photos = list(jsonplaceholder.lib.rest.items(response))
+    assert [photo['id'] for photo in photos] == list(range(1, 5001))
+    cached = jsonplaceholder.lib.rest.stream('/photos')
+    assert list(jsonplaceholder.lib.rest.items(cached)) == photos
+    assert server.requests == 1
+
+
+def test_stream_items_projects_fields(server):
+    response = jsonplaceholder.lib.rest.stream('/users')
+    users = list(jsonplaceholder.lib.rest.items(response, ['id', 'company.name']))
+    assert users[0] == {'id': 1, 'company': {'name': 'Company 1'}}
@@ -0,0 +1,82 @@
+import os
+
+import jsonplaceholder.lib.mirror as mirror
+import jsonplaceholder.lib.search as search
+import jsonplaceholder.main as main
+import pytest
+import tests.stub as stub
+import typer.testing as test
+
+runner = test.CliRunner()
+
+
+@pytest.fixture
+def synced():
+    mirror.store(stub.make_dataset())
+
+
+def test_tokenize():
+    assert search.tokenize('Qui est-ce? 42 fois.') == ['qui', 'est', 'ce', '42', 'fois']
+
+
+def test_ranks_by_bm25(synced):
+    with search.current() as index:
+        hits = index.search('post title 42', limit=3)
+        assert [(hit.collection, hit.id) for hit in hits[:1]] == [('posts', 42)]
+        assert hits[0].score > hits[1].score
+        assert [(hit.collection, hit.id) for hit in index.search('commenter7')] == \
+            [('comments', 7)]
+        assert index.search('nothing') == []
+
+
+def test_index_round_trip(synced):
+    search.update()
+    with search.Index(search.path()) as index:
+        assert index.generation == mirror.generation()
+        assert index.size == 500 + 100 + 100 + 5000 + 200
+        assert index.document(0)[:3] == ('posts', 1, 9)
+        number = index.find('second')
+        assert number >= 0 and index.term(number) == 'second'
+        assert len(list(index.postings(number))) == 100
+        assert index.find('zzz') == -1
+
+
+def test_updates_only_changed_documents(synced, monkeypatch):
+    search.current().close()
+    dataset = stub.make_dataset()
+    dataset['posts'][0]['title'] = 'renamed'
+    dataset['todos'].pop()
+    mirror.apply({'posts': ({1: ({}, dataset['posts'])}, 1),
+                  'todos': ({1: ({}, dataset['todos'])}, 1)})
+    tokenized = []
+    original = search._tokenized
+
+    def counting(keys):
+        tokenized.extend(keys)
+        return original(keys)
+    monkeypatch.setattr(search, '_tokenized', counting)
+    with search.current() as index:
+        assert tokenized == [(0, 1)]
+        assert [(hit.collection, hit.id) for hit in index.search('renamed')] == [('posts', 1)]
+        assert {(hit.collection, hit.id) for hit in index.search('200')} == \
+            {('comments', 200), ('photos', 200)}
+
+
+def test_unchanged_mirror_keeps_the_index(synced):
+    search.current().close()
+    modified = os.stat(search.path()).st_mtime_ns
+    search.current().close()
+    assert os.stat(search.path()).st_mtime_ns == modified
+
+
+def test_search_command(synced):
+    result = runner.invoke(main.app, ['search', 'album', 'title', '7', '--limit', '1'])
+    assert result.exit_code == 0
+    assert result.output.startswith('collection=albums, id=7, score=')
+    assert result.output.rstrip().endswith('text=album title 7')
+
+
+def test_search_without_mirror():
+    result = runner.invoke(main.app, ['search', 'title'])
+    assert result.exit_code == 127
+    assert 'run `jsonplaceholder sync` first' in result.output
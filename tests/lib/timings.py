@@ -0,0 +1,50 @@
+import json
+import os
+
+import jsonplaceholder.lib.cache as cache
+import jsonplaceholder.lib.rest as rest
+import jsonplaceholder.lib.timings as timings
+
+
+def test_defaults():
+    assert timings.estimates() == (timings.LATENCY, timings.BANDWIDTH)
+
+
+def test_observe_moves_towards_observations():
+    timings.observe(0.2)
+    latency, bandwidth = timings.estimates()
+    assert latency == timings.LATENCY + timings.WEIGHT * (0.2 - timings.LATENCY)
+    assert bandwidth == timings.BANDWIDTH
+    timings.observe(0.1, 2_000_000, 0.5)
+    assert timings.estimates()[1] == \
+        timings.BANDWIDTH + timings.WEIGHT * (4e6 - timings.BANDWIDTH)
+
+
+def test_kept_between_invocations(server):
+    rest.get('/photos')
+    timings.save()
+    with open(timings.path()) as file:
+        stored = json.load(file)
+    assert (stored['latency'], stored['bandwidth']) == timings.estimates()
+    timings.reset()
+    assert timings.estimates() == (stored['latency'], stored['bandwidth'])
+
+
+def test_saved_only_when_changed():
+    timings.save()
+    assert not os.path.exists(timings.path())
+    timings.observe(0.2)
+    timings.save()
+    assert os.path.exists(timings.path())
+
+
+def test_nothing_kept_without_cache(server):
+    cache.configure(enabled=False)
+    try:
+        rest.get('/posts')
+        timings.save()
+    finally:
+        cache.configure(enabled=True)
+    assert timings.estimates()[0] < timings.LATENCY
+    timings.reset()
+    assert timings.estimates()[0] == timings.LATENCY
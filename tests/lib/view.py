@@ -0,0 +1,47 @@
+import jsonplaceholder.cmd.photos as photos
+import jsonplaceholder.cmd.users as users
+import jsonplaceholder.lib.view as view
+import pytest
+import tests.bench.view as legacy
+import tests.stub as stub
+
+
+def test_compiled_rows_match_styled_fields():
+    for photo in stub.make_dataset()['photos'][:10]:
+        assert photos.view_photo(photo) == legacy.view_photo(photo)
+
+
+def test_compiled_rows_follow_nested_paths():
+    for user in stub.make_dataset()['users']:
+        assert users.view_user(user) == legacy.view_user(user)
+
+
+def test_plain_rows():
+    render = view.compile(photos.FIELDS, color=False)
+    assert render({'id': 1, 'albumId': 2, 'title': 't', 'url': 'u', 'thumbnailUrl': 'v'}) == \
+        'id=1, albumId=2, title=t, url=u, thumbnailUrl=v'
+
+
+def test_literal_text_is_escaped():
+    render = view.compile((view.Field('a.b', end='}{"\\\n', label='{x}'),), color=False)
+    assert render({'a': {'b': '{0}'}}) == '{x}={0}}{"\\\n'
+
+
+def test_layouts_are_compiled_once():
+    assert view.compile(photos.FIELDS) is view.compile(photos.FIELDS)
+
+
+def test_paths_must_be_keys():
+    with pytest.raises(ValueError):
+        view.compile((view.Field('address.0'),))
+
+
+def test_select_expands_nested_names():
+    layout, paths = view.select(users.FIELDS, ['email', 'address.geo'])
+    assert paths == ['email', 'address.geo.lat', 'address.geo.lng']
+    assert view.compile(layout)({'email': 'e', 'address': {'geo': {'lat': 1, 'lng': 2}}}) == \
+        'email=e, address.geo.lat=1, address.geo.lng=2'
+
+
+def test_select_keeps_layout_without_names():
+    assert view.select(photos.FIELDS) == (photos.FIELDS, None)
@@ -0,0 +1,70 @@
+import jsonplaceholder.lib.where as where
+import pytest
+import tests.stub as stub
+import typer
+
+USER = stub.make_user(7)
+TODO = {'userId': 1, 'id': 3, 'title': 'todo title 3', 'completed': True}
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('id = 3', True),
+    ('id != 3', False),
+    ('id >= 3 and id < 4', True),
+    ('userId in (2, 3)', False),
+    ("title contains 'title'", True),
+    ("title ~ '^todo title \\d$'", True),
+    ('completed', True),
+    ('not completed', False),
+    ('completed = false or id = 3', True),
+    ('not (id = 3 and completed)', False),
+    ('missing = 1', False),
+    ('missing != 1', True),
+])
+def test_evaluate(text, expected):
+    assert where.evaluate(where.parse(text), TODO) is expected
+
+
+def test_nested_fields_compare_as_numbers():
+    assert where.evaluate(where.parse('address.geo.lat > 0 and address.geo.lat < 30'), USER)
+    assert where.evaluate(where.parse("address.city = 'City 7'"), USER)
+
+
+@pytest.mark.parametrize('text', ['id =', 'id in 3', '(id = 1', 'id = 1 id', "title ~ '('", 'and'])
+def test_malformed(text):
+    with pytest.raises(typer.BadParameter):
+        where.parse(text)
+
+
+def test_pushdown_only_sends_conjuncts():
+    assert where.pushdown(where.parse(
+        "userId in (1, 2) and id > 5 and title contains 'a.b' and not completed"
+        " and title ~ 'x' and (id = 1 or id = 2)")) == [
+        ('userId', '1'), ('userId', '2'), ('id_gte', '5'), ('title_like', 'a\\.b'),
+        ('completed', 'false')]
+    assert where.pushdown(where.parse('id = 1 or id = 2')) == []
+
+
+def test_pushdown_equality_with_numbers_only_on_numeric_fields():
+    assert where.pushdown(where.parse(
+        "address.geo.lat = -26 and id = 1.0 and userId in (1, 2.5) and postId in (3, 4)"
+        " and title = 'a' and completed = true")) == [
+        ('postId', '3'), ('postId', '4'), ('title', 'a'), ('completed', 'true')]
+
+
+def test_pushdown_ranges_only_on_numeric_fields():
+    assert where.pushdown(where.parse(
+        'address.geo.lat > 5 and address.zipcode <= 10005 and albumId < 3')) == [
+        ('albumId_lte', '3')]
+
+
+def test_served_like_json_server():
+    assert where.served(USER, 'address.geo.lat_gte', ['10'])
+    assert not where.served(USER, 'address.geo.lat_lte', ['10'])
+    assert where.served(TODO, 'completed', ['true'])
+    assert where.served(TODO, 'title_like', ['TITLE'])
+    assert where.served(TODO, 'id_ne', ['1'])
+    # Strings compare as strings, '21.5000' < '5'.
+    assert not where.served(USER, 'address.geo.lat_gte', ['5'])
+    assert where.served(TODO, 'id_gte', ['3'])
+    assert not where.served(TODO, 'id_gte', ['x'])
@@ -0,0 +1,337 @@
+"""Local stand-in for jsonplaceholder used by the offline tests and benchmarks.
+
+Serves a deterministic dataset with the same shape and size as
+https://jsonplaceholder.typicode.com over keep-alive HTTP/1.1.
+"""
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import re
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+SIZES = {
+    'users': 10,
+    'posts': 100,
+    'comments': 500,
+    'albums': 100,
+    'photos': 5000,
+    'todos': 200,
+}
+
+
+def make_user(id: int) -> Dict[str, any]:
+    return {
+        'id': id,
+        'name': f'User {id}',
+        'username': f'user{id}',
+        'email': f'user{id}@example.com',
+        'address': {
+            'street': f'{id} Main Street',
+            'suite': f'Apt. {id * 100}',
+            'city': f'City {id}',
+            'zipcode': f'{10000 + id}',
+            'geo': {
+                'lat': f'{-45 + id * 9.5:.4f}',
+                'lng': f'{-90 + id * 17.25:.4f}'
+            }
+        },
+        'phone': f'1-770-736-{8000 + id}',
+        'website': f'user{id}.example.com',
+        'company': {
+            'name': f'Company {id}',
+            'catchPhrase': f'Catch phrase {id}',
+            'bs': f'bs {id}'
+        }
+    }
+
+
+def make_dataset() -> Dict[str, List[Dict[str, any]]]:
+    """Builds the six collections, related the same way jsonplaceholder's are."""
+    return {
+        'users': [make_user(id) for id in range(1, SIZES['users'] + 1)],
+        'posts': [{'userId': (id - 1) // 10 + 1,
+                   'id': id,
+                   'title': f'post title {id}',
+                   'body': f'post body {id}\nsecond line {id}'}
+                  for id in range(1, SIZES['posts'] + 1)],
+        'comments': [{'postId': (id - 1) // 5 + 1,
+                      'id': id,
+                      'name': f'comment name {id}',
+                      'email': f'commenter{id}@example.com',
+                      'body': f'comment body {id}'}
+                     for id in range(1, SIZES['comments'] + 1)],
+        'albums': [{'userId': (id - 1) // 10 + 1,
+                    'id': id,
+                    'title': f'album title {id}'}
+                   for id in range(1, SIZES['albums'] + 1)],
+        'photos': [{'albumId': (id - 1) // 50 + 1,
+                    'id': id,
+                    'title': f'photo title {id}',
+                    'url': f'https://via.placeholder.com/600/{id:06x}',
+                    'thumbnailUrl': f'https://via.placeholder.com/150/{id:06x}'}
+                   for id in range(1, SIZES['photos'] + 1)],
+        'todos': [{'userId': (id - 1) // 20 + 1,
+                   'id': id,
+                   'title': f'todo title {id}',
+                   'completed': id % 3 == 0}
+                  for id in range(1, SIZES['todos'] + 1)],
+    }
+
+
+def lookup(record: Dict[str, any], path: str) -> any:
+    for key in path.split('.'):
+        record = record.get(key) if isinstance(record, dict) else None
+    return record
+
+
+def holds(value: any, operator: str, expected: str) -> bool:
+    """Compares a field the way json-server does for `field`, `field_gte`,
+    `field_lte`, `field_ne` and `field_like`."""
+    text = str(value).lower() if isinstance(value, bool) else str(value)
+    if operator in ('gte', 'lte'):
+        # Strings compare as strings, like in JavaScript.
+        if not isinstance(value, str):
+            if not isinstance(value, (int, float)):
+                return False
+            try:
+                expected = float(expected)
+            except ValueError:
+                return False
+        return value >= expected if operator == 'gte' else value <= expected
+    if operator == 'ne':
+        return text != expected
+    if operator == 'like':
+        return re.search(expected, text, re.IGNORECASE) is not None
+    return text.lower() == expected.lower()
+
+
+def matches(record: Dict[str, any], query: Dict[str, List[str]]) -> bool:
+    for key, values in query.items():
+        if key.startswith('_'):
+            continue
+        path, _, operator = key.rpartition('_')
+        if operator not in ('gte', 'lte', 'ne', 'like'):
+            path, operator = key, ''
+        if not any(holds(lookup(record, path), operator, value) for value in values):
+            return False
+    return True
+
+
+def paginate(records: List[Dict[str, any]], query: Dict[str, List[str]]):
+    """Slices records the way json-server does for `_page`, `_limit`,
+    `_start` and `_end`."""
+    if not any(key in query for key in ('_page', '_limit', '_start', '_end')):
+        return records, {}
+    limit = int(query.get('_limit', ['10' if '_page' in query else '0'])[0])
+    if '_page' in query:
+        start = (int(query['_page'][0]) - 1) * limit
+        end = start + limit
+    else:
+        start = int(query.get('_start', ['0'])[0])
+        end = int(query['_end'][0]) if '_end' in query else \
+            (start + limit if limit else len(records))
+    return records[start:end], {'X-Total-Count': str(len(records))}
+
+
+def embed(data: Dict[str, List[Dict[str, any]]], resource: str,
+          records: List[Dict[str, any]], query: Dict[str, List[str]]):
+    """Adds the resources named by `_embed` and `_expand` the way
+    json-server does, referring to each other by `<singular>Id`."""
+    if '_embed' not in query and '_expand' not in query:
+        return records
+    key = f'{resource[:-1]}Id'
+    embedded = []
+    for record in records:
+        record = dict(record)
+        for name in query.get('_embed', []):
+            record[name] = [child for child in data.get(name, [])
+                            if child.get(key) == record['id']]
+        for name in query.get('_expand', []):
+            parent = next((parent for parent in data.get(f'{name}s', [])
+                           if parent['id'] == record.get(f'{name}Id')), None)
+            if parent is not None:
+                record[name] = parent
+        embedded.append(record)
+    return embedded
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, payload: any, cacheable: bool = False,
+                  headers: Dict[str, str] = None):
+        if cacheable:
+            if self.path not in self.server.bodies:
+                self.server.bodies[self.path] = json.dumps(payload, indent=2).encode()
+            body = self.server.bodies[self.path]
+        else:
+            body = json.dumps(payload, indent=2).encode()
+        etag = f'W/"{hashlib.md5(body).hexdigest()}"'
+        if cacheable and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if cacheable:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', self.server.cache_control)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not self.server.bandwidth:
+            return self.wfile.write(body)
+        for start in range(0, len(body), 16384):
+            self.wfile.write(body[start:start + 16384])
+            time.sleep(16384 / self.server.bandwidth)
+
+    def read_json(self) -> Dict[str, any]:
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def route(self):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = parse_qs(url.query)
+        if not parts or parts[0] not in self.server.data:
+            return None, None, query
+        if len(parts) == 3 and parts[2] in self.server.data:
+            # Nested routes such as /posts/1/comments filter by postId.
+            query.setdefault(f'{parts[0][:-1]}Id', []).append(parts[1])
+            return parts[2], None, query
+        id = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+        return parts[0], id, query
+
+    def find(self, resource: str, id: int):
+        for record in self.server.data[resource]:
+            if record['id'] == id:
+                return record
+        return None
+
+    def do_GET(self):
+        self.server.requests += 1
+        resource, id, query = self.route()
+        if resource is None:
+            return self.send_json(404, {})
+        if id is None:
+            records = [record for record in self.server.data[resource]
+                       if matches(record, query)]
+            records, headers = paginate(records, query)
+            records = embed(self.server.data, resource, records, query)
+            return self.send_json(200, records, cacheable=True, headers=headers)
+        record = self.find(resource, id)
+        return self.send_json(200 if record else 404, record or {},
+                              cacheable=record is not None)
+
+    def do_POST(self):
+        self.server.requests += 1
+        resource, _, _ = self.route()
+        if resource is None:
+            return self.send_json(404, {})
+        body = self.read_json()
+        body['id'] = SIZES[resource] + 1
+        self.send_json(201, body)
+
+    def do_PUT(self):
+        self.server.requests += 1
+        resource, id, _ = self.route()
+        body = self.read_json()
+        if resource is None or self.find(resource, id) is None:
+            return self.send_json(500, {})
+        body['id'] = id
+        self.send_json(200, body)
+
+    def do_PATCH(self):
+        self.server.requests += 1
+        resource, id, _ = self.route()
+        body = self.read_json()
+        if not self.server.allow_patch:
+            return self.send_json(405, {})
+        record = self.find(resource, id) if resource else None
+        if record is None:
+            return self.send_json(404, {})
+        self.send_json(200, dict(record, **body, id=id))
+
+    def do_DELETE(self):
+        self.server.requests += 1
+        self.send_json(200, {})
+
+
+class Server(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.data = make_dataset()
+        self.bodies = {}
+        self.requests = 0
+        self.connections = 0
+        self.cache_control = 'no-cache'
+        self.allow_patch = True
+        # Bytes per second to send bodies at, None for as fast as possible.
+        self.bandwidth = None
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+    @property
+    def uri(self) -> str:
+        host, port = self.server_address
+        return f'http://{host}:{port}'
+
+
+@contextlib.contextmanager
+def serve():
+    """Runs a stub server on a random local port for the duration of the block."""
+    server = Server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _serve_forever(settings: Dict[str, any], uris: multiprocessing.Queue):
+    server = Server()
+    for name, value in settings.items():
+        setattr(server, name, value)
+    uris.put(server.uri)
+    server.serve_forever()
+
+
+@contextlib.contextmanager
+def serve_in_process(**settings):
+    """Runs a stub server in a child process, for benchmarks that must not
+    share the interpreter with the server.
+
+    Args:
+        settings: Server attributes to set, such as bandwidth.
+
+    Yields:
+        URI of the server.
+    """
+    uris = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_serve_forever, args=(settings, uris), daemon=True)
+    process.start()
+    try:
+        yield uris.get(timeout=30)
+    finally:
+        process.terminate()
+        process.join()